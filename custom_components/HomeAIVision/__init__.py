@@ -2,22 +2,35 @@ import logging
 import asyncio
 import voluptuous as vol  # type: ignore
 
-from homeassistant.core import HomeAssistant, ServiceCall, callback, CoreState  # type: ignore
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback, CoreState  # type: ignore
 from homeassistant.config_entries import ConfigEntry  # type: ignore
 from homeassistant.helpers import config_validation as cv  # type: ignore
 from homeassistant.const import EVENT_HOMEASSISTANT_START  # type: ignore
 from homeassistant.helpers.dispatcher import async_dispatcher_connect  # type: ignore
+from homeassistant.helpers.event import async_call_later, async_track_time_interval  # type: ignore
 
 from .const import DOMAIN, CONF_AZURE_API_KEY, CONF_AZURE_ENDPOINT
-from .camera_processing import periodic_check
+from .camera_processing import start_camera_task
+from .save_image_manager import clean_up_all_devices, RETENTION_START_DELAY, RETENTION_INTERVAL
 from .store import HomeAIVisionStore, DEVICE_ADDED_SIGNAL, DEVICE_REMOVED_SIGNAL
+from .detection_zones import DETECTION_ZONES_SCHEMA
+from .notification_manager import NotificationRenderer, NotificationDispatcher
+from .loop_watchdog import LoopWatchdog
+from .pipeline_metrics import get_pipeline_metrics
+from .metrics_view import HomeAIVisionMetricsView
+from .gallery_view import HomeAIVisionGalleryView, async_load_gallery, async_unload_gallery
+from .push_ingest import async_register_frame_webhook, async_unregister_frame_webhook
 from .actions import (
     ACTION_MANUAL_ANALYZE,
     ACTION_RESET_LOCAL_COUNTER,
     ACTION_RESET_GLOBAL_COUNTER,
+    ACTION_SET_DETECTION_ZONES,
+    ACTION_PROFILE,
     handle_manual_analyze,
     handle_reset_local_counter,
-    handle_reset_global_counter
+    handle_reset_global_counter,
+    handle_set_detection_zones,
+    handle_profile,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,18 +39,6 @@ _LOGGER = logging.getLogger(__name__)
 PLATFORMS = ["sensor", "number", "select", "switch"]
 
 
-async def log_running_tasks_service(call: ServiceCall, hass: HomeAssistant):
-    """
-    Service to log all currently running tasks.
-
-    Args:
-        call (ServiceCall): The service call object.
-        hass (HomeAssistant): The Home Assistant instance.
-    """
-    tasks = asyncio.all_tasks(loop=hass.loop)
-    _LOGGER.debug(f"[HomeAIVision] Running tasks: {tasks}")
-
-
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """
     Set up HomeAIVision integration from a config entry.
@@ -76,6 +77,34 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         language = entry.data.get('global', {}).get('language', 'en')
         await store.async_set_language(language)
 
+        # NOTE: Preload translations once, so sending a notification needs no file I/O
+        notification_renderer = NotificationRenderer(hass, store)
+        await notification_renderer.async_load()
+        hass.data[DOMAIN]['notification_renderer'] = notification_renderer
+
+        # NOTE: Deliver notifications in the background, so camera tasks never wait for push providers
+        notification_dispatcher = NotificationDispatcher(hass, notification_renderer)
+        notification_dispatcher.start()
+        hass.data[DOMAIN]['notification_dispatcher'] = notification_dispatcher
+
+        # NOTE: Watch the event loop lag and the executor jobs of the integration
+        watchdog = LoopWatchdog(hass)
+        watchdog.start()
+        hass.data[DOMAIN]['watchdog'] = watchdog
+
+        # NOTE: Index the saved images, so the gallery never scans the image folders
+        hass.data[DOMAIN]['gallery'] = await async_load_gallery(hass, hass.config.path("www/HomeAIVision/cam_frames/"))
+
+        # NOTE: Serve the in-memory metrics to Prometheus and the gallery. A view can be registered only once per HA run
+        if not hass.data[DOMAIN].get('metrics_view_registered'):
+            hass.http.register_view(HomeAIVisionMetricsView(hass))
+            hass.http.register_view(HomeAIVisionGalleryView(hass))
+            hass.data[DOMAIN]['metrics_view_registered'] = True
+
+        # NOTE: Every device accepts pushed frames on its own webhook
+        for device in store.get_devices().values():
+            async_register_frame_webhook(hass, device)
+
         # NOTE: Define internal service handler functions
         async def service_manual_analyze(call: ServiceCall):
             """
@@ -104,6 +133,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             """
             await handle_reset_global_counter(call, hass)
 
+        async def service_set_detection_zones(call: ServiceCall):
+            """
+            Handle the set detection zones service call.
+
+            Args:
+                call (ServiceCall): The service call object containing data.
+            """
+            await handle_set_detection_zones(call, hass)
+
+        async def service_profile(call: ServiceCall):
+            """
+            Handle the profile service call.
+
+            Args:
+                call (ServiceCall): The service call object containing data.
+
+            Returns:
+                dict: Summary of the profiling session.
+            """
+            return await handle_profile(call, hass)
+
         # NOTE: Register services (actions) with Home Assistant
         hass.services.async_register(
             DOMAIN,
@@ -126,12 +176,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             schema=vol.Schema({})
         )
 
-        # NOTE: Register the log_running_tasks_service
         hass.services.async_register(
             DOMAIN,
-            'log_tasks',
-            lambda call: log_running_tasks_service(call, hass),
-            schema=vol.Schema({})
+            ACTION_SET_DETECTION_ZONES,
+            service_set_detection_zones,
+            schema=vol.Schema({
+                vol.Required('device_id'): cv.string,
+                vol.Required('zones'): DETECTION_ZONES_SCHEMA,
+            })
+        )
+
+        # NOTE: Register the profiling service, it replaces the former log_tasks debug action
+        hass.services.async_register(
+            DOMAIN,
+            ACTION_PROFILE,
+            service_profile,
+            schema=vol.Schema({
+                vol.Optional('duration', default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional('top', default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+            }),
+            supports_response=SupportsResponse.OPTIONAL,
         )
 
         # NOTE: Forward setup to the specified platforms (sensor, number, select, switch)
@@ -142,29 +206,51 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         def start_periodic_checks(event=None):
             """
             Start periodic checks for all armed devices.
+
+            The tasks are created at once, but only camera_start_concurrency of them
+            warm up at the same time, see get_camera_start_slots.
             """
             _LOGGER.debug("[HomeAIVision] Starting periodic checks for all devices.")
             devices = store.get_devices()
             for device_config in devices.values():
                 # IMPORTANT: Only start periodic checks for armed devices
                 if device_config.id not in hass.data[DOMAIN]['camera_tasks'] and device_config.armed:
-                    stop_event = asyncio.Event()
-                    task = hass.async_create_task(
-                        periodic_check(hass, entry, device_config.asdict(), stop_event)
-                    )
-                    hass.data[DOMAIN]['camera_tasks'][device_config.id] = (task, stop_event)
+                    start_camera_task(hass, entry, device_config.asdict())
                     _LOGGER.debug(f"[HomeAIVision] Camera_tasks: {hass.data[DOMAIN]['camera_tasks']}")
 
         # NOTE: Start periodic checks immediately if HA is already running
         if hass.state == CoreState.running:
             _LOGGER.debug("[HomeAIVision] HA is already running, starting periodic checks.")
             start_periodic_checks()
-            # NOTE: Log all running tasks
-            # hass.async_create_task(log_running_tasks_service({}, hass))
         else:
             # NOTE: Register the callback to be called once HA has started
             hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, start_periodic_checks)
 
+        # NOTE: Apply the retention policy in the background instead of in every camera's startup
+        @callback
+        def run_retention(now=None):
+            """
+            Remove the image folders older than days_to_keep of every device and rescan its storage usage.
+
+            Args:
+                now (datetime): Time of the scheduled run, unused.
+            """
+            devices = list(store.get_devices().values())
+            hass.async_create_background_task(
+                clean_up_all_devices(
+                    hass.config.path("www/HomeAIVision/cam_frames/"),
+                    devices,
+                    hass.data[DOMAIN].get('gallery'),
+                    {device.id: get_pipeline_metrics(hass, device.id) for device in devices},
+                ),
+                "homeaivision_retention",
+            )
+
+        hass.data[DOMAIN]['retention_listeners'] = [
+            async_call_later(hass, RETENTION_START_DELAY, run_retention),
+            async_track_time_interval(hass, run_retention, RETENTION_INTERVAL),
+        ]
+
         # NOTE: Define handlers for device added and removed signals
         @callback
         def handle_device_added(device):
@@ -175,15 +261,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 device (dict): The device data dictionary.
             """
             device_id = device['id']
+            async_register_frame_webhook(hass, store.get_device(device_id))
             if device_id not in hass.data[DOMAIN]['camera_tasks']:
                 # IMPORTANT: Check if the device is armed before starting periodic checks
                 if device.get('armed', False):
                     _LOGGER.debug(f"[HomeAIVision] Adding and arming new device {device_id}.")
-                    stop_event = asyncio.Event()
-                    task = hass.async_create_task(
-                        periodic_check(hass, entry, device, stop_event)
-                    )
-                    hass.data[DOMAIN]['camera_tasks'][device_id] = (task, stop_event)
+                    start_camera_task(hass, entry, device)
                     _LOGGER.debug(f"[HomeAIVision] Started periodic_check for device {device_id}")
                 else:
                     _LOGGER.debug(f"[HomeAIVision] Adding new device {device_id} without arming.")
@@ -204,6 +287,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 stop_event.set()
                 task.cancel()
                 _LOGGER.debug(f"[HomeAIVision] Signaled stop for periodic_check of device {device_id} for entry {entry.entry_id}")
+            hass.data[DOMAIN].get('pipeline_metrics', {}).pop(device_id, None)
+            hass.data[DOMAIN].get('camera_health', {}).pop(device_id, None)
+            async_unregister_frame_webhook(hass, device['webhook_id'])
 
         # NOTE: Connect the signal handlers
         device_added_listener = async_dispatcher_connect(hass, DEVICE_ADDED_SIGNAL, handle_device_added)
@@ -254,6 +340,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         except asyncio.TimeoutError:
             _LOGGER.warning("[HomeAIVision] Some camera tasks did not finish cancelling in time.")
 
+        for webhook_id in list(hass.data[DOMAIN].get('webhook_devices', {})):
+            async_unregister_frame_webhook(hass, webhook_id)
+
+        for remove_listener in hass.data[DOMAIN].pop('retention_listeners', []):
+            remove_listener()
+
+        # info: A reload applies a changed camera start concurrency
+        hass.data[DOMAIN].pop('camera_start_slots', None)
+        hass.data[DOMAIN].pop('event_summary_slots', None)
+
         # NOTE: Disconnect dispatcher listeners if they exist
         device_added_listener = hass.data[DOMAIN].pop('device_added_listener', None)
         device_removed_listener = hass.data[DOMAIN].pop('device_removed_listener', None)
@@ -264,6 +360,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             device_removed_listener()
             _LOGGER.debug("[HomeAIVision] Disconnected device_removed_listener.")
 
+        notification_dispatcher = hass.data[DOMAIN].pop('notification_dispatcher', None)
+        if notification_dispatcher:
+            await notification_dispatcher.async_stop()
+
+        watchdog = hass.data[DOMAIN].pop('watchdog', None)
+        if watchdog:
+            await watchdog.async_stop()
+
+        notification_renderer = hass.data[DOMAIN].pop('notification_renderer', None)
+        if notification_renderer:
+            notification_renderer.async_unload()
+
+        gallery = hass.data[DOMAIN].pop('gallery', None)
+        if gallery is not None:
+            await async_unload_gallery(hass, gallery)
+
         # NOTE: Finally, remove the store
         hass.data[DOMAIN].pop('store', None)
     else:
@@ -1,9 +1,12 @@
+import time
 import logging
 import aiohttp  # type: ignore
 
 from homeassistant.core import HomeAssistant, ServiceCall  # type: ignore
+from homeassistant.exceptions import HomeAssistantError  # type: ignore
 from homeassistant.helpers.dispatcher import async_dispatcher_send  # type: ignore
 from homeassistant.components.persistent_notification import create as pn_create  # type: ignore
+from homeassistant.helpers.importlib import async_import_module  # type: ignore
 from aiohttp import ClientConnectorError  # type: ignore
 
 from .const import DOMAIN, CONF_AZURE_API_KEY, CONF_AZURE_ENDPOINT
@@ -11,6 +14,8 @@ from .store import HomeAIVisionStore
 from .azure_client import analyze_image_with_azure
 from .save_image_manager import save_image
 from .notification_manager import send_notification
+from .pipeline_metrics import get_pipeline_metrics, STAGE_FETCH, STAGE_AZURE, STAGE_SAVE, STAGE_NOTIFY
+from .profiler import async_run_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,6 +23,8 @@ _LOGGER = logging.getLogger(__name__)
 ACTION_MANUAL_ANALYZE = "manual_analyze"
 ACTION_RESET_LOCAL_COUNTER = "reset_local_counter"
 ACTION_RESET_GLOBAL_COUNTER = "reset_global_counter"
+ACTION_SET_DETECTION_ZONES = "set_detection_zones"
+ACTION_PROFILE = "profile"
 
 # INFO: Implementation of actions
 async def handle_manual_analyze(call: ServiceCall, hass: HomeAssistant):
@@ -69,19 +76,27 @@ async def handle_manual_analyze(call: ServiceCall, hass: HomeAssistant):
     azure_confidence_threshold = device.azure_confidence_threshold
 
     _LOGGER.debug(f"[HomeAIVision] Starting manual analysis for device {device_id}")
+    metrics = get_pipeline_metrics(hass, device_id)
 
     try:
+        # info: Pillow is imported in the import executor, analyze_image_with_azure only finds it loaded
+        await async_import_module(hass, "PIL.ImageDraw")
         async with aiohttp.ClientSession() as session:
+            fetch_start = time.monotonic()
             async with session.get(device.url) as response:
                 if response.status == 200:
                     image_data = await response.read()
-                    object_detected, modified_image_data, detected_object_name = await analyze_image_with_azure(
-                        image_data,
-                        azure_api_key,
-                        azure_endpoint,
-                        to_detect_object,
-                        azure_confidence_threshold,
-                    )
+                    metrics.observe(STAGE_FETCH, time.monotonic() - fetch_start)
+                    with metrics.span(STAGE_AZURE):
+                        object_detected, modified_image_data, detected_object_name = await analyze_image_with_azure(
+                            image_data,
+                            azure_api_key,
+                            azure_endpoint,
+                            to_detect_object,
+                            azure_confidence_threshold,
+                            device.detection_zones,
+                        )
+                    metrics.record_azure_result(object_detected)
 
                     # INFO: Increment Azure request counter for the device
                     if device:
@@ -99,26 +114,33 @@ async def handle_manual_analyze(call: ServiceCall, hass: HomeAssistant):
                     # NOTE: Save the image if an object was detected
                     if object_detected and modified_image_data:
                         cam_frames_path = hass.config.path("www/HomeAIVision/cam_frames/")
-                        save_path = await save_image(
-                            cam_frames_path,
-                            device.name,
-                            modified_image_data,
-                            device.max_images_per_day,
-                            device.days_to_keep,
-                        )
+                        with metrics.span(STAGE_SAVE):
+                            save_path, thumbnail_path = await save_image(
+                                cam_frames_path,
+                                device.name,
+                                modified_image_data,
+                                device.max_images_per_day,
+                                device.days_to_keep,
+                                device.thumbnail_format,
+                                hass.data[DOMAIN].get('gallery'),
+                                detected_object_name,
+                                metrics,
+                            )
                         _LOGGER.info(f"[HomeAIVision] Analysis completed for device {device_id}, image saved at {save_path}")
 
                         # IMPORTANT: Send notification if enabled
+                        # NOTE: Manual analysis is requested explicitly, so the cooldown does not apply
                         if device.send_notifications:
-                            language = store.get_language()
-                            _LOGGER.debug(f"[HomeAIVision] Notification language: {language}")
                             relative_path = save_path.replace(hass.config.path(), "").lstrip("/")
-                            await send_notification(
-                                hass,
-                                detected_object_name,
-                                relative_path,
-                                language,
-                            )
+                            with metrics.span(STAGE_NOTIFY):
+                                send_notification(
+                                    hass,
+                                    device_id,
+                                    device.name,
+                                    detected_object_name,
+                                    (thumbnail_path or save_path).replace(hass.config.path(), "").lstrip("/"),
+                                    full_image_path=relative_path,
+                                )
 
                     _LOGGER.info(f"[HomeAIVision] Manual analysis completed for device {device_id}")
                 else:
@@ -190,3 +212,54 @@ async def handle_reset_global_counter(call: ServiceCall, hass: HomeAssistant):
 
     # IMPORTANT: Notify other components of the global update
     async_dispatcher_send(hass, f"{DOMAIN}_global_update")
+
+
+async def handle_set_detection_zones(call: ServiceCall, hass: HomeAssistant):
+    """
+    Handle the set detection zones action.
+
+    This function replaces the include/exclude detection zones of a device.
+    A running camera task picks up the new zones on its next frame.
+
+    Args:
+        call (ServiceCall): The service call object containing data.
+        hass (HomeAssistant): The Home Assistant instance.
+    """
+    device_id = call.data.get('device_id')
+    store: HomeAIVisionStore = hass.data[DOMAIN]['store']
+
+    device = store.get_device(device_id)
+    if not device:
+        _LOGGER.error(f"[HomeAIVision] set_detection_zones action called for unknown device_id: {device_id}")
+        return
+
+    # INFO: An empty list removes all zones, the whole frame is analysed again
+    device.detection_zones = call.data.get('zones', [])
+    await store.async_update_device(device_id, device)
+    _LOGGER.info(f"[HomeAIVision] Set {len(device.detection_zones)} detection zones for device {device_id}")
+
+
+async def handle_profile(call: ServiceCall, hass: HomeAssistant):
+    """
+    Handle the profile action.
+
+    This function runs a time-boxed profiling session of the integration while
+    the cameras keep running, writes the full report under the configuration
+    directory and returns a summary as the service response.
+
+    Args:
+        call (ServiceCall): The service call object containing data.
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        dict: Summary of the profiling session.
+    """
+    # NOTE: Only one session at a time, the sampler and tracemalloc are process wide
+    if hass.data[DOMAIN].get('profiling'):
+        raise HomeAssistantError("A HomeAIVision profiling session is already running")
+
+    hass.data[DOMAIN]['profiling'] = True
+    try:
+        return await async_run_profile(hass, call.data['duration'], call.data['top'])
+    finally:
+        hass.data[DOMAIN]['profiling'] = False
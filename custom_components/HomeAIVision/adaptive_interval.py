@@ -0,0 +1,86 @@
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Adaptive polling parameters
+ADAPTIVE_DECAY_FACTOR = 1.25        # info: Growth of the interval after every quiet frame
+ADAPTIVE_ACTIVITY_RATIO = 0.5       # info: Share of the dynamic threshold from which the scene counts as active
+ADAPTIVE_SPEEDUP_FACTOR = 0.5       # info: Shrink of the interval after an active frame
+
+# NOTE: Scene activity reported with every adaptive interval update
+ACTIVITY_QUIET = "quiet"
+ACTIVITY_RISING = "rising"
+ACTIVITY_MOTION = "motion"
+
+
+class AdaptiveInterval:
+    """
+    Per-camera polling interval driven by the activity of the scene.
+
+    Significant motion or an object in the scene drops the interval to
+    `min_interval` at once. A motion score rising towards the dynamic threshold
+    halves it. Every quiet frame stretches it by ADAPTIVE_DECAY_FACTOR until it
+    reaches `max_interval`, so a quiet camera reaches the maximum after a few
+    dozen frames and an active camera keeps its reaction time.
+
+    Like the sampling policy, the interval counts frames rather than seconds, so
+    the same sequence of frames always produces the same intervals.
+    """
+
+    def __init__(self, min_interval=1, max_interval=30):
+        """
+        Initialize the AdaptiveInterval.
+
+        Args:
+            min_interval (float): Interval in seconds of an active scene.
+            max_interval (float): Interval in seconds of a quiet scene.
+        """
+        self.configure(min_interval, max_interval)
+        # info: A camera starts fast, since nothing is known about its scene yet
+        self.interval = self.min_interval
+        self.activity = ACTIVITY_QUIET
+
+    def configure(self, min_interval, max_interval):
+        """Apply new bounds, keeping the current interval within them."""
+        self.min_interval = max(1.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        if hasattr(self, "interval"):
+            self.interval = min(max(self.interval, self.min_interval), self.max_interval)
+
+    def update(self, motion_score, dynamic_threshold, active):
+        """
+        Adapt the interval to a processed frame.
+
+        Args:
+            motion_score (float): Motion score of the frame.
+            dynamic_threshold (float or None): Threshold the score was compared with, None while an object is present.
+            active (bool): True if the frame had significant motion or an object is present.
+
+        Returns:
+            float: The interval in seconds before the next frame.
+        """
+        if active:
+            self.activity = ACTIVITY_MOTION
+            self.interval = self.min_interval
+        elif dynamic_threshold and motion_score >= dynamic_threshold * ADAPTIVE_ACTIVITY_RATIO:
+            self.activity = ACTIVITY_RISING
+            self.interval = max(self.min_interval, self.interval * ADAPTIVE_SPEEDUP_FACTOR)
+        else:
+            self.activity = ACTIVITY_QUIET
+            self.interval = min(self.max_interval, self.interval * ADAPTIVE_DECAY_FACTOR)
+        return self.interval
+
+
+def simulate_interval(adaptive_interval, frames):
+    """
+    Replay a sequence of frames through an adaptive interval offline.
+
+    Args:
+        adaptive_interval (AdaptiveInterval): The interval to drive.
+        frames (list): (motion_score, dynamic_threshold, active) tuples.
+
+    Returns:
+        tuple: (intervals, seconds) with the interval after every frame and the seconds the frames cover.
+    """
+    intervals = [adaptive_interval.update(*frame) for frame in frames]
+    return intervals, sum(intervals)
@@ -1,12 +1,13 @@
 import aiohttp  # type: ignore
 import logging
 import io
-from PIL import Image, ImageDraw
+
+from .detection_zones import is_point_in_zones
 
 _LOGGER = logging.getLogger(__name__)
 
 async def analyze_image_with_azure(
-    image_data, azure_api_key, azure_endpoint, objects, confidence_threshold
+    image_data, azure_api_key, azure_endpoint, objects, confidence_threshold, detection_zones=None
 ):
     """
     Analyzes the image for the presence of specified objects using Azure Cognitive Services.
@@ -17,6 +18,7 @@ async def analyze_image_with_azure(
     - azure_endpoint (str): Azure Cognitive Services endpoint URL.
     - objects (list): List of objects to detect.
     - confidence_threshold (float): Minimum confidence level to consider a detection valid.
+    - detection_zones (list, optional): Zones limiting where detections are accepted.
 
     Returns:
     - tuple:
@@ -60,6 +62,9 @@ async def analyze_image_with_azure(
                 response_json = await response.json()
                 _LOGGER.debug(f"Azure response: {response_json}")
 
+                # IMPORTANT: Callers preload PIL.ImageDraw with async_import_module, so this import never loads it on the event loop
+                from PIL import Image, ImageDraw
+
                 # INFO: Open the original image for drawing detected objects
                 image = Image.open(io.BytesIO(image_data))
                 draw = ImageDraw.Draw(image)
@@ -72,6 +77,13 @@ async def analyze_image_with_azure(
                     object_name, confidence = extract_object_with_hierarchy(
                         item, objects
                     )
+                    if object_name and detection_zones and not is_detection_in_zones(
+                        item['rectangle'], image.size, detection_zones
+                    ):
+                        _LOGGER.debug(
+                            f"[HomeAIVision] Ignoring {object_name} outside detection zones: {item['rectangle']}"
+                        )
+                        continue
                     if object_name and confidence >= confidence_threshold:
                         object_detected = True
                         detected_object_name = object_name
@@ -114,3 +126,21 @@ def extract_object_with_hierarchy(item, target_objects):
         # NOTE: Traverse to the parent object if available
         item = item.get('parent')
     return None, None
+
+
+def is_detection_in_zones(rect, image_size, detection_zones):
+    """
+    Check if the center of a detection box lies within the active detection zones.
+
+    Parameters:
+    - rect (dict): Azure bounding box with 'x', 'y', 'w' and 'h' keys.
+    - image_size (tuple): (width, height) of the analysed image.
+    - detection_zones (list): Zones as stored in DeviceData.
+
+    Returns:
+    - bool: True if the detection should be kept.
+    """
+    width, height = image_size
+    center_x = (rect['x'] + rect['w'] / 2) / width
+    center_y = (rect['y'] + rect['h'] / 2) / height
+    return is_point_in_zones(center_x, center_y, detection_zones)
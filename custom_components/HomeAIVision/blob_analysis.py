@@ -0,0 +1,151 @@
+import re
+import logging
+import attr  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Matches a run of non-zero (motion) pixels within a single mask row
+_RUN_PATTERN = re.compile(rb"[^\x00]+")
+
+
+@attr.s(slots=True)
+class MotionBlob:
+    """Class representing a single connected region of motion pixels."""
+
+    area = attr.ib(type=int)
+    x = attr.ib(type=int)
+    y = attr.ib(type=int)
+    width = attr.ib(type=int)
+    height = attr.ib(type=int)
+
+    @property
+    def aspect_ratio(self):
+        """Return the width to height ratio of the blob bounding box."""
+        return self.width / self.height if self.height else 0.0
+
+    @property
+    def bounding_box(self):
+        """Return the bounding box as an (x, y, width, height) tuple."""
+        return (self.x, self.y, self.width, self.height)
+
+    def asdict(self):
+        """Convert the MotionBlob instance to a dictionary."""
+        data = attr.asdict(self)
+        data['aspect_ratio'] = round(self.aspect_ratio, 2)
+        return data
+
+
+def find_motion_blobs(mask_image):
+    """
+    Label 8-connected motion regions in a binary mask.
+
+    The mask is scanned row by row as runs of motion pixels, and runs that touch
+    a run in the previous row are merged with a union-find structure. Work is
+    proportional to the number of runs, not the number of pixels.
+
+    Args:
+        mask_image (PIL.Image.Image): Binary ('L' mode) mask, motion pixels are non-zero.
+
+    Returns:
+        list: MotionBlob instances sorted by area, largest first.
+    """
+    width, height = mask_image.size
+    data = mask_image.tobytes()
+
+    parent = []
+    areas = []
+    boxes = []  # info: [min_x, min_y, max_x, max_y] per label
+
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def union(first, second):
+        first, second = find(first), find(second)
+        if first == second:
+            return first
+        if areas[first] < areas[second]:
+            first, second = second, first
+        parent[second] = first
+        areas[first] += areas[second]
+        box, other = boxes[first], boxes[second]
+        box[0] = min(box[0], other[0])
+        box[1] = min(box[1], other[1])
+        box[2] = max(box[2], other[2])
+        box[3] = max(box[3], other[3])
+        return first
+
+    previous_runs = []
+    for y in range(height):
+        row = data[y * width:(y + 1) * width]
+        current_runs = []
+        start_index = 0
+        for match in _RUN_PATTERN.finditer(row):
+            start, end = match.start(), match.end()
+            label = len(parent)
+            parent.append(label)
+            areas.append(end - start)
+            boxes.append([start, y, end - 1, y])
+
+            # info: 8-connectivity, a run touches the previous row if the spans overlap or meet diagonally
+            for index in range(start_index, len(previous_runs)):
+                previous_start, previous_end, previous_label = previous_runs[index]
+                if previous_end < start:
+                    start_index = index + 1
+                    continue
+                if previous_start > end:
+                    break
+                label = union(label, previous_label)
+            current_runs.append((start, end, label))
+        previous_runs = current_runs
+
+    blobs = []
+    for label in range(len(parent)):
+        if parent[label] == label:
+            min_x, min_y, max_x, max_y = boxes[label]
+            blobs.append(MotionBlob(
+                area=areas[label],
+                x=min_x,
+                y=min_y,
+                width=max_x - min_x + 1,
+                height=max_y - min_y + 1,
+            ))
+    blobs.sort(key=lambda blob: blob.area, reverse=True)
+    return blobs
+
+
+def filter_blobs(blobs, min_blob_area, max_blob_area):
+    """
+    Keep only the blobs whose area lies within the configured size range.
+
+    Args:
+        blobs (list): MotionBlob instances.
+        min_blob_area (float): Minimum blob area in pixels.
+        max_blob_area (float): Maximum blob area in pixels.
+
+    Returns:
+        list: MotionBlob instances within the size range.
+    """
+    return [blob for blob in blobs if min_blob_area <= blob.area <= max_blob_area]
+
+
+def describe_blobs(blobs, limit=3):
+    """
+    Build a short, log-friendly summary of the largest blobs.
+
+    Args:
+        blobs (list): MotionBlob instances sorted by area.
+        limit (int): Maximum number of blobs to describe.
+
+    Returns:
+        str: Summary with the blob count and the largest bounding boxes.
+    """
+    if not blobs:
+        return "no blobs"
+    details = ", ".join(
+        f"{blob.area}px@{blob.bounding_box} ar={blob.aspect_ratio:.2f}"
+        for blob in blobs[:limit]
+    )
+    return f"{len(blobs)} blobs, largest: {details}"
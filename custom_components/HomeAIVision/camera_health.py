@@ -0,0 +1,177 @@
+import time
+import asyncio
+import logging
+import aiohttp  # type: ignore
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Health states of a camera
+HEALTH_HEALTHY = "healthy"
+HEALTH_DEGRADED = "degraded"        # info: Recent fetches failed, retried with a growing backoff
+HEALTH_DOWN = "down"                # info: Circuit open, only a single probe fetch is made when the backoff expires
+HEALTH_STATES = (HEALTH_HEALTHY, HEALTH_DEGRADED, HEALTH_DOWN)
+
+# NOTE: Kinds of fetch failures
+FAILURE_TIMEOUT = "timeout"
+FAILURE_CONNECTION = "connection"
+FAILURE_HTTP = "http_status"
+FAILURE_CLIENT = "client_error"
+FAILURE_KINDS = (FAILURE_TIMEOUT, FAILURE_CONNECTION, FAILURE_HTTP, FAILURE_CLIENT)
+
+# NOTE: Backoff and circuit breaker parameters
+HEALTH_DOWN_AFTER_FAILURES = 3      # info: Consecutive failures that open the circuit
+HEALTH_BACKOFF_FACTOR = 2.0
+HEALTH_MAX_BACKOFF = 300            # info: Upper bound in seconds of the wait between two attempts
+HEALTH_NOTIFICATION_ID = "homeaivision_camera_error_{}"
+
+HEALTH_UPDATE_SIGNAL = f"{DOMAIN}_{{}}_health"
+
+
+class CameraFetchError(Exception):
+    """A fetch that reached the camera but did not return an image."""
+
+    def __init__(self, kind, detail):
+        """
+        Initialize the CameraFetchError.
+
+        Args:
+            kind (str): One of FAILURE_KINDS.
+            detail (str): Description of the failure.
+        """
+        super().__init__(detail)
+        self.kind = kind
+
+
+def classify_fetch_error(error):
+    """
+    Return the kind of a fetch failure.
+
+    Args:
+        error (Exception): The exception raised by the fetch.
+
+    Returns:
+        str: One of FAILURE_KINDS.
+    """
+    if isinstance(error, CameraFetchError):
+        return error.kind
+    # info: aiohttp raises its timeouts as subclasses of asyncio.TimeoutError
+    if isinstance(error, asyncio.TimeoutError):
+        return FAILURE_TIMEOUT
+    if isinstance(error, (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError)):
+        return FAILURE_CONNECTION
+    return FAILURE_CLIENT
+
+
+class CameraHealth:
+    """
+    Health state machine of the frame fetches of a camera.
+
+    A failed fetch makes a healthy camera degraded, and HEALTH_DOWN_AFTER_FAILURES
+    consecutive failures open the circuit (down). Every failure doubles the wait
+    before the next attempt, from the polling interval up to HEALTH_MAX_BACKOFF.
+    While the circuit is open no fetch is made until the wait expires, then a
+    single probe decides: a successful probe makes the camera healthy again, a
+    failed one keeps it down with a longer wait.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """
+        Initialize the CameraHealth.
+
+        Args:
+            clock (callable): Monotonic clock, replaceable for offline tools.
+        """
+        self._clock = clock
+        self.state = HEALTH_HEALTHY
+        self.consecutive_failures = 0
+        self.last_failure = None
+        self.last_error = None
+        self.failures = dict.fromkeys(FAILURE_KINDS, 0)
+        self._next_attempt = 0.0
+
+    def can_attempt(self):
+        """
+        Check whether a fetch may be made now.
+
+        Returns:
+            bool: False while the backoff of a failing camera has not expired.
+        """
+        return self.state == HEALTH_HEALTHY or self._clock() >= self._next_attempt
+
+    def retry_in(self):
+        """
+        Return the seconds until the next fetch may be made.
+
+        Returns:
+            float: 0.0 if a fetch may be made now.
+        """
+        if self.state == HEALTH_HEALTHY:
+            return 0.0
+        return max(0.0, self._next_attempt - self._clock())
+
+    def record_success(self):
+        """
+        Record a successful fetch.
+
+        Returns:
+            str or None: The previous state if the state changed, None otherwise.
+        """
+        previous = self.state
+        self.state = HEALTH_HEALTHY
+        self.consecutive_failures = 0
+        self._next_attempt = 0.0
+        return previous if previous != self.state else None
+
+    def record_failure(self, error, interval):
+        """
+        Record a failed fetch and schedule the next attempt.
+
+        Args:
+            error (Exception): The exception raised by the fetch.
+            interval (float): The regular polling interval, the first step of the backoff.
+
+        Returns:
+            str or None: The previous state if the state changed, None otherwise.
+        """
+        previous = self.state
+        kind = classify_fetch_error(error)
+        self.failures[kind] += 1
+        self.consecutive_failures += 1
+        self.last_failure = kind
+        self.last_error = str(error) or type(error).__name__
+
+        backoff = max(1.0, interval) * HEALTH_BACKOFF_FACTOR ** (self.consecutive_failures - 1)
+        self._next_attempt = self._clock() + min(HEALTH_MAX_BACKOFF, backoff)
+        self.state = HEALTH_DOWN if self.consecutive_failures >= HEALTH_DOWN_AFTER_FAILURES else HEALTH_DEGRADED
+        return previous if previous != self.state else None
+
+    def as_attributes(self):
+        """
+        Return the health details as state attributes.
+
+        Returns:
+            dict: Consecutive failures, the latest failure, the wait before the next attempt and failures by kind.
+        """
+        return {
+            "consecutive_failures": self.consecutive_failures,
+            "last_failure": self.last_failure,
+            "last_error": self.last_error,
+            "retry_in": round(self.retry_in(), 1),
+            **{f"{kind}_failures": count for kind, count in self.failures.items()},
+        }
+
+
+def get_camera_health(hass, device_id):
+    """
+    Return the health of a device, creating it on first use.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device_id (str): The ID of the device.
+
+    Returns:
+        CameraHealth: The health of the device.
+    """
+    return hass.data[DOMAIN].setdefault('camera_health', {}).setdefault(device_id, CameraHealth())
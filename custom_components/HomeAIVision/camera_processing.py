@@ -1,34 +1,286 @@
+import os
 import asyncio
 import logging
-import io
 import aiohttp  # type: ignore
 import traceback
 
-from PIL import Image, ImageChops, ImageFilter
-from statistics import median
-
 import time
 
-from aiohttp import ClientConnectorError  # type: ignore
+from functools import partial
+
 from homeassistant.helpers.dispatcher import async_dispatcher_send  # type: ignore
-from homeassistant.components.persistent_notification import create as pn_create  # type: ignore
-from homeassistant.core import HomeAssistant  # type: ignore
+from homeassistant.components.persistent_notification import (  # type: ignore
+    async_create as pn_async_create,
+    async_dismiss as pn_async_dismiss,
+)
+from homeassistant.helpers.importlib import async_import_module  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
 from homeassistant.config_entries import ConfigEntry  # type: ignore
 
 from .notification_manager import send_notification
-from .save_image_manager import save_image, clean_up_old_images
+from .save_image_manager import save_image, save_event_frames, get_event_folder_path, get_folder_size, THUMBNAIL_FORMAT_OFF
 from .const import (
     DOMAIN,
     CONF_AZURE_API_KEY,
     CONF_AZURE_ENDPOINT,
-    CONF_MOTION_DETECTION_HISTORY_SIZE,
 )
 from .store import HomeAIVisionStore
 from .azure_client import analyze_image_with_azure
+from .detection_zones import zones_key
+from .push_ingest import get_push_inbox
+from .motion_trigger import MotionTrigger
+from .adaptive_interval import AdaptiveInterval
+from .event_buffer import FrameRingBuffer, EventCapture
+from .event_summary import build_event_summary
+from .camera_health import (
+    CameraFetchError,
+    FAILURE_HTTP,
+    HEALTH_DEGRADED,
+    HEALTH_DOWN,
+    HEALTH_MAX_BACKOFF,
+    HEALTH_NOTIFICATION_ID,
+    HEALTH_UPDATE_SIGNAL,
+    get_camera_health,
+)
+from .pipeline_metrics import (
+    get_pipeline_metrics,
+    STAGE_FETCH,
+    STAGE_FETCH_MAIN,
+    STAGE_DECODE,
+    STAGE_PROCESS,
+    STAGE_AZURE,
+    STAGE_SAVE,
+    STAGE_NOTIFY,
+    STAGE_SUMMARY,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@callback
+def start_camera_task(hass: HomeAssistant, entry: ConfigEntry, device_config: dict):
+    """
+    Start the periodic check of a device.
+
+    The check runs as a background task, so Home Assistant does not wait for it
+    to finish its startup.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry (ConfigEntry): The configuration entry for the integration.
+        device_config (dict): Configuration parameters for the specific device.
+    """
+    stop_event = asyncio.Event()
+    task = hass.async_create_background_task(
+        periodic_check(hass, entry, device_config, stop_event),
+        f"homeaivision_camera_{device_config['id']}",
+    )
+    hass.data[DOMAIN]['camera_tasks'][device_config['id']] = (task, stop_event)
+
+
+def get_camera_start_slots(hass: HomeAssistant):
+    """
+    Return the semaphore limiting how many cameras warm up at the same time.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        asyncio.Semaphore: Created on first use with the configured camera start concurrency.
+    """
+    data = hass.data[DOMAIN]
+    if 'camera_start_slots' not in data:
+        data['camera_start_slots'] = asyncio.Semaphore(data['store'].get_camera_start_concurrency())
+    return data['camera_start_slots']
+
+
+@callback
+def async_report_health_transition(hass: HomeAssistant, device_id, device_name, url, health, previous):
+    """
+    Log a health transition, update the health sensor and notify about an outage once.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device_id (str): The ID of the device.
+        device_name (str): The name of the device.
+        url (str): The URL that was fetched.
+        health (CameraHealth): The health after the transition.
+        previous (str): The state before the transition.
+    """
+    notification_id = HEALTH_NOTIFICATION_ID.format(device_id)
+    if health.state == HEALTH_DOWN:
+        _LOGGER.error(
+            f"[HomeAIVision] Camera {device_name} is down after {health.consecutive_failures} failed fetches "
+            f"({health.last_failure}: {health.last_error}), probing every {HEALTH_MAX_BACKOFF} seconds at most"
+        )
+        pn_async_create(
+            hass,
+            (
+                f"Unable to fetch images from the camera {device_name} at {url} ({health.last_failure}). "
+                "Please ensure the camera is online and the URL is correct."
+            ),
+            title="HomeAIVision Camera Connection Error",
+            notification_id=notification_id,
+        )
+    elif health.state == HEALTH_DEGRADED:
+        _LOGGER.warning(
+            f"[HomeAIVision] Camera {device_name} is degraded ({health.last_failure}: {health.last_error})"
+        )
+    else:
+        _LOGGER.info(f"[HomeAIVision] Camera {device_name} is healthy again")
+        if previous == HEALTH_DOWN:
+            pn_async_dismiss(hass, notification_id)
+    async_dispatcher_send(hass, HEALTH_UPDATE_SIGNAL.format(device_id))
+
+
+def get_summary_slots(hass: HomeAssistant):
+    """
+    Return the semaphore letting a single event summary run at a time.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+
+    Returns:
+        asyncio.Semaphore: Created on first use.
+    """
+    return hass.data[DOMAIN].setdefault('event_summary_slots', asyncio.Semaphore(1))
+
+
+async def record_event_storage(watchdog, metrics, event):
+    """
+    Account the size change of an event folder to the storage usage of the device.
+
+    Only the small event folder is measured, the summaries rewrite its clip and
+    contact sheet, so the change is taken against the size accounted before.
+
+    Args:
+        watchdog (LoopWatchdog): Accounts the executor job to the save stage.
+        metrics (PipelineMetrics): The metrics of the device.
+        event (EventCapture): The event group.
+    """
+    size = await watchdog.async_add_executor_job(STAGE_SAVE, get_folder_size, event.event_path)
+    metrics.adjust_storage(0, size - event.stored_size)
+    event.stored_size = size
+
+
+async def summarize_event(hass: HomeAssistant, watchdog, metrics, event, frames, on_summary=None):
+    """
+    Build the clip and the contact sheet of an event group.
+
+    Summaries wait for each other, so several detections at once take a single
+    executor worker instead of competing with the frame processing.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        watchdog (LoopWatchdog): Accounts the executor job to the summary stage.
+        metrics (PipelineMetrics): The metrics of the device.
+        event (EventCapture): The event group.
+        frames (list): (offset, image_data) tuples of the event group.
+        on_summary (callable, optional): Called with the path of the written contact sheet, or None if the summary failed.
+    """
+    event_path = event.event_path
+    contact_sheet_path = None
+    async with get_summary_slots(hass):
+        try:
+            with metrics.span(STAGE_SUMMARY):
+                _, contact_sheet_path = await watchdog.async_add_executor_job(
+                    STAGE_SUMMARY, build_event_summary, event_path, frames
+                )
+        except Exception as e:
+            # info: The summary runs in an unawaited background task, so every failure is logged here
+            _LOGGER.error(f"[HomeAIVision] Failed to save the event summary {event_path}: {e}")
+            _LOGGER.debug(traceback.format_exc())
+    await record_event_storage(watchdog, metrics, event)
+    if on_summary is not None:
+        on_summary(contact_sheet_path)
+
+
+@callback
+def schedule_event_summary(hass: HomeAssistant, watchdog, metrics, event, on_summary=None):
+    """
+    Start the summary of the frames an event group holds so far in the background.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        watchdog (LoopWatchdog): Accounts the executor job to the summary stage.
+        metrics (PipelineMetrics): The metrics of the device.
+        event (EventCapture): The event group.
+        on_summary (callable, optional): Called once the summary is written or failed, see `summarize_event`.
+    """
+    hass.async_create_background_task(
+        summarize_event(hass, watchdog, metrics, event, event.summary_frames(), on_summary),
+        f"homeaivision_event_summary_{os.path.basename(event.event_path)}",
+    )
+
+
+async def save_event_group(hass: HomeAssistant, watchdog, metrics, event, on_summary=None):
+    """
+    Write the frames of a complete event group in the executor and summarize it.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        watchdog (LoopWatchdog): Accounts the executor jobs to their stage.
+        metrics (PipelineMetrics): The metrics of the device.
+        event (EventCapture): The event group.
+        on_summary (callable, optional): Called once the summary is written or failed, see `summarize_event`.
+    """
+    try:
+        await watchdog.async_add_executor_job(STAGE_SAVE, save_event_frames, event.event_path, event.files())
+    except OSError as e:
+        _LOGGER.error(f"[HomeAIVision] Failed to save the event frames {event.event_path}: {e}")
+        if on_summary is not None:
+            on_summary(None)
+        return
+    await record_event_storage(watchdog, metrics, event)
+    schedule_event_summary(hass, watchdog, metrics, event, on_summary)
+
+
+@callback
+def notify_detection(hass: HomeAssistant, device, detected_object, image_path, full_image_path, contact_sheet_path=None):
+    """
+    Queue the notification of a saved detection.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device (DeviceData): The device that made the detection.
+        detected_object (str): The detected object.
+        image_path (str): The attached image, the thumbnail or the saved image.
+        full_image_path (str): The saved image opened on tap.
+        contact_sheet_path (str, optional): The written contact sheet of the event, attached instead of the image.
+    """
+    config_path = hass.config.path()
+    send_notification(
+        hass,
+        device.id,
+        device.name,
+        detected_object,
+        (contact_sheet_path or image_path).replace(config_path, "").lstrip("/"),
+        cooldown=device.notification_cooldown,
+        full_image_path=full_image_path.replace(config_path, "").lstrip("/"),
+    )
+
+
+async def fetch_main_image(session, cam_url):
+    """
+    Fetch a frame from the main stream of a dual-stream camera.
+
+    Args:
+        session (aiohttp.ClientSession): The session of the camera task.
+        cam_url (str): The main (high-resolution) snapshot URL.
+
+    Returns:
+        bytes or None: The image data, None if the frame could not be fetched.
+    """
+    try:
+        async with session.get(cam_url) as response:
+            if response.status == 200:
+                return await response.read()
+            _LOGGER.warning(f"[HomeAIVision] Failed to fetch the main stream image, status code: {response.status}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        _LOGGER.warning(f"[HomeAIVision] Failed to fetch the main stream image: {e}")
+    return None
+
+
 async def periodic_check(hass: HomeAssistant, entry: ConfigEntry, device_config: dict, stop_event: asyncio.Event):
     """
     Periodically checks the camera feed for motion and analyzes detected motion.
@@ -42,14 +294,27 @@ async def periodic_check(hass: HomeAssistant, entry: ConfigEntry, device_config:
     device_id = device_config['id']
     store = hass.data[DOMAIN]['store']
     cam_frames_path = hass.config.path("www/HomeAIVision/cam_frames/")
+    gallery = hass.data[DOMAIN].get('gallery')
     days_to_keep = device_config.get("days_to_keep", 30)
     max_images_per_day = device_config.get("max_images_per_day", 100)
     send_notifications = device_config.get("send_notifications", False)
     cam_url = device_config.get("url", "")
+    # info: Dual-stream cameras are polled on the low-resolution stream, the main stream is fetched only for Azure
+    motion_url = device_config.get("motion_url") or cam_url
+    push_only = device_config.get("push_only", False)
+    pre_event_frames = device_config.get("pre_event_frames", 0)
+    post_event_frames = device_config.get("post_event_frames", 0)
+    thumbnail_format = device_config.get("thumbnail_format", THUMBNAIL_FORMAT_OFF)
+    trigger_entity_id = device_config.get("trigger_entity_id", "")
 
     # NOTE: Motion detection parameters
-    motion_detection_history_size = device_config.get(CONF_MOTION_DETECTION_HISTORY_SIZE, 10)
     motion_detection_interval = device_config.get("motion_detection_interval", 5)
+    trigger_idle_interval = device_config.get("trigger_idle_interval", 300)
+    adaptive_interval = None
+    if device_config.get("adaptive_interval", False):
+        adaptive_interval = AdaptiveInterval(
+            device_config.get("adaptive_interval_min", 1), device_config.get("adaptive_interval_max", 30)
+        )
 
     if not cam_url:
         _LOGGER.error(
@@ -58,243 +323,221 @@ async def periodic_check(hass: HomeAssistant, entry: ConfigEntry, device_config:
         )
         return
 
-    # NOTE: Clean up old images based on retention policy
-    await clean_up_old_images(cam_frames_path, days_to_keep)
+    # NOTE: Hold a start slot until the first frame is processed, so a restart with many cameras ramps up
+    start_slots = get_camera_start_slots(hass)
+    await start_slots.acquire()
+    holding_start_slot = True
 
     _LOGGER.debug(f"[HomeAIVision] Starting periodic_check for device {device_id}")
+    trigger = None
+    pending_event = None
     try:
+        # info: Pillow and the image processing modules are imported in the import executor on first use
+        motion_detection = await async_import_module(hass, f"{__package__}.motion_detection")
+        detection_state = await async_import_module(hass, f"{__package__}.detection_state")
+        # info: ImageDraw is used by analyze_image_with_azure on the event loop
+        await async_import_module(hass, "PIL.ImageDraw")
+
         async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-            reference_image = None                                  # info: Reference image for motion detection
-            reference_image_time = time.monotonic()                 # info: Time when reference image was last updated
-            object_present = False                                  # info: Flag to track if object is currently present
-            motion_history = []                                     # info: List to store motion scores when no object is present
-            unknown_object_counter = 0                              # info: Counter for unknown objects
-            max_unknown_object_counter = 20                         # info: Max count before emergency notification
-            azure_request_intervals = [0, 1, 2, 3, 4, 10, 15, 20]   # info: Intervals for Azure requests
+            state = detection_state.CameraDetectionState()          # info: Reference frame, motion history and Azure decisions
+            metrics = get_pipeline_metrics(hass, device_id)         # info: Per-stage latencies and frame counters
+            watchdog = hass.data[DOMAIN]['watchdog']                # info: Accounts the executor jobs to their stage
+            inbox = get_push_inbox(hass, device_id)                 # info: Frames pushed through the webhook
+            health = get_camera_health(hass, device_id)             # info: Fetch failures, backoff and circuit breaker
+            # info: Recent raw frames for the event groups, the detection frame included
+            event_buffer = FrameRingBuffer(pre_event_frames + 1 if pre_event_frames or post_event_frames else 0)
+
+            # NOTE: A motion sensor of the camera decides when it is polled, push-only cameras are never polled
+            if trigger_entity_id and not push_only:
+                trigger = MotionTrigger(
+                    hass, trigger_entity_id, device_config.get("trigger_burst_duration", 30), inbox.wake
+                )
+                trigger.async_start()
 
             while not stop_event.is_set():
+                frame_start = time.monotonic()
+                frame_dropped = True
+                fetch_attempted = False
+                image_data = None
                 try:
-                    # NOTE: Create flag to control processing of the image 
-                    should_process = True
-
                     # NOTE: Fetch the latest device configuration
                     device = store.get_device(device_id)
                     if not device:
                         _LOGGER.error(f"[HomeAIVision] Device {device_id} not found")
                         break
-                    device_config = device.asdict()
                     to_detect_object = [device.to_detect_object]
-                    azure_confidence_threshold = device.azure_confidence_threshold
-
-                    # NOTE: Fetch image from the camera
-                    async with session.get(cam_url) as response:
-                        if response.status == 200:
-                            image_data = await response.read()
-
-                            if reference_image is None:
-                                try:
-                                    current_image = await hass.async_add_executor_job(
-                                        lambda: Image.open(io.BytesIO(image_data)).convert('L')
+                    detection_zones = device.detection_zones
+                    state.configure(device)
+
+                    # NOTE: Take a pushed frame, or fetch the image from the camera unless it is push-only
+                    image_data = inbox.take()
+                    # info: While the circuit is open, a trigger or a pushed frame does not bring the probe forward
+                    if image_data is None and not push_only and health.can_attempt():
+                        fetch_attempted = True
+                        try:
+                            async with session.get(motion_url) as response:
+                                if response.status != 200:
+                                    raise CameraFetchError(FAILURE_HTTP, f"status code {response.status}")
+                                image_data = await response.read()
+                            metrics.observe(STAGE_FETCH, time.monotonic() - frame_start)
+                            previous_health = health.record_success()
+                        except (asyncio.TimeoutError, aiohttp.ClientError, CameraFetchError) as e:
+                            _LOGGER.debug(f"[HomeAIVision] Failed to fetch image from {motion_url}: {e!r}")
+                            previous_health = health.record_failure(e, motion_detection_interval)
+                        if previous_health is not None:
+                            async_report_health_transition(hass, device_id, device.name, motion_url, health, previous_health)
+
+                    if image_data is not None:
+                        buffered_frame = event_buffer.add(image_data)
+                        if pending_event is not None:
+                            # NOTE: Frames after a detection complete its event group
+                            pending_event.add_post_frame(buffered_frame)
+                            if pending_event.complete:
+                                await save_event_group(hass, watchdog, metrics, pending_event)
+                                pending_event = None
+
+                        if state.reference_frame is None:
+                            try:
+                                current_frame = await watchdog.async_add_executor_job(
+                                    STAGE_DECODE, motion_detection.create_motion_frame, image_data
+                                )
+                                metrics.observe(STAGE_DECODE, current_frame.decode_time)
+                                state.initialize_reference(current_frame, device)
+                                frame_dropped = False
+                            except (IOError, SyntaxError) as e:
+                                _LOGGER.error(f"Failed to initialize reference image: {e}")
+                        else:
+                            # NOTE: Process image using executor to avoid blocking
+                            try:
+                                process_start = time.monotonic()
+                                motion_score, current_frame, blobs = await watchdog.async_add_executor_job(
+                                    STAGE_PROCESS,
+                                    motion_detection.process_image,
+                                    image_data,
+                                    state.reference_frame,
+                                    zones_key(detection_zones),
+                                    state.coarse_threshold if device.multi_scale_motion_detection else None,
+                                )
+                            except (IOError, SyntaxError) as e:
+                                _LOGGER.error(f"Failed to process image: {e}")
+                                metrics.record_dropped_frame()
+                                continue
+                            # info: The executor job includes the decode, so it is reported separately
+                            metrics.observe(STAGE_DECODE, current_frame.decode_time)
+                            metrics.observe(STAGE_PROCESS, time.monotonic() - process_start - current_frame.decode_time)
+                            frame_dropped = False
+                            # info: Checked before the evaluation, which may decode the full frame for a new reference
+                            full_resolution = current_frame.image is not None
+
+                            decision = state.evaluate(
+                                motion_score,
+                                current_frame,
+                                blobs,
+                                image_data,
+                                device,
+                                store.get_remaining_budget_ratio(),
+                            )
+                            unknown_object = decision.unknown_object
+                            metrics.record_motion(motion_score, decision.dynamic_threshold, full_resolution)
+                            if adaptive_interval is not None:
+                                adaptive_interval.update(
+                                    motion_score,
+                                    decision.dynamic_threshold,
+                                    decision.action not in (detection_state.ACTION_REFERENCE_UPDATED, detection_state.ACTION_OBJECT_LEFT),
+                                )
+
+                            if decision.action == detection_state.ACTION_REQUEST_AZURE:
+                                azure_image_data = decision.azure_image_data
+                                if motion_url != cam_url:
+                                    # NOTE: Azure and the archive get the main stream, the motion frame is only a fallback
+                                    with metrics.span(STAGE_FETCH_MAIN):
+                                        main_image_data = await fetch_main_image(session, cam_url)
+                                    azure_image_data = main_image_data or azure_image_data
+
+                                # NOTE: Motion detected, send image to Azure
+                                with metrics.span(STAGE_AZURE):
+                                    detected, modified_image_data, detected_object_name = await analyze_image_with_azure(
+                                        azure_image_data,
+                                        entry.data.get(CONF_AZURE_API_KEY),
+                                        entry.data.get(CONF_AZURE_ENDPOINT),
+                                        to_detect_object,
+                                        device.azure_confidence_threshold,
+                                        detection_zones,
                                     )
 
-                                    # NOTE: Load sensitivity level from device config
-                                    local_sensitivity_level = device_config.get('local_sensitivity_level', 'medium')
-
-                                    # NOTE: Calculate scaled thresholds based on sensitivity level
-                                    motion_detection_min_area, min_dynamic_threshold, max_dynamic_threshold = calculate_scaled_thresholds(current_image, local_sensitivity_level)
-
-                                    reference_image = current_image
-                                    reference_image_time = time.monotonic()
-                                    _LOGGER.debug("Reference image initialized.")
-                                except (IOError, SyntaxError) as e:
-                                    _LOGGER.error(f"Failed to initialize reference image: {e}")
-                                should_process = False
-
-                            if should_process:
-                                # NOTE: Process image using executor to avoid blocking
-                                try:
-                                    motion_score, current_image = await hass.async_add_executor_job(
-                                        process_image, image_data, reference_image
+                                # NOTE: Increase the request count for the device
+                                device = store.get_device(device_id)
+                                if device:
+                                    device.device_azure_request_count += 1
+                                    await store.async_save()
+                                    async_dispatcher_send(hass, f"{DOMAIN}_{device_id}_update")
+                                    _LOGGER.info(f"[HomeAIVision] Device {device_id} Azure request count: {device.device_azure_request_count}")
+                                else:
+                                    _LOGGER.error(
+                                        f"[HomeAIVision] Device {device_id} not found in store"
                                     )
-                                except (IOError, SyntaxError) as e:
-                                    _LOGGER.error(f"Failed to process image: {e}")
-                                    continue
-
-                                if not object_present:
-                                    # NOTE: Update motion history
-                                    motion_history.append(motion_score)
-                                    _LOGGER.debug(f"Motion history size: {len(motion_history)}")
-                                    if len(motion_history) > motion_detection_history_size:
-                                        motion_history.pop(0)
-                                    # important: Recalculate dynamic threshold
-                                    if len(motion_history) >= 2:
-                                        med_motion = median(motion_history)
-                                        mad_motion = median([abs(m - med_motion) for m in motion_history])
-                                        dynamic_threshold = med_motion + 2 * mad_motion
-                                        dynamic_threshold = max(min_dynamic_threshold, min(dynamic_threshold, max_dynamic_threshold))
-                                    else:
-                                        dynamic_threshold = motion_detection_min_area
-                                    _LOGGER.debug(f"Dynamic motion threshold: {dynamic_threshold}, current motion score: {motion_score}")
-
-                                    if motion_score > dynamic_threshold:
-                                        _LOGGER.debug(f"Significant motion detected. Motion score: {motion_score}")
-
-                                        # IMPORTANT: Decide whether to send a request to Azure
-                                        if unknown_object_counter in azure_request_intervals:
-                                            _LOGGER.debug(f"Sending image to Azure for analysis. Counter: {unknown_object_counter}")
-
-                                            # NOTE: Motion detected, send image to Azure
-                                            detected, modified_image_data, detected_object_name = await analyze_image_with_azure(
-                                                image_data,
-                                                entry.data.get(CONF_AZURE_API_KEY),
-                                                entry.data.get(CONF_AZURE_ENDPOINT),
-                                                to_detect_object,
-                                                azure_confidence_threshold,
-                                            )
-
-                                            # NOTE: Increase the request count for the device
-                                            device = store.get_device(device_id)
-                                            if device:
-                                                device.device_azure_request_count += 1
-                                                await store.async_save()
-                                                async_dispatcher_send(hass, f"{DOMAIN}_{device_id}_update")
-                                                _LOGGER.info(f"[HomeAIVision] Device {device_id} Azure request count: {device.device_azure_request_count}")
-                                            else:
-                                                _LOGGER.error(
-                                                    f"[HomeAIVision] Device {device_id} not found in store"
-                                                )
-
-                                            # NOTE: Increase the global request count
-                                            await store.async_increment_global_counter()
-                                            _LOGGER.info(f"[HomeAIVision] Global Azure request counter: {store.get_global_counter()}")
-
-                                            if detected:
-                                                # warning: Object is being present now
-                                                object_present = True
-                                                _LOGGER.debug(f"Object '{detected_object_name}' detected by Azure.")
-                                                # info: Reset unknown_object_counter
-                                                unknown_object_counter = 0
-                                            else:
-                                                _LOGGER.debug("No target object detected by Azure.")
-                                                # warning: Increment unknown_object_counter
-                                                unknown_object_counter += 1
-
-                                                if unknown_object_counter >= max_unknown_object_counter:
-                                                    _LOGGER.info("Unknown object detected multiple times without recognition.")
-                                                    # IMPORTANT: Send emergency notification
-                                                    if send_notifications:
-                                                        language = store.get_language()
-                                                        _LOGGER.debug(f"[HomeAIVision] Notification language: {language}")
-                                                        await send_notification(
-                                                            hass,
-                                                            "unknown_object",
-                                                            image_path=None,
-                                                            notification_language=language,
-                                                        )
-                                                    # IMPORTANT: Update reference image after reaching max detections
-                                                    reference_age = time.monotonic() - reference_image_time
-                                                    _LOGGER.info(f"Updating reference image after {unknown_object_counter} unknown detections. Old reference image age: {reference_age:.2f} seconds.")
-                                                    reference_image = current_image
-                                                    reference_image_time = time.monotonic()
-                                                    motion_history.clear()
-                                                    # info: Reset unknown_object_counter
-                                                    unknown_object_counter = 0
-
-                                            # NOTE: Save the image if an object is detected
-                                            if detected and modified_image_data:
-                                                device_name = device_config['name']
-                                                save_path = await save_image(
-                                                    cam_frames_path,
-                                                    device_name,
-                                                    modified_image_data,
-                                                    max_images_per_day,
-                                                    days_to_keep,
-                                                )
-                                                # NOTE: Send notification if enabled
-                                                if send_notifications:
-                                                    language = store.get_language()
-                                                    _LOGGER.debug(f"[HomeAIVision] Notification language: {language}")
-                                                    relative_path = save_path.replace(
-                                                        hass.config.path(), ""
-                                                    ).lstrip("/")
-                                                    await send_notification(
-                                                        hass,
-                                                        detected_object_name,
-                                                        relative_path,
-                                                        notification_language=language,
-                                                    )
-                                                # warning: Reset motion history
-                                                motion_history.clear()
+                                    break
+
+                                # NOTE: Increase the global request count
+                                await store.async_increment_global_counter()
+                                _LOGGER.info(f"[HomeAIVision] Global Azure request counter: {store.get_global_counter()}")
+
+                                unknown_object = state.record_azure_result(detected, current_frame)
+                                metrics.record_azure_result(detected)
+                                if detected:
+                                    _LOGGER.debug(f"Object '{detected_object_name}' detected by Azure.")
+
+                                # NOTE: Save the image if an object is detected
+                                if detected and modified_image_data:
+                                    with metrics.span(STAGE_SAVE):
+                                        save_path, thumbnail_path = await save_image(
+                                            cam_frames_path,
+                                            device.name,
+                                            modified_image_data,
+                                            max_images_per_day,
+                                            days_to_keep,
+                                            thumbnail_format,
+                                            gallery,
+                                            detected_object_name,
+                                            metrics,
+                                        )
+                                    # info: Bound now, the notification may be sent after the next frames
+                                    notify = partial(
+                                        notify_detection, hass, device, detected_object_name, thumbnail_path or save_path, save_path
+                                    ) if send_notifications else None
+                                    # NOTE: Keep the buffered frames with the detection, the post-event frames follow
+                                    if event_buffer.max_frames and pending_event is None:
+                                        pending_event = EventCapture(
+                                            get_event_folder_path(save_path),
+                                            buffered_frame.timestamp,
+                                            event_buffer.snapshot(),
+                                            post_event_frames,
+                                        )
+                                        if gallery is not None:
+                                            gallery.mark_event(save_path)
+                                        # info: The notification waits for the first summary, so it shows a contact sheet that exists
+                                        if pending_event.complete:
+                                            await save_event_group(hass, watchdog, metrics, pending_event, notify)
+                                            pending_event = None
                                         else:
-                                            _LOGGER.debug(f"Skipping Azure analysis at counter {unknown_object_counter}.")
-                                            unknown_object_counter += 1
-
-                                            if unknown_object_counter >= max_unknown_object_counter:
-                                                _LOGGER.info("Unknown object detected multiple times without recognition.")
-                                                # IMPORTANT: Send emergency notification
-                                                if send_notifications:
-                                                    language = store.get_language()
-                                                    _LOGGER.debug(f"[HomeAIVision] Notification language: {language}")
-                                                    await send_notification(
-                                                        hass,
-                                                        "unknown_object",
-                                                        image_path=None,
-                                                        notification_language=language,
-                                                    )
-                                                # IMPORTANT: Update reference image after reaching max detections
-                                                reference_age = time.monotonic() - reference_image_time
-                                                _LOGGER.info(f"Updating reference image after {unknown_object_counter} unknown detections. Old reference image age: {reference_age:.2f} seconds.")
-                                                reference_image = current_image
-                                                reference_image_time = time.monotonic()
-                                                motion_history.clear()
-                                                # info: Reset unknown_object_counter
-                                                unknown_object_counter = 0
-                                    else:
-                                        _LOGGER.debug(f"No significant motion detected. Motion score: {motion_score}")
-                                        # info: Update reference image periodically when no motion is detected
-                                        reference_image = current_image
-                                        reference_image_time = time.monotonic()
-                                        _LOGGER.debug("Reference image updated.")
-                                        # info: reset unknown_object_counter
-                                        unknown_object_counter = 0
-                                else:
-                                    # info: Object is present, check if it has left the scene
-                                    if motion_score < motion_detection_min_area:
-                                        _LOGGER.debug(f"No motion detected. Motion score: {motion_score}")
-                                        object_present = False
-                                        _LOGGER.debug("Object has left the scene.")
-                                        # important: Update reference image after object leaves the scene
-                                        reference_image = current_image
-                                        reference_image_time = time.monotonic()
-                                        _LOGGER.debug("Reference image updated after object left.")
-                                        unknown_object_counter = 0
-                                    else:
-                                        # info: calculate how long the reference image has been held
-                                        reference_age = time.monotonic() - reference_image_time
-                                        _LOGGER.debug(f"Object still present. Reference image age: {reference_age:.2f} seconds")
-                                        # info: object still present, do nothing
-                                        pass
-                        else:
-                            _LOGGER.warning(
-                                f"[HomeAIVision] Failed to fetch image, status code: {response.status}"
-                            )
-                except ClientConnectorError:
-                    _LOGGER.error(
-                        f"[HomeAIVision] Unable to connect to the camera at {cam_url}. "
-                        f"Please ensure the camera is online and the URL is correct."
-                    )
-                    # NOTE: Create a persistent notification for connection errors
-                    await hass.async_create_task(
-                        pn_create(
-                            hass,
-                            (
-                                f"Unable to connect to the camera at {cam_url}. "
-                                "Please ensure the camera is online and the URL is correct."
-                            ),
-                            title="HomeAIVision Camera Connection Error",
-                            notification_id=f"homeaivision_camera_error_{device_id}",
-                        )
-                    )
+                                            schedule_event_summary(hass, watchdog, metrics, pending_event, notify)
+                                        notify = None
+                                    # NOTE: Send notification if enabled
+                                    if notify is not None:
+                                        with metrics.span(STAGE_NOTIFY):
+                                            notify()
+                                    # warning: Reset motion history
+                                    state.motion_history.clear()
+
+                            # IMPORTANT: Send emergency notification after reaching max detections
+                            if unknown_object and send_notifications:
+                                send_notification(
+                                    hass,
+                                    device_id,
+                                    device.name,
+                                    "unknown_object",
+                                    cooldown=device.notification_cooldown,
+                                )
                 except asyncio.CancelledError:
                     _LOGGER.debug(f"[HomeAIVision] Camera check task for device {device_id} cancelled.")
                     break
@@ -303,54 +546,40 @@ async def periodic_check(hass: HomeAssistant, entry: ConfigEntry, device_config:
                     # info: Log the full traceback for debugging purposes
                     _LOGGER.debug(traceback.format_exc())
 
-                try:
-                    await asyncio.wait_for(stop_event.wait(), timeout=motion_detection_interval)
-                except asyncio.TimeoutError:
-                    pass
+                if not frame_dropped:
+                    metrics.record_frame(time.monotonic() - frame_start)
+                elif image_data is not None or fetch_attempted:
+                    # info: Without a pushed frame or a fetch, e.g. while the circuit is open, nothing was dropped
+                    metrics.record_dropped_frame()
+
+                if holding_start_slot:
+                    start_slots.release()
+                    holding_start_slot = False
+
+                # NOTE: A pushed frame or a trigger ends the wait early, push-only cameras wait for frames without polling
+                if push_only:
+                    interval = None
+                elif trigger is not None:
+                    interval = trigger.next_interval(trigger_idle_interval, motion_detection_interval)
+                elif adaptive_interval is not None:
+                    interval = adaptive_interval.interval
+                else:
+                    interval = motion_detection_interval
+                if interval is not None and not health.can_attempt():
+                    # NOTE: A failing camera is retried with backoff instead of every interval
+                    interval = max(interval, health.retry_in())
+                metrics.record_interval(interval)
+                await inbox.async_wait(stop_event, interval)
 
     except asyncio.CancelledError:
         _LOGGER.debug(f"[HomeAIVision] periodic_check for device {device_id} was cancelled.")
         raise
     finally:
+        if trigger is not None:
+            trigger.async_stop()
+        if pending_event is not None:
+            # info: The camera stopped before all post-event frames arrived, the collected frames are kept
+            await save_event_group(hass, watchdog, metrics, pending_event)
+        if holding_start_slot:
+            start_slots.release()
         _LOGGER.debug(f"[HomeAIVision] periodic_check has finished for device {device_id}")
-
-
-def calculate_scaled_thresholds(current_image, local_sensitivity_level):
-    width, height = current_image.size
-    total_pixels = width * height
-
-    if local_sensitivity_level == 'low':
-        motion_threshold_percentage = 0.01  # info: 1%
-    elif local_sensitivity_level == 'medium':
-        motion_threshold_percentage = 0.005  # info: 0.5%
-    elif local_sensitivity_level == 'high':
-        motion_threshold_percentage = 0.0025  # info: 0.25%
-    else:
-        motion_threshold_percentage = 0.005  # info: Default 0.5%
-
-    motion_detection_min_area = motion_threshold_percentage * total_pixels
-    min_dynamic_threshold = 0.5 * motion_detection_min_area
-    max_dynamic_threshold = 2 * motion_detection_min_area
-
-    _LOGGER.debug(f"Resolution: {width}x{height}, total pixels: {total_pixels}")
-    _LOGGER.debug(f"Motion detection min area: {motion_detection_min_area}, min dynamic threshold: {min_dynamic_threshold}, max dynamic threshold: {max_dynamic_threshold}")
-    return motion_detection_min_area, min_dynamic_threshold, max_dynamic_threshold
-
-
-def process_image(image_data, reference_image):
-    """
-    Process the image and calculate motion score.
-
-    Args:
-        image_data (bytes): The raw image data.
-        reference_image (PIL.Image.Image): The reference image for motion detection.
-
-    Returns:
-        tuple: (motion_score, current_image)
-    """
-    current_image = Image.open(io.BytesIO(image_data)).convert('L')
-    diff_image = ImageChops.difference(reference_image, current_image)
-    threshold = diff_image.point(lambda p: p > 50 and 255)
-    cleaned = threshold.filter(ImageFilter.MaxFilter(5)).filter(ImageFilter.MinFilter(5))
-    motion_score = sum(cleaned.histogram()[255:])
-    return motion_score, current_image
@@ -17,16 +17,40 @@ from .const import (
     CONF_AZURE_API_KEY,
     CONF_AZURE_ENDPOINT,
     CONF_CAM_URL,
+    CONF_MOTION_URL,
+    CONF_PUSH_ONLY,
+    CONF_TRIGGER_ENTITY_ID,
+    CONF_TRIGGER_BURST_DURATION,
+    CONF_TRIGGER_IDLE_INTERVAL,
     CONF_MAX_IMAGES_PER_DAY,
     CONF_DAYS_TO_KEEP,
+    CONF_PRE_EVENT_FRAMES,
+    CONF_POST_EVENT_FRAMES,
     CONF_SEND_NOTIFICATIONS,
+    CONF_NOTIFICATION_COOLDOWN,
+    CONF_THUMBNAIL_FORMAT,
     CONF_LANGUAGE,
     CONF_TO_DETECT_OBJECT,
     CONF_AZURE_CONFIDENCE_THRESHOLD,
     CONF_INTEGRATION_TITLE,
     CONF_MOTION_DETECTION_HISTORY_SIZE,
+    CONF_MOTION_MAD_MULTIPLIER,
     CONF_MOTION_DETECTION_INTERVAL,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_ADAPTIVE_INTERVAL_MIN,
+    CONF_ADAPTIVE_INTERVAL_MAX,
     CONF_LOCAL_SENSITIVITY_LEVEL,
+    CONF_MIN_BLOB_AREA_PERCENTAGE,
+    CONF_MAX_BLOB_AREA_PERCENTAGE,
+    CONF_MULTI_SCALE_MOTION_DETECTION,
+    CONF_MOTION_CONFIRMATION_FRAMES,
+    CONF_MOTION_CONFIRMATION_WINDOW,
+    CONF_MOTION_CONFIRMATION_OVERLAP,
+    CONF_AZURE_INITIAL_REQUESTS,
+    CONF_AZURE_BACKOFF_FACTOR,
+    CONF_AZURE_MAX_REQUEST_GAP,
+    CONF_AZURE_ESCALATION_SCORE_RATIO,
+    CONF_MAX_UNKNOWN_OBJECT_COUNTER,
 )
 from .store import HomeAIVisionStore, DeviceData
 
@@ -45,6 +69,29 @@ def verify_camera_url(cam_url):
     return cam_url.startswith("http://") or cam_url.startswith("https://")
 
 
+def verify_blob_area_range(user_input):
+    return user_input.get(CONF_MIN_BLOB_AREA_PERCENTAGE, 0.1) < user_input.get(CONF_MAX_BLOB_AREA_PERCENTAGE, 60.0)
+
+
+def verify_motion_confirmation(user_input):
+    return user_input.get(CONF_MOTION_CONFIRMATION_FRAMES, 1) <= user_input.get(CONF_MOTION_CONFIRMATION_WINDOW, 1)
+
+
+def verify_adaptive_interval_range(user_input):
+    return user_input.get(CONF_ADAPTIVE_INTERVAL_MIN, 1) <= user_input.get(CONF_ADAPTIVE_INTERVAL_MAX, 30)
+
+
+def verify_detection_settings(user_input):
+    errors = {}
+    if not verify_blob_area_range(user_input):
+        errors["base"] = "blob_area_range_invalid"
+    elif not verify_motion_confirmation(user_input):
+        errors["base"] = "motion_confirmation_invalid"
+    elif not verify_adaptive_interval_range(user_input):
+        errors["base"] = "adaptive_interval_range_invalid"
+    return errors
+
+
 class HomeAIVisionConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     temp_config = {}
@@ -143,6 +190,8 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
             # info: validate the camera URL
             if not verify_camera_url(user_input[CONF_CAM_URL]):
                 errors["base"] = "camera_url_invalid"
+            elif user_input.get(CONF_MOTION_URL, "").strip() and not verify_camera_url(user_input[CONF_MOTION_URL].strip()):
+                errors["base"] = "motion_url_invalid"
 
             # info: validate the camera name
             camera_name = user_input.get("name")
@@ -161,13 +210,39 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required("name", default="Camera"): str,
                 vol.Required(CONF_CAM_URL): str,
+                vol.Optional(CONF_MOTION_URL, default=""): str,
+                vol.Optional(CONF_PUSH_ONLY, default=False): bool,
+                vol.Optional(CONF_TRIGGER_ENTITY_ID): selector({
+                    "entity": {"domain": "binary_sensor"}
+                }),
+                vol.Optional(CONF_TRIGGER_BURST_DURATION, default=30): vol.All(
+                    vol.Coerce(int), vol.Range(min=5, max=600)
+                ),
+                vol.Optional(CONF_TRIGGER_IDLE_INTERVAL, default=300): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=3600)
+                ),
                 vol.Optional(CONF_SEND_NOTIFICATIONS, default=False): bool,
+                vol.Optional(CONF_NOTIFICATION_COOLDOWN, default=60): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=86400)
+                ),
+                vol.Optional(CONF_THUMBNAIL_FORMAT, default="off"): selector({
+                    "select": {
+                        "options": ["off", "jpeg", "webp"],
+                        "translation_key": "thumbnail_format",
+                    }
+                }),
                 vol.Optional(CONF_MAX_IMAGES_PER_DAY, default=100): vol.All(
                     vol.Coerce(int), vol.Range(min=1)
                 ),
                 vol.Optional(CONF_DAYS_TO_KEEP, default=30): vol.All(
                     vol.Coerce(int), vol.Range(min=1)
                 ),
+                vol.Optional(CONF_PRE_EVENT_FRAMES, default=0): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=60)
+                ),
+                vol.Optional(CONF_POST_EVENT_FRAMES, default=0): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=60)
+                ),
             }),
             description_placeholders={
                 "camera_settings": "Configure your camera's basic settings."
@@ -177,8 +252,8 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_add_camera_detection(self, user_input=None):
         """Second step for adding a camera: Detection settings."""
-        errors = {}
-        if user_input is not None:
+        errors = verify_detection_settings(user_input) if user_input is not None else {}
+        if user_input is not None and not errors:
             # info: Combine the detection settings with the previous camera settings
             self.camera_data.update(user_input)
             # info: All data collected, proceed to the next step
@@ -188,14 +263,38 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
                 name=self.camera_data.get("name", "Camera"),
                 armed=False,
                 url=self.camera_data[CONF_CAM_URL],
+                motion_url=self.camera_data.get(CONF_MOTION_URL, "").strip(),
+                push_only=self.camera_data.get(CONF_PUSH_ONLY, False),
+                trigger_entity_id=self.camera_data.get(CONF_TRIGGER_ENTITY_ID) or "",
+                trigger_burst_duration=self.camera_data.get(CONF_TRIGGER_BURST_DURATION, 30),
+                trigger_idle_interval=self.camera_data.get(CONF_TRIGGER_IDLE_INTERVAL, 300),
                 to_detect_object=self.camera_data[CONF_TO_DETECT_OBJECT],
                 azure_confidence_threshold=self.camera_data[CONF_AZURE_CONFIDENCE_THRESHOLD],
                 send_notifications=self.camera_data.get(CONF_SEND_NOTIFICATIONS, False),
+                notification_cooldown=self.camera_data.get(CONF_NOTIFICATION_COOLDOWN, 60),
+                thumbnail_format=self.camera_data.get(CONF_THUMBNAIL_FORMAT, "off"),
                 max_images_per_day=self.camera_data.get(CONF_MAX_IMAGES_PER_DAY, 100),
                 days_to_keep=self.camera_data.get(CONF_DAYS_TO_KEEP, 30),
+                pre_event_frames=self.camera_data.get(CONF_PRE_EVENT_FRAMES, 0),
+                post_event_frames=self.camera_data.get(CONF_POST_EVENT_FRAMES, 0),
                 motion_detection_history_size=self.camera_data.get(CONF_MOTION_DETECTION_HISTORY_SIZE, 10),
+                motion_mad_multiplier=self.camera_data.get(CONF_MOTION_MAD_MULTIPLIER, 2.0),
                 motion_detection_interval=self.camera_data.get(CONF_MOTION_DETECTION_INTERVAL, 5),
+                adaptive_interval=self.camera_data.get(CONF_ADAPTIVE_INTERVAL, False),
+                adaptive_interval_min=self.camera_data.get(CONF_ADAPTIVE_INTERVAL_MIN, 1),
+                adaptive_interval_max=self.camera_data.get(CONF_ADAPTIVE_INTERVAL_MAX, 30),
                 local_sensitivity_level=self.camera_data.get(CONF_LOCAL_SENSITIVITY_LEVEL, "medium"),
+                min_blob_area_percentage=self.camera_data.get(CONF_MIN_BLOB_AREA_PERCENTAGE, 0.1),
+                max_blob_area_percentage=self.camera_data.get(CONF_MAX_BLOB_AREA_PERCENTAGE, 60.0),
+                multi_scale_motion_detection=self.camera_data.get(CONF_MULTI_SCALE_MOTION_DETECTION, True),
+                motion_confirmation_frames=self.camera_data.get(CONF_MOTION_CONFIRMATION_FRAMES, 1),
+                motion_confirmation_window=self.camera_data.get(CONF_MOTION_CONFIRMATION_WINDOW, 1),
+                motion_confirmation_overlap=self.camera_data.get(CONF_MOTION_CONFIRMATION_OVERLAP, False),
+                azure_initial_requests=self.camera_data.get(CONF_AZURE_INITIAL_REQUESTS, 5),
+                azure_backoff_factor=self.camera_data.get(CONF_AZURE_BACKOFF_FACTOR, 2.0),
+                azure_max_request_gap=self.camera_data.get(CONF_AZURE_MAX_REQUEST_GAP, 8),
+                azure_escalation_score_ratio=self.camera_data.get(CONF_AZURE_ESCALATION_SCORE_RATIO, 2.0),
+                max_unknown_object_counter=self.camera_data.get(CONF_MAX_UNKNOWN_OBJECT_COUNTER, 20),
                 config_entry_id=self.config_entry.entry_id,
             )
 
@@ -224,7 +323,22 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
                     }
                 }),
                 vol.Optional(CONF_MOTION_DETECTION_HISTORY_SIZE, default=10): vol.All(vol.Coerce(int), vol.Range(min=2)),
+                vol.Optional(CONF_MOTION_MAD_MULTIPLIER, default=2.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
                 vol.Optional(CONF_MOTION_DETECTION_INTERVAL, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(CONF_ADAPTIVE_INTERVAL, default=False): bool,
+                vol.Optional(CONF_ADAPTIVE_INTERVAL_MIN, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(CONF_ADAPTIVE_INTERVAL_MAX, default=30): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(CONF_MIN_BLOB_AREA_PERCENTAGE, default=0.1): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(CONF_MAX_BLOB_AREA_PERCENTAGE, default=60.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(CONF_MULTI_SCALE_MOTION_DETECTION, default=True): bool,
+                vol.Optional(CONF_MOTION_CONFIRMATION_FRAMES, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(CONF_MOTION_CONFIRMATION_WINDOW, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(CONF_MOTION_CONFIRMATION_OVERLAP, default=False): bool,
+                vol.Optional(CONF_AZURE_INITIAL_REQUESTS, default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(CONF_AZURE_BACKOFF_FACTOR, default=2.0): vol.All(vol.Coerce(float), vol.Range(min=1, max=10)),
+                vol.Optional(CONF_AZURE_MAX_REQUEST_GAP, default=8): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(CONF_AZURE_ESCALATION_SCORE_RATIO, default=2.0): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(CONF_MAX_UNKNOWN_OBJECT_COUNTER, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
             }),
             description_placeholders={
                 "detection_settings": "Configure detection settings. Advanced settings are pre-configured; change them only if necessary."
@@ -262,6 +376,8 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
             # info: validate the camera URL
             if not verify_camera_url(user_input[CONF_CAM_URL]):
                 errors["base"] = "camera_url_invalid"
+            elif user_input.get(CONF_MOTION_URL, "").strip() and not verify_camera_url(user_input[CONF_MOTION_URL].strip()):
+                errors["base"] = "motion_url_invalid"
 
             # info: validate the camera name excluding the editing camera
             camera_name = user_input.get("name")
@@ -283,12 +399,30 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required("name", default=device.name): str,
                 vol.Required(CONF_CAM_URL, default=device.url): str,
+                vol.Optional(CONF_MOTION_URL, default=device.motion_url): str,
+                vol.Optional(CONF_PUSH_ONLY, default=device.push_only): bool,
+                # info: Suggested instead of a default, so the sensor can be cleared
+                vol.Optional(CONF_TRIGGER_ENTITY_ID, description={"suggested_value": device.trigger_entity_id or None}): selector({
+                    "entity": {"domain": "binary_sensor"}
+                }),
+                vol.Optional(CONF_TRIGGER_BURST_DURATION, default=device.trigger_burst_duration): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                vol.Optional(CONF_TRIGGER_IDLE_INTERVAL, default=device.trigger_idle_interval): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
                 vol.Optional(CONF_SEND_NOTIFICATIONS, default=device.send_notifications): bool,
+                vol.Optional(CONF_NOTIFICATION_COOLDOWN, default=device.notification_cooldown): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                vol.Optional(CONF_THUMBNAIL_FORMAT, default=device.thumbnail_format): selector({
+                    "select": {
+                        "options": ["off", "jpeg", "webp"],
+                        "translation_key": "thumbnail_format",
+                    }
+                }),
                 vol.Optional(CONF_MAX_IMAGES_PER_DAY, default=device.max_images_per_day): vol.All(vol.Coerce(int), vol.Range(min=1)),
                 vol.Optional(CONF_DAYS_TO_KEEP, default=device.days_to_keep): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_PRE_EVENT_FRAMES, default=device.pre_event_frames): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+                vol.Optional(CONF_POST_EVENT_FRAMES, default=device.post_event_frames): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
             }),
             description_placeholders={
-                "camera_settings": "Update your camera's basic settings."
+                "camera_settings": "Update your camera's basic settings.",
+                "webhook_path": f"/api/webhook/{device.webhook_id}",
             },
             errors=errors,
         )
@@ -296,8 +430,8 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
     async def async_step_edit_camera_detection(self, user_input=None):
         """Second step for editing a camera: Detection settings."""
         device = self.store.get_device(self.device_id)
-        errors = {}
-        if user_input is not None:
+        errors = verify_detection_settings(user_input) if user_input is not None else {}
+        if user_input is not None and not errors:
             # info: Combine the detection settings with the previous camera settings
             self.camera_data.update(user_input)
 
@@ -305,15 +439,41 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
                 id=device.id,
                 name=self.camera_data.get("name", device.name),
                 url=self.camera_data[CONF_CAM_URL],
+                motion_url=self.camera_data.get(CONF_MOTION_URL, "").strip(),
+                push_only=self.camera_data.get(CONF_PUSH_ONLY, device.push_only),
+                trigger_entity_id=self.camera_data.get(CONF_TRIGGER_ENTITY_ID) or "",
+                trigger_burst_duration=self.camera_data.get(CONF_TRIGGER_BURST_DURATION, device.trigger_burst_duration),
+                trigger_idle_interval=self.camera_data.get(CONF_TRIGGER_IDLE_INTERVAL, device.trigger_idle_interval),
                 to_detect_object=self.camera_data[CONF_TO_DETECT_OBJECT],
                 azure_confidence_threshold=self.camera_data[CONF_AZURE_CONFIDENCE_THRESHOLD],
                 send_notifications=self.camera_data.get(CONF_SEND_NOTIFICATIONS, device.send_notifications),
+                notification_cooldown=self.camera_data.get(CONF_NOTIFICATION_COOLDOWN, device.notification_cooldown),
+                thumbnail_format=self.camera_data.get(CONF_THUMBNAIL_FORMAT, device.thumbnail_format),
                 max_images_per_day=self.camera_data.get(CONF_MAX_IMAGES_PER_DAY, device.max_images_per_day),
                 days_to_keep=self.camera_data.get(CONF_DAYS_TO_KEEP, device.days_to_keep),
+                pre_event_frames=self.camera_data.get(CONF_PRE_EVENT_FRAMES, device.pre_event_frames),
+                post_event_frames=self.camera_data.get(CONF_POST_EVENT_FRAMES, device.post_event_frames),
                 motion_detection_history_size=self.camera_data.get(CONF_MOTION_DETECTION_HISTORY_SIZE, device.motion_detection_history_size,),
+                motion_mad_multiplier=self.camera_data.get(CONF_MOTION_MAD_MULTIPLIER, device.motion_mad_multiplier),
                 motion_detection_interval=self.camera_data.get(CONF_MOTION_DETECTION_INTERVAL, device.motion_detection_interval),
+                adaptive_interval=self.camera_data.get(CONF_ADAPTIVE_INTERVAL, device.adaptive_interval),
+                adaptive_interval_min=self.camera_data.get(CONF_ADAPTIVE_INTERVAL_MIN, device.adaptive_interval_min),
+                adaptive_interval_max=self.camera_data.get(CONF_ADAPTIVE_INTERVAL_MAX, device.adaptive_interval_max),
                 device_azure_request_count=device.device_azure_request_count,
                 local_sensitivity_level=self.camera_data.get(CONF_LOCAL_SENSITIVITY_LEVEL, device.local_sensitivity_level),
+                min_blob_area_percentage=self.camera_data.get(CONF_MIN_BLOB_AREA_PERCENTAGE, device.min_blob_area_percentage),
+                max_blob_area_percentage=self.camera_data.get(CONF_MAX_BLOB_AREA_PERCENTAGE, device.max_blob_area_percentage),
+                detection_zones=device.detection_zones,
+                multi_scale_motion_detection=self.camera_data.get(CONF_MULTI_SCALE_MOTION_DETECTION, device.multi_scale_motion_detection),
+                motion_confirmation_frames=self.camera_data.get(CONF_MOTION_CONFIRMATION_FRAMES, device.motion_confirmation_frames),
+                motion_confirmation_window=self.camera_data.get(CONF_MOTION_CONFIRMATION_WINDOW, device.motion_confirmation_window),
+                motion_confirmation_overlap=self.camera_data.get(CONF_MOTION_CONFIRMATION_OVERLAP, device.motion_confirmation_overlap),
+                azure_initial_requests=self.camera_data.get(CONF_AZURE_INITIAL_REQUESTS, device.azure_initial_requests),
+                azure_backoff_factor=self.camera_data.get(CONF_AZURE_BACKOFF_FACTOR, device.azure_backoff_factor),
+                azure_max_request_gap=self.camera_data.get(CONF_AZURE_MAX_REQUEST_GAP, device.azure_max_request_gap),
+                azure_escalation_score_ratio=self.camera_data.get(CONF_AZURE_ESCALATION_SCORE_RATIO, device.azure_escalation_score_ratio),
+                max_unknown_object_counter=self.camera_data.get(CONF_MAX_UNKNOWN_OBJECT_COUNTER, device.max_unknown_object_counter),
+                webhook_id=device.webhook_id,
                 config_entry_id=device.config_entry_id,
             )
 
@@ -355,10 +515,70 @@ class HomeAIVisionOptionsFlow(config_entries.OptionsFlow):
                     CONF_MOTION_DETECTION_HISTORY_SIZE,
                     default=device.motion_detection_history_size,
                 ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_MOTION_MAD_MULTIPLIER,
+                    default=device.motion_mad_multiplier,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
                 vol.Optional(
                     CONF_MOTION_DETECTION_INTERVAL,
                     default=device.motion_detection_interval,
                 ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(
+                    CONF_ADAPTIVE_INTERVAL,
+                    default=device.adaptive_interval,
+                ): bool,
+                vol.Optional(
+                    CONF_ADAPTIVE_INTERVAL_MIN,
+                    default=device.adaptive_interval_min,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(
+                    CONF_ADAPTIVE_INTERVAL_MAX,
+                    default=device.adaptive_interval_max,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=600)),
+                vol.Optional(
+                    CONF_MIN_BLOB_AREA_PERCENTAGE,
+                    default=device.min_blob_area_percentage,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_MAX_BLOB_AREA_PERCENTAGE,
+                    default=device.max_blob_area_percentage,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_MULTI_SCALE_MOTION_DETECTION,
+                    default=device.multi_scale_motion_detection,
+                ): bool,
+                vol.Optional(
+                    CONF_MOTION_CONFIRMATION_FRAMES,
+                    default=device.motion_confirmation_frames,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_MOTION_CONFIRMATION_WINDOW,
+                    default=device.motion_confirmation_window,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_MOTION_CONFIRMATION_OVERLAP,
+                    default=device.motion_confirmation_overlap,
+                ): bool,
+                vol.Optional(
+                    CONF_AZURE_INITIAL_REQUESTS,
+                    default=device.azure_initial_requests,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+                vol.Optional(
+                    CONF_AZURE_BACKOFF_FACTOR,
+                    default=device.azure_backoff_factor,
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=10)),
+                vol.Optional(
+                    CONF_AZURE_MAX_REQUEST_GAP,
+                    default=device.azure_max_request_gap,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(
+                    CONF_AZURE_ESCALATION_SCORE_RATIO,
+                    default=device.azure_escalation_score_ratio,
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_MAX_UNKNOWN_OBJECT_COUNTER,
+                    default=device.max_unknown_object_counter,
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
             }),
             description_placeholders={
                 "detection_settings": "Update detection settings. Advanced settings are pre-configured; change them only if necessary."
@@ -5,9 +5,18 @@ DOMAIN = "homeaivision"
 CONF_AZURE_API_KEY = "azure_api_key"
 CONF_AZURE_ENDPOINT = "azure_endpoint"
 CONF_CAM_URL = "cam_url"
+CONF_MOTION_URL = "motion_url"
+CONF_PUSH_ONLY = "push_only"
+CONF_TRIGGER_ENTITY_ID = "trigger_entity_id"
+CONF_TRIGGER_BURST_DURATION = "trigger_burst_duration"
+CONF_TRIGGER_IDLE_INTERVAL = "trigger_idle_interval"
 CONF_MAX_IMAGES_PER_DAY = "max_images_per_day"
 CONF_DAYS_TO_KEEP = "days_to_keep"
+CONF_PRE_EVENT_FRAMES = "pre_event_frames"
+CONF_POST_EVENT_FRAMES = "post_event_frames"
 CONF_SEND_NOTIFICATIONS = "send_notifications"
+CONF_NOTIFICATION_COOLDOWN = "notification_cooldown"
+CONF_THUMBNAIL_FORMAT = "thumbnail_format"
 CONF_LANGUAGE = "language"
 CONF_TO_DETECT_OBJECT = "to_detect_object"
 CONF_AZURE_CONFIDENCE_THRESHOLD = "azure_confidence_threshold"
@@ -15,4 +24,19 @@ CONF_INTEGRATION_TITLE = "integration_title"
 
 CONF_LOCAL_SENSITIVITY_LEVEL = "local_sensitivity_level"
 CONF_MOTION_DETECTION_INTERVAL = "motion_detection_interval"
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_ADAPTIVE_INTERVAL_MIN = "adaptive_interval_min"
+CONF_ADAPTIVE_INTERVAL_MAX = "adaptive_interval_max"
 CONF_MOTION_DETECTION_HISTORY_SIZE = "motion_detection_history_size"
+CONF_MOTION_MAD_MULTIPLIER = "motion_mad_multiplier"
+CONF_MIN_BLOB_AREA_PERCENTAGE = "min_blob_area_percentage"
+CONF_MAX_BLOB_AREA_PERCENTAGE = "max_blob_area_percentage"
+CONF_MULTI_SCALE_MOTION_DETECTION = "multi_scale_motion_detection"
+CONF_MOTION_CONFIRMATION_FRAMES = "motion_confirmation_frames"
+CONF_MOTION_CONFIRMATION_WINDOW = "motion_confirmation_window"
+CONF_MOTION_CONFIRMATION_OVERLAP = "motion_confirmation_overlap"
+CONF_AZURE_INITIAL_REQUESTS = "azure_initial_requests"
+CONF_AZURE_BACKOFF_FACTOR = "azure_backoff_factor"
+CONF_AZURE_MAX_REQUEST_GAP = "azure_max_request_gap"
+CONF_AZURE_ESCALATION_SCORE_RATIO = "azure_escalation_score_ratio"
+CONF_MAX_UNKNOWN_OBJECT_COUNTER = "max_unknown_object_counter"
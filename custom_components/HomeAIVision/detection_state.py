@@ -0,0 +1,274 @@
+import time
+import logging
+import attr  # type: ignore
+
+from .blob_analysis import filter_blobs, describe_blobs
+from .motion_detection import (
+    calculate_scaled_thresholds,
+    calculate_blob_thresholds,
+    calculate_coarse_threshold,
+    calculate_dynamic_threshold,
+)
+from .temporal_confirmation import TemporalConfirmation
+from .sampling_policy import AzureSamplingPolicy
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Actions decided for a processed frame
+ACTION_REFERENCE_UPDATED = "reference_updated"          # info: No significant motion, the frame became the reference
+ACTION_AWAITING_CONFIRMATION = "awaiting_confirmation"  # info: Significant motion not yet confirmed by the N-of-M window
+ACTION_REQUEST_AZURE = "request_azure"                  # info: The frame has to be sent to Azure
+ACTION_SKIPPED = "skipped"                              # info: Significant motion, but the sampling policy skipped the request
+ACTION_OBJECT_PRESENT = "object_present"                # info: A detected object is still in the scene
+ACTION_OBJECT_LEFT = "object_left"                      # info: A detected object has left the scene
+
+
+@attr.s(slots=True)
+class FrameDecision:
+    """Class representing the decision taken for a single processed frame."""
+
+    action = attr.ib(type=str)
+    motion_score = attr.ib(type=float)
+    dynamic_threshold = attr.ib(default=None)
+    qualifying_blobs = attr.ib(type=list, factory=list)
+    sampling_reason = attr.ib(type=str, default=None)
+    azure_image_data = attr.ib(default=None, repr=False)   # info: Frame to send to Azure, may be an earlier frame of the window
+    unknown_object = attr.ib(type=bool, default=False)     # info: The unknown object limit was reached on this frame
+
+
+class CameraDetectionState:
+    """
+    Motion and Azure decision logic of one camera.
+
+    The state holds the reference frame, motion history, unknown object counter,
+    sampling policy and temporal confirmation window, and decides what happens
+    with every processed frame. It does no I/O: periodic_check fetches and
+    processes the frames, calls Azure and sends the notifications, and the
+    offline replay tool drives the very same logic in simulated time.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """
+        Initialize the CameraDetectionState.
+
+        Args:
+            clock (callable): Returns the current time in seconds, replaced by a simulated clock in replays.
+        """
+        self._clock = clock
+        self.reference_frame = None                         # info: Reference frame for motion detection
+        self.reference_image_time = clock()                 # info: Time when reference image was last updated
+        self.object_present = False                         # info: Flag to track if object is currently present
+        self.motion_history = []                            # info: List to store motion scores when no object is present
+        self.unknown_object_counter = 0                     # info: Counter for unknown objects
+        self.event_azure_requests = 0                       # info: Azure requests made in the current motion event
+        self.sampling_policy = AzureSamplingPolicy()        # info: Decides which motion frames are sent to Azure
+        self.confirmation = TemporalConfirmation()          # info: N-of-M motion confirmation window
+        self.motion_detection_min_area = None
+        self.min_dynamic_threshold = None
+        self.max_dynamic_threshold = None
+        self.min_blob_area = None
+        self.max_blob_area = None
+        self.coarse_threshold = None
+
+    def configure(self, device):
+        """
+        Apply the latest device settings to the sampling policy and the confirmation window.
+
+        Args:
+            device (DeviceData): The device configuration.
+        """
+        self.sampling_policy.configure(
+            device.azure_initial_requests,
+            device.azure_backoff_factor,
+            device.azure_max_request_gap,
+            device.azure_escalation_score_ratio,
+            device.max_unknown_object_counter,
+        )
+        self.confirmation.configure(
+            device.motion_confirmation_frames,
+            device.motion_confirmation_window,
+            device.motion_confirmation_overlap,
+        )
+
+    def initialize_reference(self, frame, device):
+        """
+        Use the first frame as the reference and derive the thresholds from its resolution.
+
+        Args:
+            frame (MotionFrame): The first decoded frame.
+            device (DeviceData): The device configuration.
+        """
+        # NOTE: Calculate scaled thresholds based on sensitivity level
+        (
+            self.motion_detection_min_area,
+            self.min_dynamic_threshold,
+            self.max_dynamic_threshold,
+        ) = calculate_scaled_thresholds(frame.image, device.local_sensitivity_level)
+        self.min_blob_area, self.max_blob_area = calculate_blob_thresholds(
+            frame.image,
+            device.min_blob_area_percentage,
+            device.max_blob_area_percentage,
+        )
+        # NOTE: Coarse frames below this changed-pixel ratio skip the full-resolution pass
+        self.coarse_threshold = calculate_coarse_threshold(frame.image, self.min_dynamic_threshold)
+        self._update_reference(frame)
+        _LOGGER.debug("Reference image initialized.")
+
+    def evaluate(self, motion_score, current_frame, blobs, image_data, device, budget_ratio=1.0):
+        """
+        Decide what happens with a processed frame.
+
+        Args:
+            motion_score (float): Motion score returned by process_image.
+            current_frame (MotionFrame): The processed frame.
+            blobs (list): Motion blobs returned by process_image.
+            image_data (bytes): Raw data of the frame.
+            device (DeviceData): The device configuration.
+            budget_ratio (float): Remaining share of the global Azure request budget.
+
+        Returns:
+            FrameDecision: The decision. For ACTION_REQUEST_AZURE the caller sends
+            decision.azure_image_data to Azure and reports the result with record_azure_result.
+        """
+        if self.object_present:
+            # info: Object is present, check if it has left the scene
+            if motion_score < self.motion_detection_min_area:
+                _LOGGER.debug(f"No motion detected. Motion score: {motion_score}")
+                self.object_present = False
+                _LOGGER.debug("Object has left the scene.")
+                # important: Update reference image after object leaves the scene
+                self._update_reference(current_frame)
+                _LOGGER.debug("Reference image updated after object left.")
+                self.unknown_object_counter = 0
+                self.confirmation.reset()
+                return FrameDecision(ACTION_OBJECT_LEFT, motion_score)
+            _LOGGER.debug(f"Object still present. Reference image age: {self.reference_age():.2f} seconds")
+            return FrameDecision(ACTION_OBJECT_PRESENT, motion_score)
+
+        # NOTE: Update motion history
+        self.motion_history.append(motion_score)
+        _LOGGER.debug(f"Motion history size: {len(self.motion_history)}")
+        if len(self.motion_history) > device.motion_detection_history_size:
+            self.motion_history.pop(0)
+        # important: Recalculate dynamic threshold
+        dynamic_threshold = calculate_dynamic_threshold(
+            self.motion_history,
+            self.motion_detection_min_area,
+            self.min_dynamic_threshold,
+            self.max_dynamic_threshold,
+            device.motion_mad_multiplier,
+        )
+        _LOGGER.debug(f"Dynamic motion threshold: {dynamic_threshold}, current motion score: {motion_score}")
+
+        # NOTE: Only blobs within the configured size range are worth an Azure request
+        qualifying_blobs = filter_blobs(blobs, self.min_blob_area, self.max_blob_area)
+        if motion_score > dynamic_threshold and not qualifying_blobs:
+            _LOGGER.debug(
+                f"Motion rejected by blob filter ({self.min_blob_area:.0f}-{self.max_blob_area:.0f}px): {describe_blobs(blobs)}"
+            )
+        significant_motion = motion_score > dynamic_threshold and bool(qualifying_blobs)
+        decision = FrameDecision(ACTION_REFERENCE_UPDATED, motion_score, dynamic_threshold, qualifying_blobs)
+
+        # NOTE: Record the frame in the N-of-M temporal confirmation window
+        self.confirmation.add(significant_motion, image_data, qualifying_blobs[0] if qualifying_blobs else None)
+        confirmed_sample = self.confirmation.confirm() if significant_motion else None
+
+        if not significant_motion:
+            _LOGGER.debug(f"No significant motion detected. Motion score: {motion_score}")
+            # info: Update reference image periodically when no motion is detected
+            self._update_reference(current_frame)
+            _LOGGER.debug("Reference image updated.")
+            # info: reset unknown_object_counter
+            self.unknown_object_counter = 0
+            return decision
+
+        if self.unknown_object_counter == 0 and confirmed_sample is None:
+            # info: Keep the reference image, so the motion stays visible in the next frames
+            _LOGGER.debug(f"Significant motion awaiting temporal confirmation. Motion score: {motion_score}")
+            decision.action = ACTION_AWAITING_CONFIRMATION
+            return decision
+
+        _LOGGER.debug(f"Significant motion detected. Motion score: {motion_score}, {describe_blobs(qualifying_blobs)}")
+        if self.unknown_object_counter == 0:
+            # info: A new motion event starts
+            self.event_azure_requests = 0
+        # IMPORTANT: Decide whether to send a request to Azure
+        request_azure, decision.sampling_reason = self.sampling_policy.should_request(
+            self.unknown_object_counter,
+            motion_score,
+            qualifying_blobs,
+            budget_ratio,
+        )
+        if request_azure:
+            _LOGGER.debug(f"Sending image to Azure for analysis ({decision.sampling_reason}). Counter: {self.unknown_object_counter}")
+            self.sampling_policy.record_request(motion_score, qualifying_blobs)
+            self.event_azure_requests += 1
+            # info: Send the frame with the largest motion blob in the window, not simply the latest one
+            decision.action = ACTION_REQUEST_AZURE
+            decision.azure_image_data = confirmed_sample.image_data if confirmed_sample else image_data
+            self.confirmation.reset()
+            return decision
+
+        _LOGGER.debug(f"Skipping Azure analysis at counter {self.unknown_object_counter} ({decision.sampling_reason}).")
+        decision.action = ACTION_SKIPPED
+        decision.unknown_object = self._count_unknown_object(current_frame)
+        return decision
+
+    def record_azure_result(self, detected, current_frame):
+        """
+        Update the state with the Azure result of a requested frame.
+
+        Args:
+            detected (bool): True if Azure detected a target object.
+            current_frame (MotionFrame): The processed frame.
+
+        Returns:
+            bool: True if the unknown object limit was reached.
+        """
+        if detected:
+            # warning: Object is being present now
+            self.object_present = True
+            # info: Reset unknown_object_counter
+            self.unknown_object_counter = 0
+            return False
+        _LOGGER.debug("No target object detected by Azure.")
+        return self._count_unknown_object(current_frame)
+
+    def reference_age(self):
+        """Return the number of seconds the reference image has been held."""
+        return self._clock() - self.reference_image_time
+
+    def _count_unknown_object(self, current_frame):
+        """
+        Increment the unknown object counter and abandon the event at the limit.
+
+        Returns:
+            bool: True if the limit was reached after Azure was asked about the event
+            and did not recognize it. The reference image is replaced at the limit either way.
+        """
+        # warning: Increment unknown_object_counter
+        self.unknown_object_counter += 1
+        if self.unknown_object_counter < self.sampling_policy.max_unknown_object_counter:
+            return False
+        # NOTE: With the budget exhausted no frame of the event reached Azure, so nothing is known to be unrecognized
+        unknown_object = self.event_azure_requests > 0
+        if unknown_object:
+            _LOGGER.info("Unknown object detected multiple times without recognition.")
+        else:
+            _LOGGER.info("Motion event abandoned without any Azure request, the request budget is exhausted.")
+        # IMPORTANT: Update reference image after reaching max detections
+        _LOGGER.info(
+            f"Updating reference image after {self.unknown_object_counter} unknown detections. "
+            f"Old reference image age: {self.reference_age():.2f} seconds."
+        )
+        self._update_reference(current_frame)
+        self.motion_history.clear()
+        # info: Reset unknown_object_counter
+        self.unknown_object_counter = 0
+        self.event_azure_requests = 0
+        return unknown_object
+
+    def _update_reference(self, frame):
+        """Use the frame as the new reference image."""
+        self.reference_frame = frame
+        self.reference_image_time = self._clock()
@@ -0,0 +1,132 @@
+import logging
+import functools
+import voluptuous as vol  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONE_MODE_INCLUDE = "include"
+ZONE_MODE_EXCLUDE = "exclude"
+
+# NOTE: Zone coordinates are normalized (0.0 - 1.0) so zones survive resolution changes
+_COORDINATE = vol.All(vol.Coerce(float), vol.Range(min=0, max=1))
+
+
+def _require_shape(zone):
+    """Ensure that a zone defines either a polygon or a rectangle."""
+    if 'points' not in zone and 'rect' not in zone:
+        raise vol.Invalid("zone requires either 'points' or 'rect'")
+    return zone
+
+
+ZONE_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Optional('mode', default=ZONE_MODE_INCLUDE): vol.In([ZONE_MODE_INCLUDE, ZONE_MODE_EXCLUDE]),
+        vol.Exclusive('points', 'shape'): vol.All(
+            [vol.All([_COORDINATE], vol.Length(min=2, max=2))], vol.Length(min=3)
+        ),
+        vol.Exclusive('rect', 'shape'): vol.All([_COORDINATE], vol.Length(min=4, max=4)),
+    }),
+    _require_shape,
+)
+
+DETECTION_ZONES_SCHEMA = vol.All(list, [ZONE_SCHEMA])
+
+
+def zones_key(detection_zones):
+    """
+    Convert stored zones into a hashable key of (mode, polygon) pairs.
+
+    Rectangles given as [x, y, width, height] are converted to polygons.
+
+    Args:
+        detection_zones (list): Zones as stored in DeviceData.
+
+    Returns:
+        tuple: Hashable zone description, empty if no zones are configured.
+    """
+    key = []
+    for zone in detection_zones or []:
+        if 'rect' in zone:
+            x, y, width, height = zone['rect']
+            points = ((x, y), (x + width, y), (x + width, y + height), (x, y + height))
+        else:
+            points = tuple(tuple(point) for point in zone.get('points', []))
+        if len(points) >= 3:
+            key.append((zone.get('mode', ZONE_MODE_INCLUDE), points))
+    return tuple(key)
+
+
+@functools.lru_cache(maxsize=32)
+def build_zone_mask(key, size):
+    """
+    Rasterise the zones into a bitmask for the given analysis resolution.
+
+    The result is cached per (zones, resolution), so the polygons are drawn only
+    once and every following frame reuses the same bitmap.
+
+    Args:
+        key (tuple): Zone description returned by zones_key.
+        size (tuple): (width, height) of the analysed image.
+
+    Returns:
+        tuple: (crop_box, mask) where crop_box bounds the active area and mask is
+            the 'L' mode bitmap cropped to that box, or (None, None) if the zones
+            cover nothing.
+    """
+    # info: Pillow is imported on first use, the module is loaded at startup for the zone schema
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    has_include = any(mode == ZONE_MODE_INCLUDE for mode, _ in key)
+    mask = Image.new('L', size, 0 if has_include else 255)
+    draw = ImageDraw.Draw(mask)
+
+    # NOTE: Include zones are drawn first so exclude zones always win where they overlap
+    for wanted_mode, fill in ((ZONE_MODE_INCLUDE, 255), (ZONE_MODE_EXCLUDE, 0)):
+        for mode, points in key:
+            if mode == wanted_mode:
+                draw.polygon([(x * (width - 1), y * (height - 1)) for x, y in points], fill=fill)
+
+    crop_box = mask.getbbox()
+    if crop_box is None:
+        _LOGGER.warning(f"[HomeAIVision] Detection zones leave no active area at {width}x{height}")
+        return None, None
+    _LOGGER.debug(f"[HomeAIVision] Built detection zone mask for {width}x{height}, active box: {crop_box}")
+    return crop_box, mask.crop(crop_box)
+
+
+def is_point_in_zones(x, y, detection_zones):
+    """
+    Check if a normalized point lies within the active detection area.
+
+    Args:
+        x (float): Normalized horizontal position (0.0 - 1.0).
+        y (float): Normalized vertical position (0.0 - 1.0).
+        detection_zones (list): Zones as stored in DeviceData.
+
+    Returns:
+        bool: True if the point is inside an include zone (or no include zones
+            exist) and outside every exclude zone.
+    """
+    key = zones_key(detection_zones)
+    if not key:
+        return True
+    include_zones = [points for mode, points in key if mode == ZONE_MODE_INCLUDE]
+    if include_zones and not any(_point_in_polygon(x, y, points) for points in include_zones):
+        return False
+    return not any(
+        _point_in_polygon(x, y, points) for mode, points in key if mode == ZONE_MODE_EXCLUDE
+    )
+
+
+def _point_in_polygon(x, y, points):
+    """Ray casting test for a point inside a polygon."""
+    inside = False
+    previous_x, previous_y = points[-1]
+    for current_x, current_y in points:
+        if (current_y > y) != (previous_y > y):
+            crossing_x = (previous_x - current_x) * (y - current_y) / (previous_y - current_y) + current_x
+            if x < crossing_x:
+                inside = not inside
+        previous_x, previous_y = current_x, current_y
+    return inside
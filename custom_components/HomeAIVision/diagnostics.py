@@ -0,0 +1,58 @@
+import logging
+
+from homeassistant.components.diagnostics import async_redact_data  # type: ignore
+from homeassistant.config_entries import ConfigEntry  # type: ignore
+from homeassistant.core import HomeAssistant  # type: ignore
+
+from .const import DOMAIN, CONF_AZURE_API_KEY, CONF_AZURE_ENDPOINT
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Camera URLs often carry credentials and webhook IDs grant access, so they are redacted like the Azure key
+TO_REDACT = {CONF_AZURE_API_KEY, CONF_AZURE_ENDPOINT, "url", "motion_url", "webhook_id"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """
+    Return the diagnostics of the config entry.
+
+    The download holds the redacted configuration, the event loop and executor
+    figures of the watchdog, and the settings, camera task state and pipeline
+    metrics of every device. Everything is read from memory.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        entry (ConfigEntry): The configuration entry of the integration.
+
+    Returns:
+        dict: The diagnostics data.
+    """
+    data = hass.data.get(DOMAIN, {})
+    store = data.get('store')
+    watchdog = data.get('watchdog')
+    camera_tasks = data.get('camera_tasks', {})
+    pipeline_metrics = data.get('pipeline_metrics', {})
+    camera_health = data.get('camera_health', {})
+
+    devices = {}
+    if store:
+        for device_id, device in store.get_devices().items():
+            metrics = pipeline_metrics.get(device_id)
+            health = camera_health.get(device_id)
+            devices[device_id] = {
+                "settings": async_redact_data(device.asdict(), TO_REDACT),
+                "camera_task_running": device_id in camera_tasks and not camera_tasks[device_id][0].done(),
+                "pipeline": metrics.as_attributes() if metrics else None,
+                # info: The error message is left out, it may contain the camera address
+                "health": {
+                    "state": health.state,
+                    **{key: value for key, value in health.as_attributes().items() if key != "last_error"},
+                } if health else None,
+            }
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "global": store.global_data.asdict() if store else None,
+        "watchdog": watchdog.as_dict() if watchdog else None,
+        "devices": devices,
+    }
@@ -1,8 +1,7 @@
 import logging
-import asyncio
 
 from homeassistant.helpers.dispatcher import async_dispatcher_connect  # type: ignore
-from homeassistant.components.sensor import SensorEntity  # type: ignore
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass  # type: ignore
 from homeassistant.components.number import NumberEntity  # type: ignore
 from homeassistant.components.select import SelectEntity  # type: ignore
 from homeassistant.components.switch import SwitchEntity  # type: ignore
@@ -10,7 +9,11 @@ from homeassistant.helpers.entity import Entity, EntityCategory  # type: ignore
 
 from .const import DOMAIN
 from .store import HomeAIVisionStore
-from .camera_processing import periodic_check
+from .camera_processing import start_camera_task
+from .notification_manager import NotificationDispatcher, NOTIFICATIONS_UPDATE_SIGNAL
+from .pipeline_metrics import get_pipeline_metrics, STAGE_FRAME, UNRECORDED_ATTRIBUTES
+from .camera_health import get_camera_health, HEALTH_STATES, HEALTH_HEALTHY, HEALTH_DEGRADED, HEALTH_UPDATE_SIGNAL
+from .loop_watchdog import LoopWatchdog, LOOP_UNRECORDED_ATTRIBUTES, EXECUTOR_UNRECORDED_ATTRIBUTES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,15 +68,11 @@ class ArmedSwitchEntity(BaseHomeAIVisionEntity, SwitchEntity):
             self.async_write_ha_state()
             # info: Start the periodic check task
             if self._device_id not in self.hass.data[DOMAIN]['camera_tasks']:
-                stop_event = asyncio.Event()
                 config_entry = self.hass.config_entries.async_get_entry(device_data.config_entry_id)
                 if not config_entry:
                     _LOGGER.error(f"[HomeAIVision] Config entry not found for device {self._device_id}")
                     return
-                task = self.hass.async_create_task(
-                    periodic_check(self.hass, config_entry, device_data.asdict(), stop_event)
-                )
-                self.hass.data[DOMAIN]['camera_tasks'][self._device_id] = (task, stop_event)
+                start_camera_task(self.hass, config_entry, device_data.asdict())
                 _LOGGER.debug(f"[HomeAIVision] Armed camera {self._device_id}, task started.")
 
     async def async_turn_off(self, **kwargs):
@@ -271,6 +270,98 @@ class MaxImagesPerDayEntity(BaseHomeAIVisionEntity, SensorEntity):
         return None
 
 
+class PipelineLatencyEntity(BaseHomeAIVisionEntity, SensorEntity):
+    """Entity representing the detection pipeline latency of a device."""
+
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, hass, device_config):
+        """
+        Initialize the PipelineLatencyEntity.
+
+        The state is the 95th percentile of the whole frame latency. Percentiles
+        of every stage, the frame counters and the effective FPS are exposed as
+        attributes. The entity is polled, so recording a frame costs no state write.
+        The stage percentiles are not recorded in the history.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            device_config (dict): Configuration parameters for the device.
+        """
+        super().__init__(hass, device_config)
+        self.metrics = get_pipeline_metrics(hass, self._device_id)
+        self._attr_unique_id = f"{self._device_id}_pipeline_latency"
+        self._attr_name = f"{self._device_name} Pipeline Latency"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_should_poll = True
+
+    @property
+    def icon(self):
+        """Return the icon for the sensor."""
+        return "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        """Return the 95th percentile of the frame latency in milliseconds."""
+        return self.metrics.histograms[STAGE_FRAME].summary()["p95_ms"]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the per-stage percentiles and frame counters."""
+        return self.metrics.as_attributes()
+
+
+class CameraHealthEntity(BaseHomeAIVisionEntity, SensorEntity):
+    """Entity representing the health of the frame fetches of a device."""
+
+    def __init__(self, hass, device_config):
+        """
+        Initialize the CameraHealthEntity.
+
+        The state is healthy, degraded or down. It is written on every transition,
+        the failure details are exposed as attributes.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            device_config (dict): Configuration parameters for the device.
+        """
+        super().__init__(hass, device_config)
+        self.health = get_camera_health(hass, self._device_id)
+        self._attr_unique_id = f"{self._device_id}_camera_health"
+        self._attr_name = f"{self._device_name} Camera Health"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_class = SensorDeviceClass.ENUM
+        self._attr_options = list(HEALTH_STATES)
+
+    @property
+    def icon(self):
+        """Return the icon for the sensor."""
+        if self.health.state == HEALTH_HEALTHY:
+            return "mdi:cctv"
+        if self.health.state == HEALTH_DEGRADED:
+            return "mdi:alert-outline"
+        return "mdi:cctv-off"
+
+    @property
+    def native_value(self):
+        """Return the health state."""
+        return self.health.state
+
+    @property
+    def extra_state_attributes(self):
+        """Return the failure details."""
+        return self.health.as_attributes()
+
+    async def async_added_to_hass(self):
+        """Handle addition of the entity to Home Assistant."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, HEALTH_UPDATE_SIGNAL.format(self._device_id), self.async_write_ha_state
+            )
+        )
+
+
 # INFO: Configuration entities
 class ConfidenceThresholdEntity(BaseHomeAIVisionEntity, NumberEntity):
     """Entity representing the detection confidence threshold."""
@@ -487,3 +578,240 @@ class GlobalAzureRequestCountEntity(SensorEntity):
             )
         else:
             _LOGGER.error("[HomeAIVision] Cannot add dispatcher because store is None")
+
+
+class GlobalAzureRequestBudgetEntity(NumberEntity):
+    """Entity representing the global Azure request budget."""
+
+    def __init__(self, hass):
+        """
+        Initialize the GlobalAzureRequestBudgetEntity.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        super().__init__()
+        self.hass = hass
+        self.store: HomeAIVisionStore = hass.data[DOMAIN]['store']
+        self._attr_unique_id = f"{DOMAIN}_global_azure_request_budget"
+        self._attr_name = "Global Azure Request Budget"
+        self._attr_entity_category = EntityCategory.CONFIG
+        self._attr_native_min_value = 0
+        self._attr_native_max_value = 1000000
+        self._attr_native_step = 1
+        self._attr_mode = 'box'
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "global")},
+            "name": "HomeAIVision",
+            "manufacturer": "HomeAIVision",
+            "model": "Intelligent Camera",
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for the entity."""
+        return "mdi:cash-multiple"
+
+    @property
+    def native_value(self):
+        """Return the current request budget, 0 means unlimited."""
+        return self.store.get_request_budget()
+
+    async def async_set_native_value(self, value: float):
+        """
+        Set a new request budget value.
+
+        Args:
+            value (float): The new request budget, 0 for unlimited.
+        """
+        await self.store.async_set_request_budget(int(value))
+        self.async_write_ha_state()
+
+
+class GlobalCameraStartConcurrencyEntity(NumberEntity):
+    """Entity representing the number of cameras that may start at the same time."""
+
+    def __init__(self, hass):
+        """
+        Initialize the GlobalCameraStartConcurrencyEntity.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        super().__init__()
+        self.hass = hass
+        self.store: HomeAIVisionStore = hass.data[DOMAIN]['store']
+        self._attr_unique_id = f"{DOMAIN}_global_camera_start_concurrency"
+        self._attr_name = "Camera Start Concurrency"
+        self._attr_entity_category = EntityCategory.CONFIG
+        self._attr_native_min_value = 1
+        self._attr_native_max_value = 16
+        self._attr_native_step = 1
+        self._attr_mode = 'box'
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "global")},
+            "name": "HomeAIVision",
+            "manufacturer": "HomeAIVision",
+            "model": "Intelligent Camera",
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for the entity."""
+        return "mdi:stairs-up"
+
+    @property
+    def native_value(self):
+        """Return the current camera start concurrency."""
+        return self.store.get_camera_start_concurrency()
+
+    async def async_set_native_value(self, value: float):
+        """
+        Set a new camera start concurrency, applied when the integration is next loaded.
+
+        Args:
+            value (float): The new number of cameras starting at the same time.
+        """
+        await self.store.async_set_camera_start_concurrency(int(value))
+        self.async_write_ha_state()
+
+
+class GlobalNotificationStatsEntity(SensorEntity):
+    """Entity representing the notification dispatcher counters."""
+
+    def __init__(self, hass):
+        """
+        Initialize the GlobalNotificationStatsEntity.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        super().__init__()
+        self.hass = hass
+        self.dispatcher: NotificationDispatcher = hass.data[DOMAIN]['notification_dispatcher']
+        self._attr_unique_id = f"{DOMAIN}_global_notifications_sent"
+        self._attr_name = "Global Notifications Sent"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "global")},
+            "name": "HomeAIVision",
+            "manufacturer": "HomeAIVision",
+            "model": "Intelligent Camera",
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for the sensor."""
+        return "mdi:bell-ring"
+
+    @property
+    def state(self):
+        """Return the number of delivered notifications."""
+        return self.dispatcher.sent_count
+
+    @property
+    def extra_state_attributes(self):
+        """Return the merged, dropped and queued notification counts."""
+        return self.dispatcher.get_stats()
+
+    async def async_added_to_hass(self):
+        """Handle addition of the entity to Home Assistant."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, NOTIFICATIONS_UPDATE_SIGNAL, self.async_write_ha_state
+            )
+        )
+
+
+class GlobalLoopLagEntity(SensorEntity):
+    """Entity representing the event loop lag seen by the watchdog."""
+
+    _unrecorded_attributes = LOOP_UNRECORDED_ATTRIBUTES
+
+    def __init__(self, hass):
+        """
+        Initialize the GlobalLoopLagEntity.
+
+        The state is the largest loop lag of the last minute. The lag percentiles
+        and the loop stalls per blamed stage are exposed as attributes, only the
+        stall total, threshold and last alert are recorded in the history.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        super().__init__()
+        self.hass = hass
+        self.watchdog: LoopWatchdog = hass.data[DOMAIN]['watchdog']
+        self._attr_unique_id = f"{DOMAIN}_global_event_loop_lag"
+        self._attr_name = "Event Loop Lag"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_native_unit_of_measurement = "ms"
+        self._attr_should_poll = True
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "global")},
+            "name": "HomeAIVision",
+            "manufacturer": "HomeAIVision",
+            "model": "Intelligent Camera",
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for the sensor."""
+        return "mdi:timer-alert-outline"
+
+    @property
+    def native_value(self):
+        """Return the largest loop lag of the last minute in milliseconds."""
+        return self.watchdog.recent_max_lag_ms()
+
+    @property
+    def extra_state_attributes(self):
+        """Return the lag percentiles and the loop stalls per stage."""
+        return self.watchdog.loop_attributes()
+
+
+class GlobalExecutorJobsEntity(SensorEntity):
+    """Entity representing the executor jobs of the integration."""
+
+    _unrecorded_attributes = EXECUTOR_UNRECORDED_ATTRIBUTES
+
+    def __init__(self, hass):
+        """
+        Initialize the GlobalExecutorJobsEntity.
+
+        The state is the number of integration jobs in Home Assistant's executor.
+        Queued jobs, the wait for a worker and the saturations per stage are
+        exposed as attributes, only the queued and peak jobs and the thresholds
+        are recorded in the history.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        super().__init__()
+        self.hass = hass
+        self.watchdog: LoopWatchdog = hass.data[DOMAIN]['watchdog']
+        self._attr_unique_id = f"{DOMAIN}_global_executor_jobs"
+        self._attr_name = "Executor Jobs"
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_should_poll = True
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, "global")},
+            "name": "HomeAIVision",
+            "manufacturer": "HomeAIVision",
+            "model": "Intelligent Camera",
+        }
+
+    @property
+    def icon(self):
+        """Return the icon for the sensor."""
+        return "mdi:cogs"
+
+    @property
+    def native_value(self):
+        """Return the number of integration jobs submitted to the executor and not yet finished."""
+        return self.watchdog.in_flight_jobs()
+
+    @property
+    def extra_state_attributes(self):
+        """Return the queued jobs, queue wait and saturations per stage."""
+        return self.watchdog.executor_attributes()
@@ -0,0 +1,137 @@
+import time
+import logging
+import attr  # type: ignore
+
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Event buffer parameters
+EVENT_BUFFER_MAX_BYTES = 16 * 1024 * 1024      # info: Memory cap of the buffered frames of a camera
+EVENT_FOLDER_SUFFIX = "_event"                 # info: Appended to the detection image name for its event group
+
+
+@attr.s(slots=True)
+class BufferedFrame:
+    """Class representing a raw frame held for an event group."""
+
+    timestamp = attr.ib(type=float)
+    image_data = attr.ib(type=bytes, repr=False)
+
+
+class FrameRingBuffer:
+    """
+    Most recent raw frames of a camera, kept for the context of a detection.
+
+    The frames are held as references to the fetched bytes, nothing is copied or
+    decoded. The oldest frames are dropped once `max_frames` or
+    EVENT_BUFFER_MAX_BYTES is exceeded.
+    """
+
+    def __init__(self, max_frames, max_bytes=EVENT_BUFFER_MAX_BYTES, clock=time.time):
+        """
+        Initialize the FrameRingBuffer.
+
+        Args:
+            max_frames (int): Number of frames kept, 0 disables the buffer.
+            max_bytes (int): Upper bound of the total size of the kept frames.
+            clock (callable): Wall clock, replaceable for offline tools.
+        """
+        self.max_frames = max(0, int(max_frames))
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._frames = deque()
+        self.size_bytes = 0
+
+    def add(self, image_data):
+        """
+        Add a frame, dropping the oldest frames over the limits.
+
+        Args:
+            image_data (bytes): The JPEG data.
+
+        Returns:
+            BufferedFrame: The added frame.
+        """
+        frame = BufferedFrame(self._clock(), image_data)
+        if not self.max_frames:
+            return frame
+        self._frames.append(frame)
+        self.size_bytes += len(image_data)
+        while self._frames and (len(self._frames) > self.max_frames or self.size_bytes > self.max_bytes):
+            self.size_bytes -= len(self._frames.popleft().image_data)
+        return frame
+
+    def snapshot(self):
+        """
+        Return the buffered frames, oldest first.
+
+        Returns:
+            list: BufferedFrame of the buffered frames.
+        """
+        return list(self._frames)
+
+
+class EventCapture:
+    """
+    Event group of a detection: the buffered frames and the frames that follow it.
+
+    The post-event frames are the frames the camera task fetches anyway, so the
+    group costs no extra camera requests.
+    """
+
+    def __init__(self, event_path, detection_time, pre_frames, post_frames):
+        """
+        Initialize the EventCapture.
+
+        Args:
+            event_path (str): Folder the event group is written to.
+            detection_time (float): Wall clock time of the detection frame.
+            pre_frames (list): BufferedFrame of the frames up to the detection, oldest first.
+            post_frames (int): Number of frames to collect after the detection.
+        """
+        self.event_path = event_path
+        self.detection_time = detection_time
+        self.frames = list(pre_frames)
+        self.post_frames_remaining = max(0, int(post_frames))
+        self.stored_size = 0            # info: Bytes of the event folder accounted to the storage usage
+
+    @property
+    def complete(self):
+        """Return True once all post-event frames were collected."""
+        return not self.post_frames_remaining
+
+    def add_post_frame(self, frame):
+        """
+        Add a frame fetched after the detection.
+
+        Args:
+            frame (BufferedFrame): The frame.
+        """
+        if self.post_frames_remaining:
+            self.frames.append(frame)
+            self.post_frames_remaining -= 1
+
+    def summary_frames(self):
+        """
+        Return the frames collected so far with their offset from the detection.
+
+        Returns:
+            list: (offset, image_data) tuples, the offset in seconds.
+        """
+        return [(frame.timestamp - self.detection_time, frame.image_data) for frame in self.frames]
+
+    def files(self):
+        """
+        Return the file names and data of the event group.
+
+        The names hold the offset from the detection, e.g. `frame_03_-2.0s.jpg`,
+        so the files sort in capture order.
+
+        Returns:
+            list: (file_name, image_data) tuples.
+        """
+        return [
+            (f"frame_{index:02d}_{frame.timestamp - self.detection_time:+.1f}s.jpg", frame.image_data)
+            for index, frame in enumerate(self.frames)
+        ]
@@ -0,0 +1,139 @@
+import io
+import os
+import math
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Event summary parameters
+SUMMARY_CLIP_SIZE = 480             # info: Bounding box in pixels of the clip frames
+SUMMARY_CLIP_FRAME_DURATION = 500   # info: Milliseconds per clip frame
+SUMMARY_THUMBNAIL_SIZE = 240        # info: Bounding box in pixels of the contact sheet tiles
+SUMMARY_SHEET_COLUMNS = 4
+SUMMARY_SHEET_QUALITY = 80
+CONTACT_SHEET_NAME = "contact_sheet.jpg"
+CLIP_BASE_NAME = "clip"             # info: clip.webp, or clip.gif when Pillow has no WebP support
+
+
+def decode_scaled(image_data, size):
+    """
+    Decode a JPEG frame directly at a reduced size.
+
+    The JPEG draft mode lets the decoder skip most of the full-resolution work,
+    which keeps the summary cheap even for main-stream frames.
+
+    Args:
+        image_data (bytes): The JPEG data.
+        size (int): Bounding box of the result in pixels.
+
+    Returns:
+        PIL.Image.Image: The RGB frame within the bounding box.
+    """
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_data))
+    image.draft("RGB", (size, size))
+    image = image.convert("RGB")
+    image.thumbnail((size, size))
+    return image
+
+
+def _write_atomic(path, save):
+    """
+    Write a file under a temporary name and move it in place.
+
+    Args:
+        path (str): The final path.
+        save (callable): Writes the content to the file object it is given.
+    """
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        save(file)
+    os.replace(temporary_path, path)
+
+
+def build_contact_sheet(frames):
+    """
+    Lay out the frames of an event as a grid of labelled thumbnails.
+
+    Args:
+        frames (list): (offset, image) tuples, the offset in seconds from the detection.
+
+    Returns:
+        PIL.Image.Image: The contact sheet.
+    """
+    from PIL import Image, ImageDraw
+
+    columns = min(SUMMARY_SHEET_COLUMNS, len(frames))
+    rows = math.ceil(len(frames) / columns)
+    tile_width = max(image.width for _, image in frames)
+    tile_height = max(image.height for _, image in frames)
+    sheet = Image.new("RGB", (columns * tile_width, rows * tile_height))
+    draw = ImageDraw.Draw(sheet)
+    for index, (offset, image) in enumerate(frames):
+        left = (index % columns) * tile_width
+        top = (index // columns) * tile_height
+        sheet.paste(image.resize((tile_width, tile_height)) if image.size != (tile_width, tile_height) else image, (left, top))
+        # info: The detection frame is marked, the other frames show their offset
+        label = "detection" if offset == 0 else f"{offset:+.1f}s"
+        text_left, text_top, text_right, text_bottom = draw.textbbox((left + 3, top + 3), label)
+        draw.rectangle((left, top, text_right + 3, text_bottom + 3), fill=(0, 0, 0))
+        draw.text((text_left, text_top), label, fill=(255, 255, 0) if offset == 0 else (255, 255, 255))
+    return sheet
+
+
+def build_event_summary(event_path, frames):
+    """
+    Write the animated clip and the contact sheet of an event group.
+
+    This function decodes images and does blocking file I/O, so it must run in
+    the executor. Frames that cannot be decoded are skipped.
+
+    Args:
+        event_path (str): The folder of the event group.
+        frames (list): (offset, image_data) tuples in capture order, the offset in seconds from the detection.
+
+    Returns:
+        tuple: (clip_path, contact_sheet_path), (None, None) if no frame could be decoded.
+    """
+    from PIL import features
+
+    clip_frames = []
+    sheet_frames = []
+    for offset, image_data in frames:
+        try:
+            image = decode_scaled(image_data, SUMMARY_CLIP_SIZE)
+        except (OSError, SyntaxError) as e:
+            _LOGGER.debug(f"[HomeAIVision] Skipping an undecodable event frame: {e}")
+            continue
+        clip_frames.append(image)
+        thumbnail = image.copy()
+        thumbnail.thumbnail((SUMMARY_THUMBNAIL_SIZE, SUMMARY_THUMBNAIL_SIZE))
+        sheet_frames.append((offset, thumbnail))
+    if not clip_frames:
+        return None, None
+
+    os.makedirs(event_path, exist_ok=True)
+    # info: All clip frames need the same size, the camera may have changed resolution within the event
+    clip_size = clip_frames[-1].size
+    clip_frames = [image if image.size == clip_size else image.resize(clip_size) for image in clip_frames]
+    if features.check_module("webp"):
+        clip_path = os.path.join(event_path, f"{CLIP_BASE_NAME}.webp")
+        clip_options = {"format": "WEBP", "quality": 60, "method": 4}
+    else:
+        clip_path = os.path.join(event_path, f"{CLIP_BASE_NAME}.gif")
+        clip_options = {"format": "GIF", "optimize": True}
+    _write_atomic(clip_path, lambda file: clip_frames[0].save(
+        file,
+        save_all=True,
+        append_images=clip_frames[1:],
+        duration=SUMMARY_CLIP_FRAME_DURATION,
+        loop=0,
+        **clip_options,
+    ))
+
+    contact_sheet_path = os.path.join(event_path, CONTACT_SHEET_NAME)
+    contact_sheet = build_contact_sheet(sheet_frames)
+    _write_atomic(contact_sheet_path, lambda file: contact_sheet.save(file, format="JPEG", quality=SUMMARY_SHEET_QUALITY))
+    _LOGGER.info(f"[HomeAIVision] Saved event summary of {len(clip_frames)} frames: {event_path}")
+    return clip_path, contact_sheet_path
@@ -0,0 +1,322 @@
+import os
+import json
+import time
+import base64
+import bisect
+import logging
+import binascii
+import attr  # type: ignore
+
+from datetime import datetime
+
+from .event_buffer import EVENT_FOLDER_SUFFIX
+from .save_image_manager import is_thumbnail, get_thumbnail_path, get_event_folder_path, THUMBNAIL_FORMATS
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Gallery page parameters
+GALLERY_PAGE_SIZE = 50
+GALLERY_MAX_PAGE_SIZE = 200
+IMAGE_NAME_FORMAT = "cam_frame_%Y-%m-%d_%H-%M-%S"   # info: Name of the images written by save_image
+
+
+@attr.s(slots=True)
+class GalleryEntry:
+    """Class representing a saved detection image in the gallery."""
+
+    id = attr.ib(type=str)                          # info: Path relative to the image folder, e.g. Camera/2024-05-01/cam_frame_....jpg
+    timestamp = attr.ib(type=float)
+    detected_object = attr.ib(type=str, default=None)
+    thumbnail = attr.ib(type=str, default=None)     # info: Relative path of the thumbnail, None without one
+    event = attr.ib(type=bool, default=False)       # info: True if an event group was saved with the image
+
+    @property
+    def key(self):
+        """Return the sort key, the gallery is ordered by time."""
+        return (self.timestamp, self.id)
+
+    @property
+    def device(self):
+        """Return the device folder of the image."""
+        return self.id.split("/", 1)[0]
+
+    @property
+    def date(self):
+        """Return the day folder of the image."""
+        return self.id.split("/")[1] if self.id.count("/") >= 2 else None
+
+    def astuple(self):
+        """Return the entry in its compact stored form."""
+        return [self.id, self.timestamp, self.detected_object, self.thumbnail, self.event]
+
+
+def encode_cursor(entry):
+    """
+    Return the opaque cursor continuing a page after an entry.
+
+    Args:
+        entry (GalleryEntry): The last entry of the page.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps([entry.timestamp, entry.id]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Return the sort key a cursor points at.
+
+    Args:
+        cursor (str): Cursor returned with a previous page.
+
+    Returns:
+        tuple: (timestamp, id) of the last entry of the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        timestamp, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (float(timestamp), str(entry_id))
+    except (binascii.Error, UnicodeError, TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+
+class GalleryIndex:
+    """
+    Index of the saved detection images, kept up to date as images are saved and removed.
+
+    save_image adds every image and removes the images evicted by the per-day
+    limit, and the retention policy removes whole day folders, so listing the
+    gallery never scans the image folders. The entries are kept sorted by time,
+    pages are served newest first and continue from a cursor, so a page stays
+    consistent while new images arrive.
+    """
+
+    def __init__(self, base_path, clock=time.time):
+        """
+        Initialize the GalleryIndex.
+
+        Args:
+            base_path (str): The base directory where images are saved.
+            clock (callable): Wall clock, replaceable for offline tools.
+        """
+        self.base_path = os.path.normpath(base_path)
+        self._clock = clock
+        self._entries = {}
+        self._order = []            # info: Sort keys of all entries, oldest first
+        # info: Increased with every change and part of the ETag of a page. It starts from the clock, so no ETag of a previous run matches
+        self.version = int(clock() * 1000)
+        self._listeners = []
+
+    def __len__(self):
+        """Return the number of indexed images."""
+        return len(self._entries)
+
+    def relative_path(self, path):
+        """
+        Return a path relative to the image folder, with forward slashes.
+
+        Args:
+            path (str): An absolute path within the image folder.
+
+        Returns:
+            str: The relative path.
+        """
+        return os.path.relpath(os.path.normpath(path), self.base_path).replace(os.sep, "/")
+
+    def add_listener(self, listener):
+        """
+        Add a callable called after every change of the index.
+
+        Args:
+            listener (callable): Called without arguments.
+        """
+        self._listeners.append(listener)
+
+    def _changed(self):
+        """Increase the version and notify the listeners."""
+        self.version += 1
+        for listener in self._listeners:
+            listener()
+
+    def _insert(self, entry):
+        """Add an entry without notifying the listeners."""
+        previous = self._entries.get(entry.id)
+        if previous is not None:
+            self._remove(previous)
+        self._entries[entry.id] = entry
+        # info: New images are the newest, so the insert is an append in practice
+        bisect.insort(self._order, entry.key)
+
+    def _remove(self, entry):
+        """Remove an entry without notifying the listeners."""
+        del self._entries[entry.id]
+        index = bisect.bisect_left(self._order, entry.key)
+        if index < len(self._order) and self._order[index] == entry.key:
+            del self._order[index]
+
+    def add(self, image_path, thumbnail_path=None, detected_object=None):
+        """
+        Add a saved image.
+
+        Args:
+            image_path (str): Path of the saved image.
+            thumbnail_path (str, optional): Path of its thumbnail.
+            detected_object (str, optional): The object detected in the image.
+
+        Returns:
+            GalleryEntry: The new entry.
+        """
+        entry = GalleryEntry(
+            self.relative_path(image_path),
+            self._clock(),
+            detected_object,
+            self.relative_path(thumbnail_path) if thumbnail_path else None,
+        )
+        self._insert(entry)
+        self._changed()
+        return entry
+
+    def mark_event(self, image_path):
+        """
+        Record that an event group was saved with an image.
+
+        Args:
+            image_path (str): Path of the saved image.
+        """
+        entry = self._entries.get(self.relative_path(image_path))
+        if entry is not None and not entry.event:
+            entry.event = True
+            self._changed()
+
+    def discard(self, image_path):
+        """
+        Remove an image, if indexed.
+
+        Args:
+            image_path (str): Path of the removed image.
+        """
+        entry = self._entries.get(self.relative_path(image_path))
+        if entry is not None:
+            self._remove(entry)
+            self._changed()
+
+    def discard_folder(self, folder_path):
+        """
+        Remove all images within a folder, e.g. a day folder removed by the retention policy.
+
+        Args:
+            folder_path (str): Path of the removed folder.
+        """
+        prefix = self.relative_path(folder_path) + "/"
+        removed = [entry for entry_id, entry in self._entries.items() if entry_id.startswith(prefix)]
+        for entry in removed:
+            self._remove(entry)
+        if removed:
+            self._changed()
+
+    def page(self, device=None, date=None, detected_object=None, cursor=None, limit=GALLERY_PAGE_SIZE):
+        """
+        Return a page of images, newest first.
+
+        Args:
+            device (str, optional): Only images of this device folder.
+            date (str, optional): Only images of this day, as YYYY-MM-DD.
+            detected_object (str, optional): Only images of this object.
+            cursor (str, optional): Cursor returned with the previous page.
+            limit (int): Maximum number of images.
+
+        Returns:
+            tuple: (entries, next_cursor), next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        limit = min(max(1, int(limit)), GALLERY_MAX_PAGE_SIZE)
+        end = bisect.bisect_left(self._order, decode_cursor(cursor)) if cursor else len(self._order)
+        entries = []
+        for index in range(end - 1, -1, -1):
+            entry = self._entries[self._order[index][1]]
+            # info: Day folders follow the time order, so older days end the search
+            if date is not None and entry.date is not None and entry.date < date:
+                break
+            if device is not None and entry.device != device:
+                continue
+            if date is not None and entry.date != date:
+                continue
+            if detected_object is not None and entry.detected_object != detected_object:
+                continue
+            if len(entries) == limit:
+                return entries, encode_cursor(entries[-1])
+            entries.append(entry)
+        return entries, None
+
+    def as_dict(self):
+        """
+        Return the index in its stored form.
+
+        Returns:
+            dict: The entries as compact lists, oldest first.
+        """
+        return {"entries": [self._entries[entry_id].astuple() for _, entry_id in self._order]}
+
+    def load(self, data):
+        """
+        Replace the entries with stored or scanned ones.
+
+        Args:
+            data (dict): The index as returned by `as_dict` or `scan_gallery`.
+        """
+        self._entries = {}
+        self._order = []
+        for stored_entry in data.get("entries", []):
+            self._insert(GalleryEntry(*stored_entry))
+        self._changed()
+
+
+def scan_gallery(base_path):
+    """
+    Build the index of the images already saved, used once when no index is stored.
+
+    The detected object is not known for these images. This function does
+    blocking file I/O and must run in the executor.
+
+    Args:
+        base_path (str): The base directory where images are saved.
+
+    Returns:
+        dict: The index in its stored form.
+    """
+    index = GalleryIndex(base_path)
+    entries = []
+    for root, _, file_names in os.walk(base_path):
+        for file_name in file_names:
+            if not file_name.lower().endswith((".jpg", ".jpeg")) or is_thumbnail(file_name):
+                continue
+            image_path = os.path.join(root, file_name)
+            # info: Images inside event groups are frames of an event, not detections
+            if root.endswith(EVENT_FOLDER_SUFFIX):
+                continue
+            try:
+                timestamp = datetime.strptime(os.path.splitext(file_name)[0], IMAGE_NAME_FORMAT).timestamp()
+            except ValueError:
+                try:
+                    timestamp = os.path.getmtime(image_path)
+                except OSError:
+                    continue
+            thumbnail = next((
+                index.relative_path(path)
+                for path in (get_thumbnail_path(image_path, thumbnail_format) for thumbnail_format in THUMBNAIL_FORMATS)
+                if os.path.exists(path)
+            ), None)
+            entries.append([
+                index.relative_path(image_path),
+                timestamp,
+                None,
+                thumbnail,
+                os.path.isdir(get_event_folder_path(image_path)),
+            ])
+    _LOGGER.info(f"[HomeAIVision] Indexed {len(entries)} saved images for the gallery")
+    return {"entries": entries}
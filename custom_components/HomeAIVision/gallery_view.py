@@ -0,0 +1,176 @@
+import hashlib
+import logging
+
+from http import HTTPStatus
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from aiohttp import web  # type: ignore
+from homeassistant.components.http import HomeAssistantView  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
+from homeassistant.helpers.storage import Store  # type: ignore
+
+from .const import DOMAIN
+from .event_summary import CONTACT_SHEET_NAME
+from .event_buffer import EVENT_FOLDER_SUFFIX
+from .gallery_index import GalleryIndex, scan_gallery, GALLERY_PAGE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+GALLERY_STORAGE_KEY = "homeaivision.gallery"
+GALLERY_STORAGE_VERSION = 1
+GALLERY_SAVE_DELAY = 60             # info: Seconds changes are collected before the index is written
+GALLERY_LOCAL_URL = "/local/HomeAIVision/cam_frames/"
+
+
+async def async_load_gallery(hass: HomeAssistant, base_path):
+    """
+    Load the gallery index and keep it persisted.
+
+    The stored index is used when it exists, otherwise the saved images are
+    indexed once in the executor. The store is kept in `hass.data` for
+    `async_unload_gallery`.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        base_path (str): The base directory where images are saved.
+
+    Returns:
+        GalleryIndex: The loaded index.
+    """
+    store = Store(hass, GALLERY_STORAGE_VERSION, GALLERY_STORAGE_KEY)
+    gallery = GalleryIndex(base_path)
+    data = await store.async_load()
+    if data is None:
+        data = await hass.async_add_executor_job(scan_gallery, base_path)
+        await store.async_save(data)
+    gallery.load(data)
+    _LOGGER.debug(f"[HomeAIVision] Gallery index loaded with {len(gallery)} images")
+
+    # NOTE: Detections change the index often, so the writes are collected
+    @callback
+    def schedule_save():
+        """Write the index once changes stop for GALLERY_SAVE_DELAY seconds."""
+        store.async_delay_save(gallery.as_dict, GALLERY_SAVE_DELAY)
+
+    gallery.add_listener(schedule_save)
+    hass.data[DOMAIN]['gallery_store'] = store
+    return gallery
+
+
+async def async_unload_gallery(hass: HomeAssistant, gallery):
+    """
+    Write the gallery index without waiting for the delayed save.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        gallery (GalleryIndex): The index returned by `async_load_gallery`.
+    """
+    store = hass.data[DOMAIN].pop('gallery_store', None)
+    if store is not None:
+        await store.async_save(gallery.as_dict())
+
+
+def _local_url(relative_path):
+    """Return the /local URL of a path relative to the image folder."""
+    return GALLERY_LOCAL_URL + quote(relative_path)
+
+
+def entry_as_item(entry):
+    """
+    Return a gallery entry as an item of the API response.
+
+    The thumbnail comes first so galleries can render the page without
+    downloading any full-resolution image.
+
+    Args:
+        entry (GalleryEntry): The entry.
+
+    Returns:
+        dict: The item.
+    """
+    image_url = _local_url(entry.id)
+    event_path = entry.id.rsplit(".", 1)[0] + EVENT_FOLDER_SUFFIX
+    return {
+        "thumbnail_url": _local_url(entry.thumbnail) if entry.thumbnail else image_url,
+        "image_url": image_url,
+        "contact_sheet_url": _local_url(f"{event_path}/{CONTACT_SHEET_NAME}") if entry.event else None,
+        "id": entry.id,
+        "device": entry.device,
+        "date": entry.date,
+        "timestamp": datetime.fromtimestamp(entry.timestamp, timezone.utc).isoformat(),
+        "object": entry.detected_object,
+    }
+
+
+class HomeAIVisionGalleryView(HomeAssistantView):
+    """
+    HTTP view listing the saved detection images, newest first.
+
+    Query parameters: `device` (device ID or name), `date` (YYYY-MM-DD),
+    `object`, `limit` and `cursor` (the `next_cursor` of the previous page).
+    Pages are served from the gallery index, so no request scans the image
+    folders. Every response carries an ETag of the index version and the query,
+    so an unchanged page is answered with 304 Not Modified.
+    """
+
+    url = "/api/homeaivision/gallery"
+    name = "api:homeaivision:gallery"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        """
+        Initialize the HomeAIVisionGalleryView.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """
+        Return a page of the gallery.
+
+        Args:
+            request (web.Request): The request.
+
+        Returns:
+            web.Response: The page, 304 if the client has it, 400 for invalid parameters or 503 while the integration is not loaded.
+        """
+        data = self.hass.data.get(DOMAIN, {})
+        gallery = data.get('gallery')
+        # info: Views cannot be unregistered, so the view outlives an unloaded config entry
+        if 'store' not in data or gallery is None:
+            return self.json_message("HomeAIVision is not loaded", HTTPStatus.SERVICE_UNAVAILABLE)
+
+        query = request.query
+        device = query.get("device") or None
+        # info: Images are stored by device name, a device ID is accepted as well
+        device_data = data['store'].get_device(device) if device else None
+        if device_data is not None:
+            device = device_data.name
+        date = query.get("date") or None
+        if date is not None:
+            try:
+                datetime.strptime(date, "%Y-%m-%d")
+            except ValueError:
+                return self.json_message("date must be YYYY-MM-DD", HTTPStatus.BAD_REQUEST)
+        try:
+            limit = int(query.get("limit", GALLERY_PAGE_SIZE))
+        except ValueError:
+            return self.json_message("limit must be a number", HTTPStatus.BAD_REQUEST)
+
+        query_key = "&".join(f"{key}={value}" for key, value in sorted(query.items()))
+        etag = f'"{gallery.version}-{hashlib.sha1(query_key.encode("utf-8")).hexdigest()[:16]}"'
+        # IMPORTANT: private, the pages need authentication; no-cache, the client revalidates with the ETag
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        try:
+            entries, next_cursor = gallery.page(device, date, query.get("object") or None, query.get("cursor") or None, limit)
+        except ValueError as e:
+            return self.json_message(str(e), HTTPStatus.BAD_REQUEST)
+        response = self.json({"items": [entry_as_item(entry) for entry in entries], "next_cursor": next_cursor})
+        response.headers.update(headers)
+        return response
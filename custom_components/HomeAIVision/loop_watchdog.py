@@ -0,0 +1,307 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+
+from collections import Counter, deque
+from datetime import datetime
+
+from .profiler import is_component_file, short_filename
+from .pipeline_metrics import (
+    LatencyHistogram,
+    STAGE_AZURE,
+    STAGE_SAVE,
+    STAGE_NOTIFY,
+    STAGE_SUMMARY,
+    STAGE_PROCESS,
+    SUMMARY_KEYS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Watchdog parameters
+LAG_PROBE_INTERVAL = 0.5            # info: Seconds the lag probe sleeps between two measurements
+STALL_CHECK_INTERVAL = 0.1          # info: Seconds between two heartbeat checks of the watchdog thread
+LOOP_LAG_THRESHOLD = 0.1            # info: Loop lag in seconds above which the blocking stage is flagged, as asyncio's slow callback warning
+EXECUTOR_JOBS_THRESHOLD = 8         # info: In-flight integration executor jobs above which the executor counts as saturated
+EXECUTOR_WAIT_THRESHOLD = 0.5       # info: Seconds an integration job may wait for a worker before the executor counts as saturated
+RECENT_LAG_WINDOW = 60              # info: Seconds covered by the recent maximum lag
+WARNING_INTERVAL = 300              # info: Minimum seconds between two log warnings about the same stage
+OUTSIDE_INTEGRATION = "outside_homeaivision"
+
+# NOTE: Figures changing on every poll, kept out of the recorder; the totals and the last alert stay in the history
+LOOP_UNRECORDED_ATTRIBUTES = frozenset(
+    {f"lag_{key}" for key in SUMMARY_KEYS} | {"stalls_by_stage", "top_stall_functions"}
+)
+EXECUTOR_UNRECORDED_ATTRIBUTES = frozenset(
+    {f"queue_wait_{key}" for key in SUMMARY_KEYS} | {"in_flight_by_stage", "jobs_total", "saturations"}
+)
+
+# NOTE: Stage blamed for a loop stall, by the integration module on top of the loop stack
+STAGE_BY_MODULE = {
+    "azure_client.py": STAGE_AZURE,
+    "save_image_manager.py": STAGE_SAVE,
+    "notification_manager.py": STAGE_NOTIFY,
+    "event_summary.py": STAGE_SUMMARY,
+    "motion_detection.py": STAGE_PROCESS,
+    "blob_analysis.py": STAGE_PROCESS,
+    "detection_state.py": STAGE_PROCESS,
+}
+
+
+def blame_stack(frame):
+    """
+    Find the integration stage running on a stack.
+
+    Args:
+        frame (frame): Innermost frame of the stack.
+
+    Returns:
+        tuple: (stage, function) of the innermost integration frame, or
+        (OUTSIDE_INTEGRATION, None) if the stack does not pass through the integration.
+    """
+    while frame is not None:
+        code = frame.f_code
+        if is_component_file(code.co_filename):
+            module = short_filename(code.co_filename)
+            stage = STAGE_BY_MODULE.get(module, module.rsplit(".", 1)[0])
+            return stage, f"{module}:{code.co_firstlineno}({code.co_name})"
+        frame = frame.f_back
+    return OUTSIDE_INTEGRATION, None
+
+
+class _ExecutorJob:
+    """An executor job submitted by the integration."""
+
+    __slots__ = ("stage", "submitted", "started")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.submitted = time.monotonic()
+        self.started = None             # info: Set by the worker thread when the job starts
+
+
+class LoopWatchdog:
+    """
+    Watchdog of the event loop lag and of the integration's executor jobs.
+
+    A probe task sleeps for a fixed interval and records how late the loop wakes
+    it up. A daemon thread checks the heartbeat of the probe; when the loop has
+    not run the probe for longer than the threshold, the thread reads the stack
+    of the loop thread once and blames the integration stage running on it, or
+    reports that the loop is blocked outside of HomeAIVision. Executor jobs
+    started through async_add_executor_job are counted per stage together with
+    the time they waited for a worker of Home Assistant's shared executor.
+    """
+
+    def __init__(self, hass):
+        """
+        Initialize the LoopWatchdog.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        self.hass = hass
+        self.lag = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.stalls = Counter()             # info: Loop stalls per blamed stage
+        self.stall_functions = Counter()    # info: Loop stalls per blamed integration function
+        self.saturations = Counter()        # info: Executor saturations per stage with the most in-flight jobs
+        self.jobs_total = Counter()
+        self.peak_jobs = 0
+        self.last_alert = None
+        self._recent_lag = deque()          # info: (time, lag) of the probes within RECENT_LAG_WINDOW
+        self._jobs = set()
+        self._saturated = False
+        self._last_warning = {}
+        self._heartbeat = time.monotonic()
+        self._blamed_heartbeat = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """Start the lag probe and the watchdog thread. Must be called from the event loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = self.hass.async_create_background_task(self._async_probe(), "homeaivision_loop_watchdog")
+        self._thread = threading.Thread(target=self._run, name="homeaivision_loop_watchdog", daemon=True)
+        self._thread.start()
+
+    async def async_stop(self):
+        """Stop the lag probe and the watchdog thread."""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            await self.hass.async_add_executor_job(self._thread.join)
+            self._thread = None
+
+    async def async_add_executor_job(self, stage, target, *args):
+        """
+        Run a job in Home Assistant's executor and account it to a stage.
+
+        Args:
+            stage (str): Pipeline stage the job belongs to.
+            target (callable): The blocking function.
+            *args: Arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        job = _ExecutorJob(stage)
+        self._jobs.add(job)
+        self.jobs_total[stage] += 1
+        self.peak_jobs = max(self.peak_jobs, len(self._jobs))
+        self._check_executor()
+        try:
+            return await self.hass.async_add_executor_job(self._run_job, job, target, *args)
+        finally:
+            self._jobs.discard(job)
+            if job.started is not None:
+                self.queue_wait.observe(job.started - job.submitted)
+            self._check_executor()
+
+    @staticmethod
+    def _run_job(job, target, *args):
+        """Mark the job as started and run it. Runs in the executor."""
+        job.started = time.monotonic()
+        return target(*args)
+
+    def _check_executor(self):
+        """Flag the stage with the most in-flight jobs when the executor is saturated."""
+        now = time.monotonic()
+        longest_wait = max((now - job.submitted for job in self._jobs if job.started is None), default=0.0)
+        saturated = len(self._jobs) > EXECUTOR_JOBS_THRESHOLD or longest_wait > EXECUTOR_WAIT_THRESHOLD
+        if saturated and not self._saturated:
+            stage = Counter(job.stage for job in self._jobs).most_common(1)[0][0]
+            self.saturations[stage] += 1
+            self._alert(
+                "executor",
+                stage,
+                f"{len(self._jobs)} executor jobs in flight, longest wait for a worker {1000 * longest_wait:.0f} ms",
+            )
+        # info: A saturation ends once no job waits for a worker any more, so one episode is counted once
+        self._saturated = saturated or (self._saturated and longest_wait > 0)
+
+    async def _async_probe(self):
+        """Measure how late the loop wakes up a sleeping task."""
+        while True:
+            expected = time.monotonic() + LAG_PROBE_INTERVAL
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self.lag.observe(lag)
+            self._recent_lag.append((now, lag))
+            while self._recent_lag[0][0] < now - RECENT_LAG_WINDOW:
+                self._recent_lag.popleft()
+            # info: Also catches jobs waiting for a worker while no integration job is submitted or finished
+            self._check_executor()
+
+    def _run(self):
+        """Check the heartbeat of the probe until stopped. Runs in the watchdog thread."""
+        while not self._stop_event.wait(STALL_CHECK_INTERVAL):
+            heartbeat = self._heartbeat
+            overdue = time.monotonic() - heartbeat - LAG_PROBE_INTERVAL
+            # info: Every stall is blamed once, on the stack seen when it crosses the threshold
+            if overdue <= LOOP_LAG_THRESHOLD or heartbeat == self._blamed_heartbeat:
+                continue
+            self._blamed_heartbeat = heartbeat
+            stage, function = blame_stack(sys._current_frames().get(self._loop_thread_id))
+            self.hass.loop.call_soon_threadsafe(self._record_stall, stage, function, overdue)
+
+    def _record_stall(self, stage, function, overdue):
+        """Count a loop stall. Runs on the loop once it is free again."""
+        self.stalls[stage] += 1
+        if function is not None:
+            self.stall_functions[function] += 1
+        blocked = time.monotonic() - self._heartbeat - LAG_PROBE_INTERVAL
+        location = f" in {function}" if function else ""
+        self._alert("loop", stage, f"event loop blocked for at least {1000 * max(overdue, blocked):.0f} ms{location}")
+
+    def _alert(self, kind, stage, message):
+        """Remember the alert and log it, at most once per WARNING_INTERVAL per stage."""
+        self.last_alert = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "kind": kind,
+            "stage": stage,
+            "message": message,
+        }
+        now = time.monotonic()
+        if now - self._last_warning.get((kind, stage), -WARNING_INTERVAL) >= WARNING_INTERVAL:
+            self._last_warning[(kind, stage)] = now
+            _LOGGER.warning(f"[HomeAIVision] Watchdog: {message} (stage: {stage})")
+
+    def recent_max_lag_ms(self):
+        """
+        Return the largest loop lag of the last RECENT_LAG_WINDOW seconds.
+
+        Returns:
+            float or None: The lag in milliseconds, None before the first probe.
+        """
+        if not self._recent_lag:
+            return None
+        return round(1000 * max(lag for _, lag in self._recent_lag), 1)
+
+    def in_flight_jobs(self):
+        """Return the number of integration executor jobs submitted and not yet finished."""
+        return len(self._jobs)
+
+    def loop_attributes(self):
+        """
+        Return the loop lag figures.
+
+        Returns:
+            dict: Lag percentiles since start, threshold, stall counts and the last alert.
+        """
+        attributes = {f"lag_{key}": value for key, value in self.lag.summary().items()}
+        attributes.update({
+            "threshold_ms": round(1000 * LOOP_LAG_THRESHOLD),
+            "stalls": sum(self.stalls.values()),
+            "stalls_by_stage": dict(self.stalls.most_common()),
+            "top_stall_functions": dict(self.stall_functions.most_common(5)),
+            "last_alert": self.last_alert,
+        })
+        return attributes
+
+    def executor_attributes(self):
+        """
+        Return the executor figures.
+
+        Returns:
+            dict: In-flight and queued jobs per stage, peak, totals, queue wait and saturation counts.
+        """
+        queued = [job for job in self._jobs if job.started is None]
+        attributes = {
+            "queued": len(queued),
+            "in_flight_by_stage": dict(Counter(job.stage for job in self._jobs)),
+            "peak_in_flight": self.peak_jobs,
+            "jobs_total": dict(self.jobs_total),
+            "threshold_jobs": EXECUTOR_JOBS_THRESHOLD,
+            "threshold_wait_ms": round(1000 * EXECUTOR_WAIT_THRESHOLD),
+            "saturations": dict(self.saturations),
+        }
+        attributes.update({f"queue_wait_{key}": value for key, value in self.queue_wait.summary().items()})
+        return attributes
+
+    def as_dict(self):
+        """
+        Return all watchdog figures, used by the config entry diagnostics.
+
+        Returns:
+            dict: Loop and executor figures.
+        """
+        return {
+            "loop": {"recent_max_lag_ms": self.recent_max_lag_ms(), **self.loop_attributes()},
+            "executor": {"in_flight": self.in_flight_jobs(), **self.executor_attributes()},
+        }
@@ -0,0 +1,50 @@
+import logging
+
+from http import HTTPStatus
+
+from aiohttp import web  # type: ignore
+from homeassistant.components.http import HomeAssistantView  # type: ignore
+from homeassistant.core import HomeAssistant  # type: ignore
+
+from .const import DOMAIN
+from .prometheus import CONTENT_TYPE, render_metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HomeAIVisionMetricsView(HomeAssistantView):
+    """
+    HTTP view serving the HomeAIVision metrics in the Prometheus text format.
+
+    The view requires Home Assistant authentication, so Prometheus has to send
+    a long-lived access token as bearer token.
+    """
+
+    url = "/api/homeaivision/metrics"
+    name = "api:homeaivision:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant):
+        """
+        Initialize the HomeAIVisionMetricsView.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+        """
+        self.hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """
+        Return the current metrics.
+
+        Args:
+            request (web.Request): The scrape request.
+
+        Returns:
+            web.Response: The metrics, or 503 while the integration is not loaded.
+        """
+        data = self.hass.data.get(DOMAIN, {})
+        # info: Views cannot be unregistered, so the view outlives an unloaded config entry
+        if 'store' not in data:
+            return self.json_message("HomeAIVision is not loaded", HTTPStatus.SERVICE_UNAVAILABLE)
+        return web.Response(body=render_metrics(data).encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
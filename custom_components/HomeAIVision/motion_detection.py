@@ -0,0 +1,298 @@
+import io
+import time
+import logging
+import attr  # type: ignore
+
+from PIL import Image, ImageChops, ImageFilter
+from statistics import median
+
+from .blob_analysis import find_motion_blobs
+from .detection_zones import build_zone_mask
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Coarse-to-fine motion detection parameters
+COARSE_SIZE = (80, 80)              # info: Bounding box of the coarse thumbnail, 80x45 for 16:9 cameras
+COARSE_PIXEL_THRESHOLD = 25         # info: Lower than the full pass, downscaling averages small changes out
+COARSE_ESCALATION_RATIO = 0.5       # info: Escalate at half of the minimum dynamic threshold
+FULL_PIXEL_THRESHOLD = 50
+
+# NOTE: Dynamic threshold parameters
+MAD_MULTIPLIER = 2                  # info: Default median absolute deviations above the median that count as motion
+
+# NOTE: Share of the frame that has to change, per sensitivity level
+SENSITIVITY_PERCENTAGES = {
+    'low': 0.01,                    # info: 1%
+    'medium': 0.005,                # info: 0.5%
+    'high': 0.0025,                 # info: 0.25%
+}
+
+
+@attr.s
+class MotionFrame:
+    """Class representing a camera frame prepared for coarse-to-fine motion detection."""
+
+    image_data = attr.ib(type=bytes, repr=False)
+    size = attr.ib(type=tuple)
+    thumbnail = attr.ib(repr=False)
+    image = attr.ib(default=None, repr=False)
+    decode_time = attr.ib(type=float, default=0.0)     # info: Seconds spent decoding this frame so far
+
+    def get_image(self):
+        """
+        Return the full-resolution grayscale image, decoding it on first use.
+
+        Returns:
+            PIL.Image.Image: The decoded grayscale image.
+        """
+        if self.image is None:
+            start = time.monotonic()
+            self.image = Image.open(io.BytesIO(self.image_data)).convert('L')
+            self.decode_time += time.monotonic() - start
+        return self.image
+
+
+def calculate_scaled_thresholds(current_image, local_sensitivity_level):
+    """
+    Scale the motion thresholds to the resolution of the image.
+
+    Args:
+        current_image (PIL.Image.Image): The image used to determine the resolution.
+        local_sensitivity_level (str or float): 'low', 'medium' or 'high', or the
+            share of the frame directly (used by the offline tuner).
+
+    Returns:
+        tuple: (motion_detection_min_area, min_dynamic_threshold, max_dynamic_threshold)
+    """
+    width, height = current_image.size
+    total_pixels = width * height
+
+    if isinstance(local_sensitivity_level, (int, float)):
+        motion_threshold_percentage = float(local_sensitivity_level)
+    else:
+        # info: Unknown levels fall back to medium
+        motion_threshold_percentage = SENSITIVITY_PERCENTAGES.get(local_sensitivity_level, SENSITIVITY_PERCENTAGES['medium'])
+
+    motion_detection_min_area = motion_threshold_percentage * total_pixels
+    min_dynamic_threshold = 0.5 * motion_detection_min_area
+    max_dynamic_threshold = 2 * motion_detection_min_area
+
+    _LOGGER.debug(f"Resolution: {width}x{height}, total pixels: {total_pixels}")
+    _LOGGER.debug(f"Motion detection min area: {motion_detection_min_area}, min dynamic threshold: {min_dynamic_threshold}, max dynamic threshold: {max_dynamic_threshold}")
+    return motion_detection_min_area, min_dynamic_threshold, max_dynamic_threshold
+
+
+def calculate_dynamic_threshold(
+    motion_history,
+    motion_detection_min_area,
+    min_dynamic_threshold,
+    max_dynamic_threshold,
+    mad_multiplier=MAD_MULTIPLIER,
+):
+    """
+    Calculate the motion threshold from the recent motion scores.
+
+    The threshold is the median of the history plus mad_multiplier median
+    absolute deviations, clamped to the dynamic threshold range. With fewer than
+    two scores the minimum motion area is used.
+
+    Args:
+        motion_history (list): Recent motion scores without an object present.
+        motion_detection_min_area (float): Fallback threshold.
+        min_dynamic_threshold (float): Lower bound of the threshold.
+        max_dynamic_threshold (float): Upper bound of the threshold.
+        mad_multiplier (float): Number of median absolute deviations above the median.
+
+    Returns:
+        float: The dynamic motion threshold.
+    """
+    if len(motion_history) < 2:
+        return motion_detection_min_area
+    med_motion = median(motion_history)
+    mad_motion = median([abs(m - med_motion) for m in motion_history])
+    dynamic_threshold = med_motion + mad_multiplier * mad_motion
+    return max(min_dynamic_threshold, min(dynamic_threshold, max_dynamic_threshold))
+
+
+def calculate_blob_thresholds(current_image, min_blob_area_percentage, max_blob_area_percentage):
+    """
+    Scale the configured blob size range to the resolution of the image.
+
+    Args:
+        current_image (PIL.Image.Image): The image used to determine the resolution.
+        min_blob_area_percentage (float): Minimum blob size as a percentage of the frame.
+        max_blob_area_percentage (float): Maximum blob size as a percentage of the frame.
+
+    Returns:
+        tuple: (min_blob_area, max_blob_area) in pixels.
+    """
+    width, height = current_image.size
+    total_pixels = width * height
+
+    min_blob_area = min_blob_area_percentage / 100 * total_pixels
+    max_blob_area = max_blob_area_percentage / 100 * total_pixels
+
+    _LOGGER.debug(f"Blob area range: {min_blob_area}-{max_blob_area} pixels")
+    return min_blob_area, max_blob_area
+
+
+def calculate_coarse_threshold(current_image, min_dynamic_threshold):
+    """
+    Convert the minimum dynamic threshold into a changed-pixel ratio for the coarse pass.
+
+    Args:
+        current_image (PIL.Image.Image): The image used to determine the resolution.
+        min_dynamic_threshold (float): Lower bound of the dynamic motion threshold in pixels.
+
+    Returns:
+        float: Ratio of changed coarse pixels above which the full pass runs.
+    """
+    width, height = current_image.size
+    return COARSE_ESCALATION_RATIO * min_dynamic_threshold / (width * height)
+
+
+def create_motion_frame(image_data):
+    """
+    Decode a frame at both the coarse and the full resolution.
+
+    Args:
+        image_data (bytes): The raw image data.
+
+    Returns:
+        MotionFrame: The frame with its thumbnail and full image decoded.
+    """
+    frame = decode_motion_frame(image_data)
+    frame.get_image()
+    return frame
+
+
+def decode_motion_frame(image_data):
+    """
+    Decode only the coarse thumbnail of a frame.
+
+    For JPEG frames the decoder is put into draft mode, so the thumbnail is
+    produced by DCT scaling at a fraction of the cost of a full decode.
+
+    Args:
+        image_data (bytes): The raw image data.
+
+    Returns:
+        MotionFrame: The frame with its thumbnail decoded.
+    """
+    start = time.monotonic()
+    image = Image.open(io.BytesIO(image_data))
+    size = image.size
+    image.draft('L', COARSE_SIZE)
+    thumbnail = image.convert('L')
+    thumbnail.thumbnail(COARSE_SIZE, Image.Resampling.BILINEAR)
+    return MotionFrame(image_data=image_data, size=size, thumbnail=thumbnail, decode_time=time.monotonic() - start)
+
+
+def masked_difference(reference_image, current_image, detection_zones_key):
+    """
+    Calculate the absolute difference of two images limited to the detection zones.
+
+    Args:
+        reference_image (PIL.Image.Image): The reference image.
+        current_image (PIL.Image.Image): The current image.
+        detection_zones_key (tuple): Zone description returned by zones_key.
+
+    Returns:
+        tuple: (diff_image, offset) where offset is the (x, y) position of the
+            diff within the frame, or (None, None) if the zones cover nothing.
+    """
+    if not detection_zones_key:
+        return ImageChops.difference(reference_image, current_image), (0, 0)
+
+    crop_box, zone_mask = build_zone_mask(detection_zones_key, current_image.size)
+    if crop_box is None:
+        return None, None
+    diff_image = ImageChops.difference(reference_image.crop(crop_box), current_image.crop(crop_box))
+    return ImageChops.darker(diff_image, zone_mask), crop_box[:2]
+
+
+def coarse_change_ratio(reference_thumbnail, current_thumbnail, detection_zones_key):
+    """
+    Calculate the share of changed pixels between two coarse thumbnails.
+
+    Args:
+        reference_thumbnail (PIL.Image.Image): Thumbnail of the reference frame.
+        current_thumbnail (PIL.Image.Image): Thumbnail of the current frame.
+        detection_zones_key (tuple): Zone description returned by zones_key.
+
+    Returns:
+        float or None: The changed-pixel ratio, None if the zones cover nothing.
+    """
+    coarse_diff, _ = masked_difference(reference_thumbnail, current_thumbnail, detection_zones_key)
+    if coarse_diff is None:
+        return None
+    width, height = current_thumbnail.size
+    changed = sum(coarse_diff.histogram()[COARSE_PIXEL_THRESHOLD + 1:])
+    return changed / (width * height)
+
+
+def estimate_motion_score(coarse_ratio, frame_size):
+    """Estimate the full-resolution motion score from the coarse changed-pixel ratio."""
+    frame_width, frame_height = frame_size
+    return round(coarse_ratio * frame_width * frame_height)
+
+
+def full_motion(reference_image, current_image, detection_zones_key):
+    """
+    Run the full-resolution diff, morphology and blob stage.
+
+    Args:
+        reference_image (PIL.Image.Image): The decoded reference image.
+        current_image (PIL.Image.Image): The decoded current image.
+        detection_zones_key (tuple): Zone description returned by zones_key.
+
+    Returns:
+        tuple: (motion_score, blobs)
+    """
+    diff_image, offset = masked_difference(reference_image, current_image, detection_zones_key)
+    if diff_image is None:
+        return 0, []
+
+    threshold = diff_image.point(lambda p: p > FULL_PIXEL_THRESHOLD and 255)
+    cleaned = threshold.filter(ImageFilter.MaxFilter(5)).filter(ImageFilter.MinFilter(5))
+    motion_score = sum(cleaned.histogram()[255:])
+    blobs = find_motion_blobs(cleaned) if motion_score else []
+    for blob in blobs:
+        blob.x += offset[0]
+        blob.y += offset[1]
+    return motion_score, blobs
+
+
+def process_image(image_data, reference_frame, detection_zones_key=(), coarse_threshold=None):
+    """
+    Process the image, calculate motion score and label the motion blobs.
+
+    The frame is first compared with the reference at the coarse thumbnail
+    resolution. Only when the share of changed coarse pixels reaches
+    coarse_threshold is the frame fully decoded and passed through the
+    full-resolution diff, morphology and blob stage. When detection zones are
+    configured, only the bounding box of the active area is diffed and the cached
+    zone bitmask is applied before thresholding.
+
+    Args:
+        image_data (bytes): The raw image data.
+        reference_frame (MotionFrame): The reference frame for motion detection.
+        detection_zones_key (tuple): Zone description returned by zones_key.
+        coarse_threshold (float, optional): Changed-pixel ratio needed to escalate,
+            None to always run the full-resolution pass.
+
+    Returns:
+        tuple: (motion_score, current_frame, blobs)
+    """
+    current_frame = decode_motion_frame(image_data)
+
+    if coarse_threshold is not None and current_frame.thumbnail.size == reference_frame.thumbnail.size:
+        coarse_ratio = coarse_change_ratio(reference_frame.thumbnail, current_frame.thumbnail, detection_zones_key)
+        if coarse_ratio is None:
+            return 0, current_frame, []
+        if coarse_ratio < coarse_threshold:
+            # info: Estimate the full-resolution score, so the motion history stays comparable
+            return estimate_motion_score(coarse_ratio, current_frame.size), current_frame, []
+
+    motion_score, blobs = full_motion(reference_frame.get_image(), current_frame.get_image(), detection_zones_key)
+    return motion_score, current_frame, blobs
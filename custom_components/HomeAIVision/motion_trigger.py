@@ -0,0 +1,109 @@
+import time
+import logging
+
+from homeassistant.const import STATE_ON, STATE_UNAVAILABLE, STATE_UNKNOWN  # type: ignore
+from homeassistant.core import HomeAssistant, Event, callback  # type: ignore
+from homeassistant.helpers.event import async_track_state_change_event  # type: ignore
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Event-driven triggering parameters
+TRIGGER_BURST_INTERVAL = 1.0        # info: Seconds between two frames of a burst
+
+
+class MotionTrigger:
+    """
+    Drives the polling of a camera from a Home Assistant motion sensor.
+
+    While the sensor reports motion, and for the burst duration after it stops,
+    the camera is polled every TRIGGER_BURST_INTERVAL seconds. Otherwise it is
+    polled at the idle interval, or not at all. A sensor that is unavailable
+    does not tell anything, so the camera falls back to its regular interval.
+    """
+
+    def __init__(self, hass: HomeAssistant, entity_id, burst_duration, wake, clock=time.monotonic):
+        """
+        Initialize the MotionTrigger.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            entity_id (str): The motion binary_sensor.
+            burst_duration (int): Seconds the burst continues after the motion started or stopped.
+            wake (callable): Wakes the camera task, so the burst starts without waiting for the interval.
+            clock (callable): Monotonic clock, replaceable for offline tools.
+        """
+        self.hass = hass
+        self.entity_id = entity_id
+        self.burst_duration = burst_duration
+        self._wake = wake
+        self._clock = clock
+        self._motion = False
+        self._available = False
+        self._burst_until = 0.0
+        self._unsubscribe = None
+        self.triggers = 0
+
+    @callback
+    def async_start(self):
+        """Subscribe to the sensor and take over its current state."""
+        self._apply_state(self.hass.states.get(self.entity_id))
+        self._unsubscribe = async_track_state_change_event(
+            self.hass, [self.entity_id], self._handle_state_change
+        )
+        _LOGGER.debug(f"[HomeAIVision] Camera polling triggered by {self.entity_id}")
+
+    @callback
+    def async_stop(self):
+        """Unsubscribe from the sensor."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def _handle_state_change(self, event: Event):
+        """Handle a state change of the sensor."""
+        self._apply_state(event.data.get("new_state"))
+
+    def _apply_state(self, state):
+        """
+        Start or extend the burst from a state of the sensor.
+
+        Args:
+            state (State or None): The new state, None if the entity does not exist.
+        """
+        self._available = state is not None and state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+        motion = self._available and state.state == STATE_ON
+        if motion != self._motion:
+            # info: The burst covers short pulses of the sensor and the moments after the motion stopped
+            self._burst_until = self._clock() + self.burst_duration
+        if motion and not self._motion:
+            self.triggers += 1
+            _LOGGER.debug(f"[HomeAIVision] Motion reported by {self.entity_id}, starting a burst")
+            self._wake()
+        self._motion = motion
+
+    def is_bursting(self):
+        """
+        Check whether the camera is in a burst.
+
+        Returns:
+            bool: True while the sensor reports motion or the burst has not expired.
+        """
+        return self._motion or self._clock() < self._burst_until
+
+    def next_interval(self, idle_interval, fallback_interval):
+        """
+        Return the wait before the next frame.
+
+        Args:
+            idle_interval (int): Seconds between two frames without motion, 0 to wait for a trigger.
+            fallback_interval (int): Seconds between two frames while the sensor is unavailable.
+
+        Returns:
+            float or None: Seconds to wait, None to wait for a trigger.
+        """
+        if self.is_bursting():
+            return min(TRIGGER_BURST_INTERVAL, fallback_interval)
+        if not self._available:
+            return fallback_interval
+        return idle_interval or None
@@ -1,68 +1,365 @@
 import json
 import os
+import time
+import asyncio
 import logging
-import aiofiles # type: ignore
 
+from homeassistant.core import callback  # type: ignore
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE  # type: ignore
 from homeassistant.helpers.network import get_url # type: ignore
+from homeassistant.helpers.dispatcher import async_dispatcher_send  # type: ignore
+
+from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
-async def send_notification(hass, to_detect_object, image_path=None, notification_language='en'):
+DEFAULT_LANGUAGE = 'en'
+DEFAULT_MESSAGE = "Default message"
+
+# NOTE: Notification dispatcher parameters
+NOTIFICATION_QUEUE_SIZE = 100
+NOTIFICATION_DIGEST_WINDOW = 2.0    # info: Seconds to wait for detections from other cameras before sending
+NOTIFICATIONS_UPDATE_SIGNAL = f"{DOMAIN}_notifications_update"
+
+
+def load_all_translations():
     """
-    Send a notification message via Home Assistant with an optional image attachment.
+    Load every translation file of the integration.
 
-    Args:
-        hass: The Home Assistant instance.
-        to_detect_object (str): The object that was detected.
-        image_path (str, optional): The path to the image within the `www` directory.
-        notification_language (str, optional): The language for the notification.
+    This function does blocking file I/O and must run in the executor.
+
+    Returns:
+        dict: Notification messages keyed by language code.
+    """
+    translations_dir = os.path.join(os.path.dirname(__file__), 'translations')
+    translations = {}
+    for file_name in sorted(os.listdir(translations_dir)):
+        language, extension = os.path.splitext(file_name)
+        if extension != '.json':
+            continue
+        try:
+            with open(os.path.join(translations_dir, file_name), 'r', encoding='utf-8') as file:
+                translations[language] = json.load(file).get("message", {})
+        except Exception as e:
+            _LOGGER.error(f"[HomeAIVision] Error loading translation file {file_name}: {e}")
+    return translations
+
+
+class NotificationRenderer:
     """
-    try:
-        message_key = f"{to_detect_object}_detected"
+    Class rendering notification payloads without file I/O.
+
+    All translation files are read once at setup. Messages for the active
+    language and the Home Assistant base URL are cached and only rebuilt when
+    the language or the core configuration changes.
+    """
+
+    def __init__(self, hass, store):
+        """
+        Initialize the NotificationRenderer.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            store (HomeAIVisionStore): The store providing the notification language.
+        """
+        self.hass = hass
+        self.store = store
+        self._translations = {}
+        self._language = None
+        self._messages = {}
+        self._base_url = None
+        self._unsub_config_update = None
+
+    async def async_load(self):
+        """Load all translations and start listening for language and URL changes."""
+        self._translations = await self.hass.async_add_executor_job(load_all_translations)
+        _LOGGER.debug(f"[HomeAIVision] Loaded notification translations: {list(self._translations)}")
+        self._render_language(self.store.get_language())
+        self.store.add_listener(self._handle_store_update)
+        self._unsub_config_update = self.hass.bus.async_listen(
+            EVENT_CORE_CONFIG_UPDATE, self._handle_config_update
+        )
+
+    def async_unload(self):
+        """Stop listening for core configuration changes."""
+        if self._unsub_config_update:
+            self._unsub_config_update()
+            self._unsub_config_update = None
+
+    def _render_language(self, language):
+        """Pre-render the messages of the given language, falling back to English."""
+        if language not in self._translations:
+            _LOGGER.warning(f"[HomeAIVision] Translation file for {language} not found. Falling back to English.")
+        self._language = language
+        self._messages = self._translations.get(language) or self._translations.get(DEFAULT_LANGUAGE, {})
+
+    @callback
+    def _handle_store_update(self):
+        """Invalidate the cached messages when the notification language changes."""
+        language = self.store.get_language()
+        if language != self._language:
+            _LOGGER.debug(f"[HomeAIVision] Notification language changed to {language}, re-rendering messages")
+            self._render_language(language)
+
+    @callback
+    def _handle_config_update(self, event):
+        """Invalidate the cached base URL when the core configuration changes."""
+        self._base_url = None
+
+    def get_base_url(self):
+        """
+        Return the cached internal base URL of Home Assistant.
+
+        Returns:
+            str: The base URL used for image attachments.
+        """
+        if self._base_url is None:
+            self._base_url = get_url(self.hass, prefer_external=False, allow_internal=True)
+            _LOGGER.debug(f"[HomeAIVision] Base URL for notification: {self._base_url}")
+        return self._base_url
+
+    def get_message(self, message_key, language=None):
+        """
+        Return the translated message for a key.
+
+        Args:
+            message_key (str): The message key, e.g. 'person_detected'.
+            language (str, optional): Language code, defaults to the active language.
+
+        Returns:
+            str: The translated message.
+        """
+        if language is None or language == self._language:
+            messages = self._messages
+        else:
+            messages = self._translations.get(language) or self._translations.get(DEFAULT_LANGUAGE, {})
+        message = messages.get(message_key)
+        if message is None:
+            _LOGGER.warning(f"[HomeAIVision] No translation found for {message_key} in {language or self._language}, using default message")
+            message = DEFAULT_MESSAGE
+        return message
+
+    def get_local_url(self, image_path):
+        """
+        Return the URL of a file within the `www` directory.
+
+        Args:
+            image_path (str): The path to the file within the `www` directory.
 
-        base_url = get_url(hass, prefer_external=False, allow_internal=True)
-        _LOGGER.debug(f"[HomeAIVision] Base URL for notification: {base_url}")
-        message = await get_translated_message(notification_language, message_key)
+        Returns:
+            str: The /local URL of the file.
+        """
+        corrected_image_path = image_path.lstrip('/').replace('www/', '', 1)
+        return f"{self.get_base_url()}/local/{corrected_image_path}"
 
-        data = {"message": message}
+    def render(self, to_detect_object, image_path=None, language=None, full_image_path=None):
+        """
+        Build the notify service payload.
+
+        Args:
+            to_detect_object (str): The object that was detected.
+            image_path (str, optional): The path to the attached image within the `www` directory.
+            language (str, optional): Language code, defaults to the active language.
+            full_image_path (str, optional): The path to the full image opened on tap, when a thumbnail is attached.
+
+        Returns:
+            dict: Data for the notify service call.
+        """
+        data = {"message": self.get_message(f"{to_detect_object}_detected", language)}
         if image_path:
-            corrected_image_path = image_path.lstrip('/').replace('www/', '', 1)
-            image_url = f"{base_url}/local/{corrected_image_path}"
-            _LOGGER.debug(f"[HomeAIVision] Full image URL for notification: {image_url}")
+            image_url = self.get_local_url(image_path)
+            _LOGGER.debug(f"[HomeAIVision] Image URL for notification: {image_url}")
+            # info: The content type follows the file, thumbnails may be WebP
+            content_type = os.path.splitext(image_path)[1].lstrip('.').lower().replace('jpg', 'jpeg')
             data["data"] = {
                 "attachment": {
-                    "content-type": "jpeg",
+                    "content-type": content_type,
                     "url": image_url
                 }
             }
+            if full_image_path and full_image_path != image_path:
+                full_image_url = self.get_local_url(full_image_path)
+                # NOTE: iOS opens `url` and Android opens `clickAction` when the notification is tapped
+                data["data"]["url"] = full_image_url
+                data["data"]["clickAction"] = full_image_url
+        return data
+
+    def render_digest(self, notifications):
+        """
+        Build one notify service payload for detections from several cameras.
+
+        Args:
+            notifications (list): Queued notification dicts.
+
+        Returns:
+            dict: Data for the notify service call.
+        """
+        if len(notifications) == 1:
+            notification = notifications[0]
+            return self.render(
+                notification['to_detect_object'], notification['image_path'], full_image_path=notification.get('full_image_path')
+            )
+
+        # info: One line per detected object, listing the cameras that saw it
+        cameras_by_object = {}
+        for notification in notifications:
+            cameras = cameras_by_object.setdefault(notification['to_detect_object'], [])
+            if notification['device_name'] not in cameras:
+                cameras.append(notification['device_name'])
+        lines = [
+            f"{self.get_message(f'{to_detect_object}_detected')} ({', '.join(cameras)})"
+            for to_detect_object, cameras in cameras_by_object.items()
+        ]
+
+        with_image = next((n for n in notifications if n['image_path']), {})
+        data = self.render(
+            notifications[0]['to_detect_object'], with_image.get('image_path'), full_image_path=with_image.get('full_image_path')
+        )
+        data["message"] = "\n".join(lines)
+        return data
+
+
+class NotificationDispatcher:
+    """
+    Class delivering notifications from a background queue.
+
+    Camera tasks only enqueue notifications, so a slow push provider never
+    delays the next frame. Repeated notifications for the same device and
+    object within the device cooldown are dropped, and detections queued
+    within NOTIFICATION_DIGEST_WINDOW are merged into one digest message.
+    """
+
+    def __init__(self, hass, renderer):
+        """
+        Initialize the NotificationDispatcher.
+
+        Args:
+            hass (HomeAssistant): The Home Assistant instance.
+            renderer (NotificationRenderer): Renderer building the payloads.
+        """
+        self.hass = hass
+        self.renderer = renderer
+        self._queue = asyncio.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self._last_sent = {}
+        self._task = None
+        self.sent_count = 0
+        self.merged_count = 0
+        self.dropped_count = 0
 
-        await hass.services.async_call("notify", "notify", data, blocking=True)
-    except Exception as e:
-        _LOGGER.error(f"Failed to send notification: {e}")
+    def start(self):
+        """Start the background worker."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_worker(), "homeaivision_notification_dispatcher"
+            )
 
-async def load_translations(language):
-    base_dir = os.path.dirname(__file__)
-    translations_path = os.path.join(base_dir, 'translations', f'{language}.json')
-    default_translations_path = os.path.join(base_dir, 'translations', 'en.json')
+    async def async_stop(self):
+        """Stop the background worker, dropping queued notifications."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
 
-    if not os.path.exists(translations_path):
-        _LOGGER.warning(f"[HomeAIVision] Translation file for {language} not found. Falling back to English.")
-        translations_path = default_translations_path
+    def get_stats(self):
+        """
+        Retrieve the dispatcher counters.
 
-    try:
-        async with aiofiles.open(translations_path, 'r', encoding='utf-8') as file:
-            content = await file.read()
-            return json.loads(content)
-    except Exception as e:
-        _LOGGER.error(f"[HomeAIVision] Error loading translation file: {e}")
-        return {}
+        Returns:
+            dict: Sent, merged, dropped and queued notification counts.
+        """
+        return {
+            'sent': self.sent_count,
+            'merged': self.merged_count,
+            'dropped': self.dropped_count,
+            'queued': self._queue.qsize(),
+        }
 
-async def get_translated_message(language, message_key):
-    translations = await load_translations(language)
-    message = translations.get("message", {}).get(message_key)
+    @callback
+    def enqueue(self, device_id, device_name, to_detect_object, image_path=None, cooldown=0, full_image_path=None):
+        """
+        Queue a notification without waiting for its delivery.
 
-    if message is None:
-        _LOGGER.warning(f"[HomeAIVision] No translation found for {message_key} in {language}, using default message")
-        message = "Default message"
+        Args:
+            device_id (str): The device that made the detection.
+            device_name (str): The name of the device, used in digests.
+            to_detect_object (str): The object that was detected.
+            image_path (str, optional): The path to the attached image within the `www` directory.
+            cooldown (float): Seconds during which repeats for this device and object are dropped.
+            full_image_path (str, optional): The path to the full image opened on tap.
 
-    return message
+        Returns:
+            bool: True if the notification was queued.
+        """
+        now = time.monotonic()
+        key = (device_id, to_detect_object)
+        last_sent = self._last_sent.get(key)
+        if cooldown and last_sent is not None and now - last_sent < cooldown:
+            _LOGGER.debug(f"[HomeAIVision] Dropping {to_detect_object} notification for {device_id}, cooldown active")
+            self._count('dropped')
+            return False
+
+        try:
+            self._queue.put_nowait({
+                'device_id': device_id,
+                'device_name': device_name,
+                'to_detect_object': to_detect_object,
+                'image_path': image_path,
+                'full_image_path': full_image_path,
+            })
+        except asyncio.QueueFull:
+            _LOGGER.warning(f"[HomeAIVision] Notification queue full, dropping {to_detect_object} notification for {device_id}")
+            self._count('dropped')
+            return False
+        self._last_sent[key] = now
+        return True
+
+    def _count(self, counter, amount=1):
+        """Increase a counter and notify the statistics entity."""
+        setattr(self, f"{counter}_count", getattr(self, f"{counter}_count") + amount)
+        async_dispatcher_send(self.hass, NOTIFICATIONS_UPDATE_SIGNAL)
+
+    async def _async_worker(self):
+        """Collect queued notifications into digests and deliver them."""
+        while True:
+            notifications = [await self._queue.get()]
+            loop_time = self.hass.loop.time
+            deadline = loop_time() + NOTIFICATION_DIGEST_WINDOW
+            while (remaining := deadline - loop_time()) > 0:
+                try:
+                    notifications.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            if len(notifications) > 1:
+                _LOGGER.debug(f"[HomeAIVision] Merging {len(notifications)} notifications into one digest")
+                self._count('merged', len(notifications) - 1)
+            try:
+                data = self.renderer.render_digest(notifications)
+                await self.hass.services.async_call("notify", "notify", data, blocking=True)
+                self._count('sent')
+            except Exception as e:
+                _LOGGER.error(f"Failed to send notification: {e}")
+
+
+@callback
+def send_notification(hass, device_id, device_name, to_detect_object, image_path=None, cooldown=0, full_image_path=None):
+    """
+    Queue a notification message with an optional image attachment.
+
+    The message is delivered in the background by the NotificationDispatcher
+    in the language configured for the integration.
+
+    Args:
+        hass: The Home Assistant instance.
+        device_id (str): The device that made the detection.
+        device_name (str): The name of the device, used in digests.
+        to_detect_object (str): The object that was detected.
+        image_path (str, optional): The path to the attached image within the `www` directory, e.g. a thumbnail.
+        cooldown (float): Seconds during which repeats for this device and object are dropped.
+        full_image_path (str, optional): The path to the full image opened on tap.
+    """
+    dispatcher: NotificationDispatcher = hass.data[DOMAIN]['notification_dispatcher']
+    dispatcher.enqueue(device_id, device_name, to_detect_object, image_path, cooldown, full_image_path)
@@ -5,7 +5,12 @@ from homeassistant.core import HomeAssistant  # type: ignore
 
 from .const import DOMAIN
 from .store import HomeAIVisionStore
-from .entities import ConfidenceThresholdEntity, MotionDetectionIntervalEntity
+from .entities import (
+    ConfidenceThresholdEntity,
+    MotionDetectionIntervalEntity,
+    GlobalAzureRequestBudgetEntity,
+    GlobalCameraStartConcurrencyEntity,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,7 +20,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     Set up number entities for the HomeAIVision integration from a config entry.
     
     This function initializes and adds number entities related to the detection confidence threshold
-    for each configured device in the HomeAIVision integration.
+    for each configured device in the HomeAIVision integration, the global Azure request budget and
+    the camera start concurrency.
 
     Args:
         hass (HomeAssistant): The Home Assistant instance.
@@ -26,6 +32,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     devices = store.get_devices()
 
     entities = []
+    # NOTE: Initialize the global Azure request budget and camera start concurrency entities once
+    entities.append(GlobalAzureRequestBudgetEntity(hass))
+    entities.append(GlobalCameraStartConcurrencyEntity(hass))
+
     for device_data in devices.values():
         device_config = device_data.asdict()
         _LOGGER.debug(f"[HomeAIVision] Setting up number entities for device: {device_config}")
@@ -0,0 +1,283 @@
+import math
+import time
+import bisect
+import logging
+
+from collections import deque
+from contextlib import contextmanager
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Stages of the detection pipeline
+STAGE_FETCH = "fetch"           # info: Camera request until the image bytes are read
+STAGE_FETCH_MAIN = "fetch_main" # info: Main-stream request of a dual-stream camera before an Azure call
+STAGE_DECODE = "decode"         # info: JPEG decode of the thumbnail and, when needed, the full frame
+STAGE_PROCESS = "process"       # info: Executor job of process_image without the decode time
+STAGE_AZURE = "azure"           # info: Azure round trip
+STAGE_SAVE = "save"             # info: save_image
+STAGE_NOTIFY = "notify"         # info: Queueing the notification
+STAGE_SUMMARY = "summary"       # info: Clip and contact sheet of an event group, in the background
+STAGE_FRAME = "frame"           # info: Whole loop iteration, without the wait for the next interval
+STAGES = (STAGE_FETCH, STAGE_FETCH_MAIN, STAGE_DECODE, STAGE_PROCESS, STAGE_AZURE, STAGE_SAVE, STAGE_NOTIFY, STAGE_SUMMARY, STAGE_FRAME)
+
+# NOTE: Fixed upper bounds of the histogram buckets in seconds, the last bucket is unbounded
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PERCENTILES = (50, 95, 99)
+SUMMARY_KEYS = ("count", "mean_ms", "max_ms") + tuple(f"p{percent}_ms" for percent in PERCENTILES)
+FPS_WINDOW_SIZE = 20            # info: Number of recent frames used for the effective FPS
+
+# NOTE: The stage summaries change with every frame, so the recorder only keeps the frame counters
+UNRECORDED_ATTRIBUTES = frozenset(f"{stage}_{key}" for stage in STAGES for key in SUMMARY_KEYS)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Recording a value is a binary search and one increment, so the histogram can
+    be updated on every frame. Percentiles are estimated by linear interpolation
+    within the bucket that contains the requested rank.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """
+        Initialize the LatencyHistogram.
+
+        Args:
+            buckets (tuple): Sorted upper bounds of the buckets in seconds.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        """
+        Record a duration.
+
+        Args:
+            seconds (float): The measured duration.
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, float(seconds))
+
+    def percentile(self, percent):
+        """
+        Estimate a percentile of the recorded durations.
+
+        Args:
+            percent (float): The percentile (0 - 100).
+
+        Returns:
+            float or None: The estimated duration in seconds, None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                # info: Values in the unbounded bucket are capped by the largest recorded value
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - cumulative) / bucket_count)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self):
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            dict: Count, mean, max and the configured percentiles.
+        """
+        summary = {
+            "count": self.count,
+            "mean_ms": round(1000 * self.sum / self.count, 1) if self.count else None,
+            "max_ms": round(1000 * self.max, 1),
+        }
+        for percent in PERCENTILES:
+            value = self.percentile(percent)
+            summary[f"p{percent}_ms"] = round(1000 * value, 1) if value is not None else None
+        return summary
+
+
+class PipelineMetrics:
+    """Class collecting per-stage latencies, frame counters and gauges of one camera."""
+
+    def __init__(self):
+        """Initialize the PipelineMetrics."""
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.full_resolution_passes = 0     # info: Frames the coarse pass escalated to the full-resolution decode
+        self.azure_requests = 0
+        self.azure_detections = 0
+        self.motion_score = None            # info: Motion score of the latest processed frame
+        self.dynamic_threshold = None       # info: Dynamic threshold the latest motion score was compared with
+        self.storage_images = None          # info: Saved images of the device, seeded by the retention pass and updated as images change
+        self.storage_bytes = None
+        self.polling_interval = None        # info: Wait before the next frame, None while waiting for a pushed frame or a trigger
+        self._frame_times = deque(maxlen=FPS_WINDOW_SIZE)
+
+    def reset(self):
+        """Clear all latencies and counters. The storage usage is kept."""
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.full_resolution_passes = 0
+        self.azure_requests = 0
+        self.azure_detections = 0
+        self._frame_times.clear()
+
+    def observe(self, stage, seconds):
+        """
+        Record the duration of a pipeline stage.
+
+        Args:
+            stage (str): One of STAGES.
+            seconds (float): The measured duration.
+        """
+        self.histograms[stage].observe(seconds)
+
+    @contextmanager
+    def span(self, stage):
+        """
+        Measure the enclosed block with the monotonic clock.
+
+        Args:
+            stage (str): One of STAGES.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.monotonic() - start)
+
+    def record_frame(self, seconds):
+        """
+        Record a processed frame.
+
+        Args:
+            seconds (float): Duration of the whole loop iteration.
+        """
+        self.frames_processed += 1
+        self._frame_times.append(time.monotonic())
+        self.observe(STAGE_FRAME, seconds)
+
+    def record_dropped_frame(self):
+        """Record a frame that could not be fetched or processed."""
+        self.frames_dropped += 1
+
+    def record_motion(self, motion_score, dynamic_threshold, full_resolution):
+        """
+        Record the motion analysis of a processed frame.
+
+        Args:
+            motion_score (float): Motion score of the frame.
+            dynamic_threshold (float or None): Threshold the score was compared with, None while an object is present.
+            full_resolution (bool): True if the frame needed the full-resolution decode.
+        """
+        self.motion_score = motion_score
+        if dynamic_threshold is not None:
+            self.dynamic_threshold = dynamic_threshold
+        self.full_resolution_passes += full_resolution
+
+    def record_azure_result(self, detected):
+        """
+        Record an Azure request.
+
+        Args:
+            detected (bool): True if Azure detected a target object.
+        """
+        self.azure_requests += 1
+        self.azure_detections += bool(detected)
+
+    def record_storage(self, images, size):
+        """
+        Record the storage used by the saved images of the device.
+
+        Args:
+            images (int): Number of saved images.
+            size (int): Their total size in bytes.
+        """
+        self.storage_images = images
+        self.storage_bytes = size
+
+    def adjust_storage(self, images, size):
+        """
+        Apply a change of the storage used by the saved images of the device.
+
+        Changes before the first record_storage are dropped, the scan seeding
+        the figures includes them.
+
+        Args:
+            images (int): Change of the number of saved images.
+            size (int): Change of their total size in bytes.
+        """
+        if self.storage_images is None:
+            return
+        self.storage_images = max(0, self.storage_images + images)
+        self.storage_bytes = max(0, self.storage_bytes + size)
+
+    def record_interval(self, seconds):
+        """
+        Record the wait before the next frame.
+
+        Args:
+            seconds (float or None): The wait in seconds, None if the camera waits for a pushed frame or a trigger.
+        """
+        self.polling_interval = seconds
+
+    def effective_fps(self):
+        """
+        Return the rate of processed frames over the recent window.
+
+        Returns:
+            float: Frames per second, 0.0 with fewer than two frames.
+        """
+        if len(self._frame_times) < 2:
+            return 0.0
+        elapsed = time.monotonic() - self._frame_times[0]
+        return round((len(self._frame_times) - 1) / elapsed, 3) if elapsed > 0 else 0.0
+
+    def as_attributes(self):
+        """
+        Flatten the metrics into state attributes.
+
+        Returns:
+            dict: Frame counters, effective FPS and percentiles of every recorded stage.
+        """
+        attributes = {
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "effective_fps": self.effective_fps(),
+            "polling_interval": self.polling_interval,
+        }
+        for stage, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            for key, value in histogram.summary().items():
+                attributes[f"{stage}_{key}"] = value
+        return attributes
+
+
+def get_pipeline_metrics(hass, device_id):
+    """
+    Return the metrics of a device, creating them on first use.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device_id (str): The ID of the device.
+
+    Returns:
+        PipelineMetrics: The metrics of the device.
+    """
+    return hass.data[DOMAIN].setdefault('pipeline_metrics', {}).setdefault(device_id, PipelineMetrics())
@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import tracemalloc
+
+from collections import Counter
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Profiling session parameters
+SAMPLE_INTERVAL = 0.01              # info: Seconds between stack samples of all threads
+TRACEMALLOC_FRAMES = 10             # info: Frames kept per allocation, so allocations in PIL or aiohttp can be traced back to the integration
+PROFILE_DIRECTORY = "homeaivision_profiles"
+
+COMPONENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_component_file(filename):
+    """Check if a source file belongs to the integration."""
+    return filename.startswith(COMPONENT_DIR)
+
+
+def short_filename(filename):
+    """Shorten an integration path to its file name, other paths are kept as they are."""
+    return os.path.relpath(filename, COMPONENT_DIR) if is_component_file(filename) else filename
+
+
+class StackSampler:
+    """
+    Sampling profiler limited to the integration.
+
+    A background thread samples the stacks of all threads. Only stacks that pass
+    through an integration source file are counted, so both coroutines running
+    on the event loop and executor jobs started by the integration are covered,
+    while the rest of Home Assistant is ignored.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        """
+        Initialize the StackSampler.
+
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.interval = interval
+        self.samples = 0
+        self.cumulative = Counter()     # info: Samples in which a function was anywhere on the stack
+        self.own = Counter()            # info: Samples in which a function was the innermost integration frame
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="homeaivision_profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the thread. This call blocks and must run in the executor."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        """Sample all threads until stopped."""
+        own_thread_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_thread_id:
+                    self._sample(frame)
+
+    def _sample(self, frame):
+        """Count the integration functions on one stack."""
+        functions = []
+        while frame is not None:
+            code = frame.f_code
+            if is_component_file(code.co_filename):
+                functions.append((code.co_filename, code.co_firstlineno, code.co_name))
+            frame = frame.f_back
+        if not functions:
+            return
+        self.samples += 1
+        self.own[functions[0]] += 1
+        # info: Recursive functions are counted once per sample
+        self.cumulative.update(set(functions))
+
+    def top_functions(self, limit):
+        """
+        Return the functions with the highest cumulative time.
+
+        Args:
+            limit (int): Number of functions to return.
+
+        Returns:
+            list: Dicts with the function, its cumulative and own time in seconds.
+        """
+        return [
+            {
+                "function": f"{short_filename(filename)}:{line}({name})",
+                "cumulative_s": round(count * self.interval, 3),
+                "own_s": round(self.own[(filename, line, name)] * self.interval, 3),
+            }
+            for (filename, line, name), count in self.cumulative.most_common(limit)
+        ]
+
+
+def top_allocations(start_snapshot, end_snapshot, limit):
+    """
+    Return the allocation sites that grew the most during the session.
+
+    Only allocations with an integration frame in their traceback are counted.
+
+    Args:
+        start_snapshot (tracemalloc.Snapshot): Snapshot taken at the start.
+        end_snapshot (tracemalloc.Snapshot): Snapshot taken at the end.
+        limit (int): Number of sites to return.
+
+    Returns:
+        list: Dicts with the allocation site, size and count differences.
+    """
+    component_filter = [tracemalloc.Filter(True, os.path.join(COMPONENT_DIR, "*"), all_frames=True)]
+    differences = end_snapshot.filter_traces(component_filter).compare_to(
+        start_snapshot.filter_traces(component_filter), "lineno"
+    )
+    return [
+        {
+            "site": f"{short_filename(difference.traceback[0].filename)}:{difference.traceback[0].lineno}",
+            "size_kib": round(difference.size / 1024, 1),
+            "size_diff_kib": round(difference.size_diff / 1024, 1),
+            "count_diff": difference.count_diff,
+        }
+        for difference in differences[:limit]
+    ]
+
+
+def integration_tasks(loop):
+    """
+    Return the names of running asyncio tasks created by the integration.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The Home Assistant event loop.
+
+    Returns:
+        list: Task names with the coroutine they run.
+    """
+    tasks = []
+    for task in asyncio.all_tasks(loop=loop):
+        code = getattr(task.get_coro(), "cr_code", None)
+        if code is not None and is_component_file(code.co_filename):
+            tasks.append(f"{task.get_name()}: {code.co_name}")
+    return sorted(tasks)
+
+
+def write_report(path, summary, functions, allocations, tasks):
+    """
+    Write the profiling report as text. This function does blocking file I/O.
+
+    Args:
+        path (str): Destination file.
+        summary (dict): Session summary.
+        functions (list): Result of StackSampler.top_functions.
+        allocations (list): Result of top_allocations.
+        tasks (list): Result of integration_tasks.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lines = ["HomeAIVision profile", ""]
+    lines += [f"{key}: {value}" for key, value in summary.items() if key != "report_path"]
+    lines += ["", "Top functions by cumulative time", f"{'cumulative s':>12} {'own s':>8}  function"]
+    lines += [f"{item['cumulative_s']:>12.3f} {item['own_s']:>8.3f}  {item['function']}" for item in functions]
+    lines += ["", "Top allocation sites by growth", f"{'growth KiB':>12} {'size KiB':>10} {'count':>8}  site"]
+    lines += [
+        f"{item['size_diff_kib']:>12.1f} {item['size_kib']:>10.1f} {item['count_diff']:>8}  {item['site']}"
+        for item in allocations
+    ]
+    lines += ["", f"Integration tasks at the end of the session ({len(tasks)})"]
+    lines += tasks
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+async def async_run_profile(hass, duration, limit):
+    """
+    Run a time-boxed profiling session while the cameras keep running.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        duration (float): Length of the session in seconds.
+        limit (int): Number of functions and allocation sites in the report.
+
+    Returns:
+        dict: Summary of the session, including the path of the full report.
+    """
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    sampler = StackSampler()
+    try:
+        # info: Snapshots copy every trace, so they are taken in the executor
+        start_snapshot = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+        start = time.monotonic()
+        sampler.start()
+        _LOGGER.info(f"[HomeAIVision] Profiling for {duration} seconds")
+        await asyncio.sleep(duration)
+        elapsed = time.monotonic() - start
+        end_snapshot = await hass.async_add_executor_job(tracemalloc.take_snapshot)
+    finally:
+        await hass.async_add_executor_job(sampler.stop)
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+    functions = sampler.top_functions(limit)
+    allocations = await hass.async_add_executor_job(top_allocations, start_snapshot, end_snapshot, limit)
+    tasks = integration_tasks(hass.loop)
+
+    file_name = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    summary = {
+        "report_path": hass.config.path(PROFILE_DIRECTORY, file_name),
+        "duration_s": round(elapsed, 1),
+        "samples": sampler.samples,
+        "sample_interval_s": sampler.interval,
+        "integration_tasks": len(tasks),
+    }
+    await hass.async_add_executor_job(
+        write_report, summary["report_path"], summary, functions, allocations, tasks
+    )
+    _LOGGER.info(f"[HomeAIVision] Profile report written to {summary['report_path']}")
+
+    # info: The service response stays small, the report holds the full lists
+    summary["top_functions"] = functions[:10]
+    summary["top_allocations"] = allocations[:10]
+    return summary
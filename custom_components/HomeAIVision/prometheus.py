@@ -0,0 +1,206 @@
+import logging
+
+from .detection_zones import build_zone_mask
+from .camera_health import HEALTH_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+METRIC_PREFIX = "homeaivision_"
+
+
+def _escape_label(value):
+    """Escape a label value as required by the text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    """Format a sample value, integers without a decimal point."""
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Exposition:
+    """Collects metric families and renders them in the Prometheus text format."""
+
+    def __init__(self):
+        """Initialize the _Exposition."""
+        self._lines = []
+
+    def family(self, name, kind, help_text):
+        """
+        Start a metric family. All its samples have to follow before the next family.
+
+        Args:
+            name (str): Metric name without the prefix.
+            kind (str): 'counter', 'gauge' or 'histogram'.
+            help_text (str): Description of the metric.
+
+        Returns:
+            str: The full metric name.
+        """
+        name = f"{METRIC_PREFIX}{name}"
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        return name
+
+    def sample(self, name, value, labels=None, suffix=""):
+        """
+        Add a sample. Samples without a value are skipped.
+
+        Args:
+            name (str): The full metric name.
+            value (float or None): The sample value.
+            labels (dict): Label names and values.
+            suffix (str): Suffix of histogram samples, e.g. '_bucket'.
+        """
+        if value is None:
+            return
+        label_text = ""
+        if labels:
+            label_text = "{" + ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items()) + "}"
+        self._lines.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+
+    def histogram(self, name, histogram, labels=None):
+        """
+        Add the cumulative buckets, sum and count of a LatencyHistogram.
+
+        Args:
+            name (str): The full metric name.
+            histogram (LatencyHistogram): The recorded durations in seconds.
+            labels (dict): Label names and values.
+        """
+        labels = labels or {}
+        cumulative = 0
+        # info: The last count is the unbounded bucket, covered by le="+Inf"
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            self.sample(name, cumulative, {**labels, "le": _format_value(bound)}, "_bucket")
+        self.sample(name, histogram.count, {**labels, "le": "+Inf"}, "_bucket")
+        self.sample(name, histogram.sum, labels, "_sum")
+        self.sample(name, histogram.count, labels, "_count")
+
+    def render(self):
+        """Return the exposition text."""
+        return "\n".join(self._lines) + "\n"
+
+
+def render_metrics(data):
+    """
+    Render the in-memory figures of the integration in the Prometheus text format.
+
+    Only the pipeline metrics, the push inboxes, the camera health, the watchdog, the notification
+    dispatcher, the camera tasks and the zone mask cache are read. The store and the disk are
+    not touched, so a scrape costs no I/O. Devices are labelled by their ID.
+
+    Args:
+        data (dict): hass.data[DOMAIN].
+
+    Returns:
+        str: The metrics in the Prometheus text format.
+    """
+    exposition = _Exposition()
+    pipeline_metrics = sorted(data.get('pipeline_metrics', {}).items())
+
+    # NOTE: Per-camera counters and gauges
+    device_families = (
+        ("frames_processed_total", "counter", "Frames fetched and analyzed.", lambda m: m.frames_processed),
+        ("frames_dropped_total", "counter", "Frames that could not be fetched or processed.", lambda m: m.frames_dropped),
+        ("full_resolution_passes_total", "counter", "Frames that needed the full-resolution decode.", lambda m: m.full_resolution_passes),
+        ("azure_requests_total", "counter", "Images sent to Azure.", lambda m: m.azure_requests),
+        ("azure_detections_total", "counter", "Azure requests that detected a target object.", lambda m: m.azure_detections),
+        ("effective_fps", "gauge", "Processed frames per second over the recent frames.", lambda m: m.effective_fps()),
+        ("polling_interval_seconds", "gauge", "Wait before the next frame, absent while waiting for a push or a trigger.", lambda m: m.polling_interval),
+        ("motion_score", "gauge", "Motion score of the latest processed frame.", lambda m: m.motion_score),
+        ("dynamic_threshold", "gauge", "Dynamic threshold the latest motion score was compared with.", lambda m: m.dynamic_threshold),
+        ("storage_images", "gauge", "Saved images of the camera.", lambda m: m.storage_images),
+        ("storage_bytes", "gauge", "Total size of the saved images of the camera.", lambda m: m.storage_bytes),
+    )
+    for name, kind, help_text, value in device_families:
+        name = exposition.family(name, kind, help_text)
+        for device_id, metrics in pipeline_metrics:
+            exposition.sample(name, value(metrics), {"device_id": device_id})
+
+    name = exposition.family("stage_latency_seconds", "histogram", "Latency of the pipeline stages, Azure round trips included.")
+    for device_id, metrics in pipeline_metrics:
+        for stage, histogram in metrics.histograms.items():
+            if histogram.count:
+                exposition.histogram(name, histogram, {"device_id": device_id, "stage": stage})
+
+    # NOTE: Frames pushed through the device webhooks
+    push_inboxes = sorted(data.get('push_inboxes', {}).items())
+    name = exposition.family("push_frames_total", "counter", "Frames pushed through the webhook, by result.")
+    for device_id, inbox in push_inboxes:
+        for result, count in inbox.results.items():
+            exposition.sample(name, count, {"device_id": device_id, "result": result})
+    name = exposition.family("push_frames_replaced_total", "counter", "Accepted pushed frames replaced by a newer frame before processing.")
+    for device_id, inbox in push_inboxes:
+        exposition.sample(name, inbox.replaced, {"device_id": device_id})
+
+    # NOTE: Camera health
+    camera_health = sorted(data.get('camera_health', {}).items())
+    name = exposition.family("camera_health", "gauge", "1 for the current health state of the camera, 0 for the others.")
+    for device_id, health in camera_health:
+        for state in HEALTH_STATES:
+            exposition.sample(name, int(health.state == state), {"device_id": device_id, "state": state})
+    name = exposition.family("camera_fetch_failures_total", "counter", "Failed frame fetches, by kind.")
+    for device_id, health in camera_health:
+        for kind, count in health.failures.items():
+            exposition.sample(name, count, {"device_id": device_id, "kind": kind})
+
+    camera_tasks = data.get('camera_tasks', {})
+    name = exposition.family("camera_tasks_running", "gauge", "Running camera tasks.")
+    exposition.sample(name, sum(1 for task, _ in camera_tasks.values() if not task.done()))
+
+    # NOTE: Zone mask cache
+    cache = build_zone_mask.cache_info()
+    lookups = cache.hits + cache.misses
+    name = exposition.family("zone_mask_cache_hits_total", "counter", "Zone mask lookups served from the cache.")
+    exposition.sample(name, cache.hits)
+    name = exposition.family("zone_mask_cache_misses_total", "counter", "Zone mask lookups that rasterized the zones.")
+    exposition.sample(name, cache.misses)
+    name = exposition.family("zone_mask_cache_hit_ratio", "gauge", "Share of zone mask lookups served from the cache.")
+    exposition.sample(name, cache.hits / lookups if lookups else None)
+    name = exposition.family("zone_mask_cache_entries", "gauge", "Zone masks held in the cache.")
+    exposition.sample(name, cache.currsize)
+
+    # NOTE: Event loop and executor
+    watchdog = data.get('watchdog')
+    if watchdog:
+        executor = watchdog.executor_attributes()
+        name = exposition.family("executor_jobs", "gauge", "Integration executor jobs in flight.")
+        for stage, jobs in sorted(executor["in_flight_by_stage"].items()):
+            exposition.sample(name, jobs, {"stage": stage})
+        name = exposition.family("executor_jobs_queued", "gauge", "Integration executor jobs waiting for a worker.")
+        exposition.sample(name, executor["queued"])
+        name = exposition.family("executor_jobs_total", "counter", "Integration executor jobs submitted.")
+        for stage, jobs in sorted(watchdog.jobs_total.items()):
+            exposition.sample(name, jobs, {"stage": stage})
+        name = exposition.family("executor_saturations_total", "counter", "Executor saturations, by the stage with the most jobs in flight.")
+        for stage, count in sorted(watchdog.saturations.items()):
+            exposition.sample(name, count, {"stage": stage})
+        name = exposition.family("executor_queue_wait_seconds", "histogram", "Time integration executor jobs waited for a worker.")
+        exposition.histogram(name, watchdog.queue_wait)
+        name = exposition.family("event_loop_lag_seconds", "histogram", "Lag of the event loop measured by the watchdog probe.")
+        exposition.histogram(name, watchdog.lag)
+        name = exposition.family("event_loop_stalls_total", "counter", "Event loop stalls, by the blamed stage.")
+        for stage, count in sorted(watchdog.stalls.items()):
+            exposition.sample(name, count, {"stage": stage})
+
+    # NOTE: Notifications
+    dispatcher = data.get('notification_dispatcher')
+    if dispatcher:
+        stats = dispatcher.get_stats()
+        name = exposition.family("notification_queue_depth", "gauge", "Notifications waiting for delivery.")
+        exposition.sample(name, stats['queued'])
+        name = exposition.family("notifications_total", "counter", "Notifications by result.")
+        for result in ('sent', 'merged', 'dropped'):
+            exposition.sample(name, stats[result], {"result": result})
+
+    return exposition.render()
@@ -0,0 +1,228 @@
+import time
+import asyncio
+import hashlib
+import logging
+
+from collections import deque
+from http import HTTPStatus
+
+from aiohttp import web  # type: ignore
+from homeassistant.components import webhook  # type: ignore
+from homeassistant.core import HomeAssistant, callback  # type: ignore
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Push ingestion parameters
+PUSH_MAX_BYTES = 8 * 1024 * 1024    # info: Larger bodies are rejected while streaming, before they are fully read
+PUSH_CHUNK_SIZE = 64 * 1024
+PUSH_MIN_INTERVAL = 1.0             # info: Minimum seconds between two accepted frames of a device
+PUSH_DEDUP_WINDOW = 8               # info: Number of recent frame digests compared against a new frame
+JPEG_MAGIC = b"\xff\xd8"
+
+PUSH_ACCEPTED = "accepted"
+PUSH_DUPLICATE = "duplicate"
+PUSH_RATE_LIMITED = "rate_limited"
+PUSH_RESULTS = (PUSH_ACCEPTED, PUSH_DUPLICATE, PUSH_RATE_LIMITED)
+
+
+class PushFrameInbox:
+    """
+    Latest pushed frame of a device, waiting for the camera task.
+
+    A frame is rejected when it repeats one of the recent frames or arrives
+    sooner than PUSH_MIN_INTERVAL after the last accepted frame. The inbox
+    holds a single frame, so an accepted frame replaces one the camera task
+    has not taken yet.
+    """
+
+    def __init__(self, min_interval=PUSH_MIN_INTERVAL, clock=time.monotonic):
+        """
+        Initialize the PushFrameInbox.
+
+        Args:
+            min_interval (float): Minimum seconds between two accepted frames.
+            clock (callable): Monotonic clock, replaceable for offline tools.
+        """
+        self.min_interval = min_interval
+        self._clock = clock
+        self._frame = None
+        self._event = asyncio.Event()
+        self._recent_digests = deque(maxlen=PUSH_DEDUP_WINDOW)
+        self._last_accepted = None
+        self.results = dict.fromkeys(PUSH_RESULTS, 0)
+        self.replaced = 0                   # info: Accepted frames replaced before the camera task took them
+
+    def offer(self, image_data):
+        """
+        Offer a pushed frame.
+
+        Args:
+            image_data (bytes): The JPEG data.
+
+        Returns:
+            str: PUSH_ACCEPTED, PUSH_DUPLICATE or PUSH_RATE_LIMITED.
+        """
+        now = self._clock()
+        digest = hashlib.blake2b(image_data, digest_size=16).digest()
+        if digest in self._recent_digests:
+            result = PUSH_DUPLICATE
+        elif self._last_accepted is not None and now - self._last_accepted < self.min_interval:
+            result = PUSH_RATE_LIMITED
+        else:
+            result = PUSH_ACCEPTED
+            self._recent_digests.append(digest)
+            self._last_accepted = now
+            self.replaced += self._frame is not None
+            self._frame = image_data
+            self._event.set()
+        self.results[result] += 1
+        return result
+
+    def wake(self):
+        """Wake the camera task without a frame, so it fetches one from the camera."""
+        self._event.set()
+
+    def take(self):
+        """
+        Take the pending frame.
+
+        Returns:
+            bytes or None: The latest accepted frame, None if no frame is pending.
+        """
+        frame, self._frame = self._frame, None
+        self._event.clear()
+        return frame
+
+    async def async_wait(self, stop_event, timeout):
+        """
+        Wait for a pushed frame, the stop event or the timeout, whichever comes first.
+
+        Args:
+            stop_event (asyncio.Event): Stop signal of the camera task.
+            timeout (float or None): Seconds to wait, None to wait without limit.
+        """
+        waiters = {asyncio.ensure_future(stop_event.wait()), asyncio.ensure_future(self._event.wait())}
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+
+def get_push_inbox(hass, device_id):
+    """
+    Return the push inbox of a device, creating it on first use.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device_id (str): The ID of the device.
+
+    Returns:
+        PushFrameInbox: The inbox of the device.
+    """
+    return hass.data[DOMAIN].setdefault('push_inboxes', {}).setdefault(device_id, PushFrameInbox())
+
+
+async def read_limited_body(request: web.Request, limit=PUSH_MAX_BYTES):
+    """
+    Stream the image of a webhook request, raw or as the first part of a multipart body.
+
+    Args:
+        request (web.Request): The webhook request.
+        limit (int): Maximum number of bytes.
+
+    Returns:
+        bytes or None: The body, None if it exceeds the limit.
+    """
+    if request.content_length is not None and request.content_length > limit:
+        return None
+    if request.content_type.startswith("multipart/"):
+        part = await (await request.multipart()).next()
+        if part is None:
+            return b""
+        read_chunk = part.read_chunk
+    else:
+        read_chunk = request.content.read
+
+    chunks = []
+    size = 0
+    while chunk := await read_chunk(PUSH_CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def handle_frame_webhook(hass: HomeAssistant, webhook_id: str, request: web.Request) -> web.Response:
+    """
+    Accept a JPEG frame pushed by a camera or NVR.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        webhook_id (str): The webhook ID of the device.
+        request (web.Request): The request carrying the frame.
+
+    Returns:
+        web.Response: 200 with the push result, or an error status.
+    """
+    device_id = hass.data[DOMAIN].get('webhook_devices', {}).get(webhook_id)
+    if device_id is None or device_id not in hass.data[DOMAIN].get('camera_tasks', {}):
+        # info: Disarmed cameras do not process frames, so nothing is queued for them
+        return web.Response(status=HTTPStatus.CONFLICT, text="camera is not armed")
+
+    image_data = await read_limited_body(request)
+    if image_data is None:
+        _LOGGER.warning(f"[HomeAIVision] Pushed frame for device {device_id} exceeds {PUSH_MAX_BYTES} bytes")
+        return web.Response(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, text="frame too large")
+    if not image_data.startswith(JPEG_MAGIC):
+        return web.Response(status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE, text="expected a JPEG frame")
+
+    result = get_push_inbox(hass, device_id).offer(image_data)
+    _LOGGER.debug(f"[HomeAIVision] Pushed frame for device {device_id}: {result}")
+    if result == PUSH_RATE_LIMITED:
+        return web.Response(status=HTTPStatus.TOO_MANY_REQUESTS, text=result)
+    return web.Response(text=result)
+
+
+@callback
+def async_register_frame_webhook(hass: HomeAssistant, device):
+    """
+    Register the frame webhook of a device.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        device (DeviceData): The device.
+    """
+    webhook_devices = hass.data[DOMAIN].setdefault('webhook_devices', {})
+    if device.webhook_id in webhook_devices:
+        return
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"HomeAIVision {device.name}",
+        device.webhook_id,
+        handle_frame_webhook,
+        allowed_methods=["POST", "PUT"],
+        # IMPORTANT: Cameras push from the local network, the webhook is not reachable through Home Assistant Cloud or the internet
+        local_only=True,
+    )
+    webhook_devices[device.webhook_id] = device.id
+    _LOGGER.debug(f"[HomeAIVision] Registered frame webhook for device {device.id}")
+
+
+@callback
+def async_unregister_frame_webhook(hass: HomeAssistant, webhook_id):
+    """
+    Unregister a frame webhook.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        webhook_id (str): The webhook ID.
+    """
+    device_id = hass.data[DOMAIN].get('webhook_devices', {}).pop(webhook_id, None)
+    if device_id is not None:
+        webhook.async_unregister(hass, webhook_id)
+        hass.data[DOMAIN].get('push_inboxes', {}).pop(device_id, None)
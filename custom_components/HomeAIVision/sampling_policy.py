@@ -0,0 +1,197 @@
+import logging
+
+from .temporal_confirmation import boxes_overlap
+
+_LOGGER = logging.getLogger(__name__)
+
+# NOTE: Reasons reported with every sampling decision
+REASON_START = "start"
+REASON_BURST = "burst"
+REASON_BACKOFF = "backoff"
+REASON_ESCALATION = "escalation"
+REASON_WAITING = "waiting"
+REASON_BUDGET_EXHAUSTED = "budget_exhausted"
+
+
+class AzureSamplingPolicy:
+    """
+    Per-camera policy deciding which significant-motion frames are sent to Azure.
+
+    The first `initial_requests` frames of a motion event are all sent. After
+    that the gap (in significant-motion frames) between requests grows by
+    `backoff_factor` up to `max_request_gap`. A new blob location or a jump of
+    the motion score by `escalation_score_ratio` skips the back-off once. All
+    gaps are stretched as the remaining global request budget shrinks.
+
+    The policy counts frames rather than seconds, so feeding it the same
+    sequence of frames always produces the same decisions (see simulate_policy).
+    """
+
+    def __init__(
+        self,
+        initial_requests=5,
+        backoff_factor=2.0,
+        max_request_gap=8,
+        escalation_score_ratio=2.0,
+        max_unknown_object_counter=20,
+    ):
+        """
+        Initialize the AzureSamplingPolicy.
+
+        Args:
+            initial_requests (int): Requests sent on consecutive frames at the start of an event.
+            backoff_factor (float): Growth factor of the gap after the initial requests.
+            max_request_gap (int): Upper bound of the gap in frames (before budget scaling).
+            escalation_score_ratio (float): Motion score ratio that counts as a big jump, 0 disables.
+            max_unknown_object_counter (int): Frames without recognition before the event is abandoned.
+        """
+        self.configure(
+            initial_requests,
+            backoff_factor,
+            max_request_gap,
+            escalation_score_ratio,
+            max_unknown_object_counter,
+        )
+        self.reset()
+
+    def configure(
+        self,
+        initial_requests,
+        backoff_factor,
+        max_request_gap,
+        escalation_score_ratio,
+        max_unknown_object_counter,
+    ):
+        """Apply new policy parameters without resetting the current motion event."""
+        self.initial_requests = max(1, int(initial_requests))
+        self.backoff_factor = max(1.0, float(backoff_factor))
+        self.max_request_gap = max(1, int(max_request_gap))
+        self.escalation_score_ratio = float(escalation_score_ratio)
+        self.max_unknown_object_counter = max(1, int(max_unknown_object_counter))
+
+    def reset(self):
+        """Start a new motion event."""
+        self._requests = 0
+        self._backoff_stage = 0
+        self._frames_since_request = 0
+        self._last_score = None
+        self._last_box = None
+
+    def current_gap(self, budget_ratio=1.0):
+        """
+        Return the number of significant-motion frames required between requests.
+
+        Args:
+            budget_ratio (float): Remaining share of the global request budget (0.0 - 1.0).
+
+        Returns:
+            int: The gap in frames.
+        """
+        if self._backoff_stage < self.initial_requests:
+            gap = 1
+        else:
+            exponent = self._backoff_stage - self.initial_requests + 1
+            gap = min(self.max_request_gap, self.backoff_factor ** exponent)
+        # info: A shrinking budget stretches every gap, e.g. twice as long with half of the budget left
+        return max(1, round(gap / budget_ratio))
+
+    def should_request(self, unknown_object_counter, motion_score, blobs, budget_ratio=1.0):
+        """
+        Decide if the current significant-motion frame is sent to Azure.
+
+        Args:
+            unknown_object_counter (int): Significant-motion frames since the event started.
+            motion_score (float): Motion score of the frame.
+            blobs (list): Qualifying MotionBlob instances, largest first.
+            budget_ratio (float): Remaining share of the global request budget (0.0 - 1.0).
+
+        Returns:
+            tuple: (request, reason)
+        """
+        if budget_ratio <= 0:
+            return False, REASON_BUDGET_EXHAUSTED
+
+        if unknown_object_counter == 0:
+            self.reset()
+            return True, REASON_START
+
+        self._frames_since_request += 1
+        gap = self.current_gap(budget_ratio)
+        if self._frames_since_request >= gap:
+            return True, REASON_BURST if gap == 1 else REASON_BACKOFF
+
+        # NOTE: Escalations skip the back-off, but never fire on consecutive frames
+        if self._frames_since_request >= 2 and self._motion_changed(motion_score, blobs):
+            self._backoff_stage = 0
+            return True, REASON_ESCALATION
+
+        return False, REASON_WAITING
+
+    def record_request(self, motion_score, blobs):
+        """
+        Record that the current frame was sent to Azure.
+
+        Args:
+            motion_score (float): Motion score of the frame.
+            blobs (list): Qualifying MotionBlob instances, largest first.
+        """
+        self._requests += 1
+        self._backoff_stage += 1
+        self._frames_since_request = 0
+        self._last_score = motion_score
+        self._last_box = blobs[0].bounding_box if blobs else None
+
+    def _motion_changed(self, motion_score, blobs):
+        """Check if the motion differs enough from the last request to escalate."""
+        if self._last_box is not None and blobs:
+            if not boxes_overlap(blobs[0].bounding_box, self._last_box, 0.5):
+                _LOGGER.debug(f"Escalating Azure sampling, new blob at {blobs[0].bounding_box}")
+                return True
+        if self.escalation_score_ratio > 0 and self._last_score:
+            if motion_score >= self._last_score * self.escalation_score_ratio:
+                _LOGGER.debug(f"Escalating Azure sampling, motion score jumped {self._last_score} -> {motion_score}")
+                return True
+        return False
+
+
+def simulate_policy(policy, frames):
+    """
+    Run the sampling policy over a scripted sequence of significant-motion frames.
+
+    The counter handling mirrors periodic_check: a detection ends the event, a
+    missed or skipped frame increments the unknown object counter, and reaching
+    max_unknown_object_counter abandons the event.
+
+    Args:
+        policy (AzureSamplingPolicy): The policy to simulate.
+        frames (iterable): Dicts with 'motion_score', optional 'blobs' (MotionBlob
+            list), 'detected' (Azure result if requested) and 'budget_ratio'.
+
+    Returns:
+        list: One dict per frame with 'frame', 'counter', 'request' and 'reason'.
+    """
+    results = []
+    unknown_object_counter = 0
+    for index, frame in enumerate(frames):
+        blobs = frame.get('blobs', [])
+        request, reason = policy.should_request(
+            unknown_object_counter,
+            frame['motion_score'],
+            blobs,
+            frame.get('budget_ratio', 1.0),
+        )
+        results.append({
+            'frame': index,
+            'counter': unknown_object_counter,
+            'request': request,
+            'reason': reason,
+        })
+        if request:
+            policy.record_request(frame['motion_score'], blobs)
+            if frame.get('detected', False):
+                unknown_object_counter = 0
+                continue
+        unknown_object_counter += 1
+        if unknown_object_counter >= policy.max_unknown_object_counter:
+            unknown_object_counter = 0
+    return results
@@ -1,15 +1,29 @@
 import os
 import shutil
 import asyncio
-import aiofiles # type: ignore
 import logging
 
 from datetime import datetime, timedelta
 
 from .const import CONF_MAX_IMAGES_PER_DAY
+from .event_buffer import EVENT_FOLDER_SUFFIX
+from .event_summary import decode_scaled
 
 _LOGGER = logging.getLogger(__name__)
 
+# NOTE: The retention policy runs in the background, off the startup path
+RETENTION_START_DELAY = timedelta(minutes=10)     # info: Delay after setup before the first run
+RETENTION_INTERVAL = timedelta(hours=12)
+
+# NOTE: Thumbnails of the saved images, sent with notifications instead of the full image
+THUMBNAIL_FORMAT_OFF = "off"
+THUMBNAIL_FORMATS = {
+    "jpeg": (".jpg", {"format": "JPEG", "quality": 70, "optimize": True}),
+    "webp": (".webp", {"format": "WEBP", "quality": 65, "method": 4}),
+}
+THUMBNAIL_SIZE = 640                # info: Bounding box in pixels of the thumbnail
+THUMBNAIL_SUFFIX = "_thumb"         # info: Appended to the image name, e.g. cam_frame_..._thumb.webp
+
 def get_device_folder_path(base_path, device_name):
     """
     Creates and returns a path for the device's images.
@@ -40,7 +54,190 @@ def get_daily_folder_path(device_path):
     os.makedirs(daily_path, exist_ok=True)
     return daily_path
 
-async def save_image(base_path, device_name, image_data, max_images_per_day, days_to_keep):
+def scan_storage_usage(device_path):
+    """
+    Count the saved images of a device and their total size.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        device_path (str): The directory of the device.
+
+    Returns:
+        tuple: (images, size) with the number of images and their total size in bytes.
+            Thumbnails and the files of event groups count towards the size but not the images,
+            as in the gallery index.
+    """
+    images = 0
+    size = 0
+    for root, _, file_names in os.walk(device_path):
+        # info: Frames, clip and contact sheet of an event group belong to its detection image
+        in_event_folder = root.endswith(EVENT_FOLDER_SUFFIX)
+        for file_name in file_names:
+            if not file_name.lower().endswith((".jpg", ".jpeg", ".webp", ".gif")):
+                continue
+            try:
+                size += os.path.getsize(os.path.join(root, file_name))
+                images += not (in_event_folder or is_thumbnail(file_name))
+            except OSError:
+                # info: The image was removed while scanning
+                continue
+    return images, size
+
+def is_thumbnail(file_name):
+    """
+    Check whether a file is the thumbnail of a saved image.
+
+    Args:
+        file_name (str): The file name.
+
+    Returns:
+        bool: True for thumbnails.
+    """
+    return os.path.splitext(file_name)[0].endswith(THUMBNAIL_SUFFIX)
+
+def get_thumbnail_path(image_path, thumbnail_format):
+    """
+    Returns the path of the thumbnail of a saved image.
+
+    Args:
+        image_path (str): Path of the saved image.
+        thumbnail_format (str): One of THUMBNAIL_FORMATS.
+
+    Returns:
+        str: Path of the thumbnail next to the image.
+    """
+    extension, _ = THUMBNAIL_FORMATS[thumbnail_format]
+    return os.path.splitext(image_path)[0] + THUMBNAIL_SUFFIX + extension
+
+def get_folder_size(folder_path):
+    """
+    Returns the total size of the files in a folder, e.g. an event group.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        folder_path (str): The folder, its subfolders are not included.
+
+    Returns:
+        int: Size in bytes, 0 if the folder does not exist.
+    """
+    size = 0
+    try:
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        size += entry.stat().st_size
+                except OSError:
+                    # info: The file was removed while scanning
+                    continue
+    except FileNotFoundError:
+        pass
+    return size
+
+def remove_image_files(image_path):
+    """
+    Removes a saved image with its thumbnails and event group.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        image_path (str): Path of the saved image.
+
+    Returns:
+        int: Size in bytes of the removed files.
+    """
+    removed_size = 0
+    for file_path in [image_path, *(get_thumbnail_path(image_path, thumbnail_format) for thumbnail_format in THUMBNAIL_FORMATS)]:
+        try:
+            removed_size += os.path.getsize(file_path)
+            os.remove(file_path)
+        except FileNotFoundError:
+            continue
+    event_path = get_event_folder_path(image_path)
+    removed_size += get_folder_size(event_path)
+    shutil.rmtree(event_path, True)
+    return removed_size
+
+def remove_image_folder(folder_path):
+    """
+    Removes a day folder of saved images.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        folder_path (str): The folder.
+
+    Returns:
+        tuple: (images, size) removed, as counted by scan_storage_usage.
+    """
+    removed = scan_storage_usage(folder_path)
+    shutil.rmtree(folder_path)
+    return removed
+
+def write_image_files(image_path, image_data, thumbnail_format=THUMBNAIL_FORMAT_OFF):
+    """
+    Writes a saved image and its thumbnail.
+
+    The thumbnail is decoded at reduced size with the JPEG draft mode, so both
+    files cost a single executor job. A thumbnail that cannot be built is
+    skipped and the image is kept.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        image_path (str): Path of the image.
+        image_data (bytes): The binary data of the image.
+        thumbnail_format (str): One of THUMBNAIL_FORMATS, or THUMBNAIL_FORMAT_OFF.
+
+    Returns:
+        tuple: (thumbnail_path, size), the thumbnail path is None if none was written
+            and size is the total size in bytes of the written files.
+    """
+    with open(image_path, 'wb') as file:
+        file.write(image_data)
+    if thumbnail_format not in THUMBNAIL_FORMATS:
+        return None, len(image_data)
+
+    thumbnail_path = get_thumbnail_path(image_path, thumbnail_format)
+    _, save_options = THUMBNAIL_FORMATS[thumbnail_format]
+    try:
+        decode_scaled(image_data, THUMBNAIL_SIZE).save(thumbnail_path, **save_options)
+        return thumbnail_path, len(image_data) + os.path.getsize(thumbnail_path)
+    except (OSError, SyntaxError, KeyError) as e:
+        _LOGGER.warning(f"[HomeAIVision] Failed to save thumbnail {thumbnail_path}: {e}")
+        return None, len(image_data)
+
+def get_event_folder_path(image_path):
+    """
+    Returns the path of the event group of a saved image.
+
+    Args:
+        image_path (str): Path of the saved detection image.
+
+    Returns:
+        str: Path of the event folder next to the image.
+    """
+    return os.path.splitext(image_path)[0] + EVENT_FOLDER_SUFFIX
+
+def save_event_frames(event_path, files):
+    """
+    Writes the frames of an event group into its folder.
+
+    This function does blocking file I/O and must run in the executor.
+
+    Args:
+        event_path (str): The folder of the event group.
+        files (list): (file_name, image_data) tuples.
+    """
+    os.makedirs(event_path, exist_ok=True)
+    for file_name, image_data in files:
+        with open(os.path.join(event_path, file_name), 'wb') as file:
+            file.write(image_data)
+    _LOGGER.info(f"[HomeAIVision] Saved {len(files)} event frames: {event_path}")
+
+async def save_image(base_path, device_name, image_data, max_images_per_day, days_to_keep, thumbnail_format=THUMBNAIL_FORMAT_OFF, gallery=None, detected_object=None, metrics=None):
     """
     Saves an image to the filesystem, organizing it into device and date folders,
     and enforcing storage limits.
@@ -51,6 +248,13 @@ async def save_image(base_path, device_name, image_data, max_images_per_day, day
         image_data (bytes): The binary data of the image to save.
         max_images_per_day (int): Maximum number of images per day per camera.
         days_to_keep (int): Number of days to keep images before deletion.
+        thumbnail_format (str): Format of the thumbnail saved next to the image, or THUMBNAIL_FORMAT_OFF.
+        gallery (GalleryIndex, optional): Index updated with the saved and removed images.
+        detected_object (str, optional): The object detected in the image, recorded in the gallery.
+        metrics (PipelineMetrics, optional): Storage usage updated with the saved and removed images.
+
+    Returns:
+        tuple: (image_path, thumbnail_path), the thumbnail path is None if no thumbnail was saved.
     """
     device_path = get_device_folder_path(base_path, device_name)
     save_path = get_daily_folder_path(device_path)
@@ -58,7 +262,7 @@ async def save_image(base_path, device_name, image_data, max_images_per_day, day
     try:
         current_images = await asyncio.to_thread(
             lambda: sorted(
-                [f for f in os.listdir(save_path) if f.lower().endswith((".jpg", ".jpeg"))],
+                [f for f in os.listdir(save_path) if f.lower().endswith((".jpg", ".jpeg")) and not is_thumbnail(f)],
                 key=lambda x: os.path.getmtime(os.path.join(save_path, x))
             )
         )
@@ -68,35 +272,46 @@ async def save_image(base_path, device_name, image_data, max_images_per_day, day
 
     if len(current_images) >= max_images_per_day:
         images_to_remove = current_images[:len(current_images) - max_images_per_day + 1]
-        await asyncio.gather(*[
-            asyncio.to_thread(os.remove, os.path.join(save_path, extra_image))
+        # info: The thumbnails and the event group of a removed image go with it
+        removed_sizes = await asyncio.gather(*[
+            asyncio.to_thread(remove_image_files, os.path.join(save_path, extra_image))
             for extra_image in images_to_remove
         ])
+        if metrics is not None:
+            metrics.adjust_storage(-len(images_to_remove), -sum(removed_sizes))
         for extra_image in images_to_remove:
+            if gallery is not None:
+                gallery.discard(os.path.join(save_path, extra_image))
             _LOGGER.info(f"[HomeAIVision] Removed old image: {extra_image}")
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     image_path = os.path.join(save_path, f"cam_frame_{timestamp}.jpg")
 
+    thumbnail_path = None
     try:
-        async with aiofiles.open(image_path, 'wb') as file:
-            await file.write(image_data)
+        thumbnail_path, saved_size = await asyncio.to_thread(write_image_files, image_path, image_data, thumbnail_format)
         _LOGGER.info(f"[HomeAIVision] Saved image: {image_path}")
+        if metrics is not None:
+            metrics.adjust_storage(1, saved_size)
+        if gallery is not None:
+            gallery.add(image_path, thumbnail_path, detected_object)
     except Exception as e:
         _LOGGER.error(f"[HomeAIVision] Failed to save image {image_path}: {e}")
 
     # NOTE: Cleanup old images after saving
-    await clean_up_old_images(device_path, days_to_keep)
+    await clean_up_old_images(device_path, days_to_keep, gallery, metrics)
 
-    return image_path
+    return image_path, thumbnail_path
 
-async def clean_up_old_images(device_path, days_to_keep):
+async def clean_up_old_images(device_path, days_to_keep, gallery=None, metrics=None):
     """
     Removes image folders older than a specified number of days within a device's folder.
     
     Args:
         device_path (str): The directory of the device.
         days_to_keep (int): Number of days to keep images before deletion.
+        gallery (GalleryIndex, optional): Index updated with the removed folders.
+        metrics (PipelineMetrics, optional): Storage usage updated with the removed folders.
     """
     if not os.path.exists(device_path):
         await asyncio.to_thread(os.makedirs, device_path, exist_ok=True)
@@ -111,10 +326,40 @@ async def clean_up_old_images(device_path, days_to_keep):
             try:
                 folder_date = datetime.strptime(folder_name, "%Y-%m-%d")
                 if (today - folder_date).days > days_to_keep:
-                    await asyncio.to_thread(shutil.rmtree, folder_path)
+                    removed_images, removed_size = await asyncio.to_thread(remove_image_folder, folder_path)
+                    if metrics is not None:
+                        metrics.adjust_storage(-removed_images, -removed_size)
+                    if gallery is not None:
+                        gallery.discard_folder(folder_path)
                     _LOGGER.info(f"[HomeAIVision] Deleted old image folder: {folder_path}")
             except ValueError:
                 # info: Ignore directories that do not match the date format
                 continue
             except Exception as e:
                 _LOGGER.error(f"[HomeAIVision] Failed to delete {folder_path}: {e}")
+
+async def clean_up_all_devices(base_path, devices, gallery=None, metrics=None):
+    """
+    Apply the retention policy to every device, one device after the other.
+
+    The storage usage of every device is scanned afterwards, so the scan runs
+    in the background instead of in the camera startup.
+
+    Args:
+        base_path (str): The base directory where images are saved.
+        devices (list): DeviceData of the devices.
+        gallery (GalleryIndex, optional): Index updated with the removed folders.
+        metrics (dict, optional): PipelineMetrics by device ID, updated with the storage usage.
+    """
+    metrics = metrics or {}
+    for device in devices:
+        device_path = os.path.join(base_path, device.name)
+        device_metrics = metrics.get(device.id)
+        # info: Devices that never saved an image have no folder, so nothing is created for them
+        if await asyncio.to_thread(os.path.isdir, device_path):
+            await clean_up_old_images(device_path, device.days_to_keep, gallery)
+            if device_metrics is not None:
+                device_metrics.record_storage(*await asyncio.to_thread(scan_storage_usage, device_path))
+        elif device_metrics is not None:
+            device_metrics.record_storage(0, 0)
+    _LOGGER.debug(f"[HomeAIVision] Retention policy applied to {len(devices)} devices")
@@ -8,10 +8,15 @@ from .store import HomeAIVisionStore
 from .entities import (
     CameraUrlEntity,
     GlobalAzureRequestCountEntity,
+    GlobalNotificationStatsEntity,
     AzureRequestCountEntity,
     DeviceIdEntity,
     NotificationEntity,
     MaxImagesPerDayEntity,
+    PipelineLatencyEntity,
+    CameraHealthEntity,
+    GlobalLoopLagEntity,
+    GlobalExecutorJobsEntity,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -41,6 +46,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     # NOTE: Initialize the global Azure request count sensor once
     global_sensor = GlobalAzureRequestCountEntity(hass)
     entities.append(global_sensor)
+    entities.append(GlobalNotificationStatsEntity(hass))
+    entities.append(GlobalLoopLagEntity(hass))
+    entities.append(GlobalExecutorJobsEntity(hass))
 
     for device_data in devices.values():
         device_config = device_data.asdict()
@@ -53,6 +61,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
             DeviceIdEntity(hass, device_config),
             NotificationEntity(hass, device_config),
             MaxImagesPerDayEntity(hass, device_config),
+            PipelineLatencyEntity(hass, device_config),
+            CameraHealthEntity(hass, device_config),
         ])
 
     if entities:
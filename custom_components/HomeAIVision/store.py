@@ -1,4 +1,5 @@
 import logging
+import secrets
 import attr  # type: ignore
 
 from homeassistant.helpers.storage import Store  # type: ignore
@@ -25,14 +26,40 @@ class DeviceData:
     url = attr.ib(type=str)
     to_detect_object = attr.ib(type=str)
     azure_confidence_threshold = attr.ib(type=float)
+    motion_url = attr.ib(type=str, default='')                  # info: Optional low-resolution stream polled for motion
     armed = attr.ib(type=bool, default=False)
     send_notifications = attr.ib(type=bool, default=False)
+    notification_cooldown = attr.ib(type=int, default=60)
+    thumbnail_format = attr.ib(type=str, default='off')         # info: Thumbnail attached to notifications: off, jpeg or webp
     max_images_per_day = attr.ib(type=int, default=100)
     days_to_keep = attr.ib(type=int, default=30)
+    pre_event_frames = attr.ib(type=int, default=0)             # info: Buffered frames saved with a detection, 0 disables the event group
+    post_event_frames = attr.ib(type=int, default=0)
     motion_detection_history_size = attr.ib(type=int, default=10)
+    motion_mad_multiplier = attr.ib(type=float, default=2.0)
     motion_detection_interval = attr.ib(type=int, default=5)
+    adaptive_interval = attr.ib(type=bool, default=False)       # info: Poll between the min and max interval depending on scene activity
+    adaptive_interval_min = attr.ib(type=int, default=1)
+    adaptive_interval_max = attr.ib(type=int, default=30)
     device_azure_request_count = attr.ib(type=int, default=0)
     local_sensitivity_level = attr.ib(type=str, default='medium')
+    min_blob_area_percentage = attr.ib(type=float, default=0.1)
+    max_blob_area_percentage = attr.ib(type=float, default=60.0)
+    detection_zones = attr.ib(type=list, factory=list)
+    multi_scale_motion_detection = attr.ib(type=bool, default=True)
+    motion_confirmation_frames = attr.ib(type=int, default=1)
+    motion_confirmation_window = attr.ib(type=int, default=1)
+    motion_confirmation_overlap = attr.ib(type=bool, default=False)
+    azure_initial_requests = attr.ib(type=int, default=5)
+    azure_backoff_factor = attr.ib(type=float, default=2.0)
+    azure_max_request_gap = attr.ib(type=int, default=8)
+    azure_escalation_score_ratio = attr.ib(type=float, default=2.0)
+    max_unknown_object_counter = attr.ib(type=int, default=20)
+    push_only = attr.ib(type=bool, default=False)               # info: Frames only arrive through the webhook, the camera is never polled
+    webhook_id = attr.ib(type=str, factory=lambda: secrets.token_hex(16))
+    trigger_entity_id = attr.ib(type=str, default='')           # info: Optional binary_sensor whose motion starts a burst of frames
+    trigger_burst_duration = attr.ib(type=int, default=30)
+    trigger_idle_interval = attr.ib(type=int, default=300)      # info: Background polling between triggers, 0 disables it
     config_entry_id = attr.ib(type=str, default='')
 
     @classmethod
@@ -47,14 +74,40 @@ class DeviceData:
             DeviceData: An instance of DeviceData.
         """
         # IMPORTANT: Provide default values for missing keys to maintain compatibility
+        data.setdefault('motion_url', '')
         data.setdefault('armed', False)
         data.setdefault('send_notifications', False)
+        data.setdefault('notification_cooldown', 60)
+        data.setdefault('thumbnail_format', 'off')
         data.setdefault('max_images_per_day', 100)
         data.setdefault('days_to_keep', 30)
+        data.setdefault('pre_event_frames', 0)
+        data.setdefault('post_event_frames', 0)
         data.setdefault('motion_detection_history_size', 10)
+        data.setdefault('motion_mad_multiplier', 2.0)
         data.setdefault('motion_detection_interval', 5)
+        data.setdefault('adaptive_interval', False)
+        data.setdefault('adaptive_interval_min', 1)
+        data.setdefault('adaptive_interval_max', 30)
         data.setdefault('device_azure_request_count', 0)
         data.setdefault('local_sensitivity_level', 'medium')
+        data.setdefault('min_blob_area_percentage', 0.1)
+        data.setdefault('max_blob_area_percentage', 60.0)
+        data.setdefault('detection_zones', [])
+        data.setdefault('multi_scale_motion_detection', True)
+        data.setdefault('motion_confirmation_frames', 1)
+        data.setdefault('motion_confirmation_window', 1)
+        data.setdefault('motion_confirmation_overlap', False)
+        data.setdefault('azure_initial_requests', 5)
+        data.setdefault('azure_backoff_factor', 2.0)
+        data.setdefault('azure_max_request_gap', 8)
+        data.setdefault('azure_escalation_score_ratio', 2.0)
+        data.setdefault('max_unknown_object_counter', 20)
+        data.setdefault('push_only', False)
+        data.setdefault('webhook_id', secrets.token_hex(16))
+        data.setdefault('trigger_entity_id', '')
+        data.setdefault('trigger_burst_duration', 30)
+        data.setdefault('trigger_idle_interval', 300)
         data.setdefault('config_entry_id', '')
 
         return cls(**data)
@@ -70,6 +123,8 @@ class GlobalData:
 
     global_azure_request_count = attr.ib(type=int, default=0)
     language = attr.ib(type=str, default="en")
+    azure_request_budget = attr.ib(type=int, default=0)
+    camera_start_concurrency = attr.ib(type=int, default=2)
 
     @classmethod
     def from_dict(cls, data):
@@ -85,6 +140,8 @@ class GlobalData:
         return cls(
             global_azure_request_count=data.get('global_azure_request_count', 0),
             language=data.get('language', 'en'),
+            azure_request_budget=data.get('azure_request_budget', 0),
+            camera_start_concurrency=data.get('camera_start_concurrency', 2),
         )
 
     def asdict(self):
@@ -118,6 +175,8 @@ class HomeAIVisionStore:
         data = await self.store.async_load()
         if data is not None:
             devices_data = data.get('devices', {})
+            # info: Devices stored before push ingestion get their webhook ID now, which has to be kept
+            missing_webhook_ids = any('webhook_id' not in device_data for device_data in devices_data.values())
             self.devices = {
                 device_id: DeviceData.from_dict(device_data)
                 for device_id, device_data in devices_data.items()
@@ -125,6 +184,8 @@ class HomeAIVisionStore:
             global_data = data.get('global', {})
             self.global_data = GlobalData.from_dict(global_data)
             _LOGGER.info("[HomeAIVision] Data loaded successfully from storage.")
+            if missing_webhook_ids:
+                await self.async_save()
         else:
             self.devices = {}
             self.global_data = GlobalData()
@@ -240,6 +301,61 @@ class HomeAIVisionStore:
         """
         return self.global_data.global_azure_request_count
 
+    def get_request_budget(self):
+        """
+        Retrieve the global Azure request budget.
+
+        Returns:
+            int: Maximum number of requests until the global counter is reset, 0 for unlimited.
+        """
+        return self.global_data.azure_request_budget
+
+    async def async_set_request_budget(self, budget: int):
+        """
+        Set the global Azure request budget.
+
+        Args:
+            budget (int): Maximum number of requests until the global counter is reset, 0 for unlimited.
+        """
+        self.global_data.azure_request_budget = budget
+        _LOGGER.debug(f"[HomeAIVision] Set global Azure request budget to: {budget}")
+        await self.async_save()
+        self._notify_listeners()
+
+    def get_camera_start_concurrency(self):
+        """
+        Retrieve the number of cameras that may start at the same time.
+
+        Returns:
+            int: Maximum number of camera tasks warming up concurrently.
+        """
+        return self.global_data.camera_start_concurrency
+
+    async def async_set_camera_start_concurrency(self, concurrency: int):
+        """
+        Set the number of cameras that may start at the same time.
+
+        Args:
+            concurrency (int): Maximum number of camera tasks warming up concurrently.
+        """
+        self.global_data.camera_start_concurrency = concurrency
+        _LOGGER.debug(f"[HomeAIVision] Set camera start concurrency to: {concurrency}")
+        await self.async_save()
+        self._notify_listeners()
+
+    def get_remaining_budget_ratio(self):
+        """
+        Retrieve the remaining share of the global Azure request budget.
+
+        Returns:
+            float: Value between 0.0 (exhausted) and 1.0 (unused or unlimited).
+        """
+        budget = self.global_data.azure_request_budget
+        if budget <= 0:
+            return 1.0
+        used = self.global_data.global_azure_request_count
+        return max(0.0, min(1.0, 1 - used / budget))
+
     def get_language(self):
         """
         Retrieve the current notification language.
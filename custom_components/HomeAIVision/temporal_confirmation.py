@@ -0,0 +1,141 @@
+import logging
+import attr  # type: ignore
+
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@attr.s(slots=True)
+class MotionSample:
+    """Class representing the motion result of a single frame in the confirmation window."""
+
+    motion = attr.ib(type=bool)
+    image_data = attr.ib(default=None, repr=False)
+    blob = attr.ib(default=None)
+
+
+class TemporalConfirmation:
+    """
+    N-of-M temporal confirmation of motion.
+
+    Motion is confirmed once at least `required_frames` of the last `window_size`
+    frames contained significant motion. Optionally the largest blobs of those
+    frames must also overlap spatially, so unrelated flickers in different parts
+    of the frame do not add up.
+    """
+
+    def __init__(self, required_frames=1, window_size=1, require_overlap=False, overlap_margin=0.5):
+        """
+        Initialize the TemporalConfirmation.
+
+        Args:
+            required_frames (int): Number of motion frames (N) needed for confirmation.
+            window_size (int): Number of most recent frames (M) considered.
+            require_overlap (bool): Require the motion boxes to overlap.
+            overlap_margin (float): Fraction of the box size added on each side
+                before testing overlap, to allow for movement between frames.
+        """
+        self.required_frames = max(1, required_frames)
+        self.window_size = max(self.required_frames, window_size)
+        self.require_overlap = require_overlap
+        self.overlap_margin = overlap_margin
+        self._samples = deque(maxlen=self.window_size)
+
+    def configure(self, required_frames, window_size, require_overlap):
+        """
+        Apply new settings, keeping the samples that still fit the window.
+
+        Args:
+            required_frames (int): Number of motion frames (N) needed for confirmation.
+            window_size (int): Number of most recent frames (M) considered.
+            require_overlap (bool): Require the motion boxes to overlap.
+        """
+        required_frames = max(1, required_frames)
+        window_size = max(required_frames, window_size)
+        if (required_frames, window_size, require_overlap) == (
+            self.required_frames, self.window_size, self.require_overlap
+        ):
+            return
+        self.required_frames = required_frames
+        self.window_size = window_size
+        self.require_overlap = require_overlap
+        self._samples = deque(self._samples, maxlen=window_size)
+
+    def add(self, motion, image_data=None, blob=None):
+        """
+        Record the result of the latest frame.
+
+        Args:
+            motion (bool): True if the frame contained significant motion.
+            image_data (bytes, optional): Raw frame data, kept only for motion frames.
+            blob (MotionBlob, optional): Largest qualifying blob of the frame.
+        """
+        if motion:
+            self._samples.append(MotionSample(True, image_data, blob))
+        else:
+            self._samples.append(MotionSample(False))
+
+    def reset(self):
+        """Forget all recorded frames."""
+        self._samples.clear()
+
+    def motion_count(self):
+        """Return the number of motion frames in the window."""
+        return sum(1 for sample in self._samples if sample.motion)
+
+    def confirm(self):
+        """
+        Check if the motion in the window is confirmed.
+
+        Returns:
+            MotionSample or None: The confirmed motion frame with the largest blob,
+                or None if motion is not (yet) confirmed.
+        """
+        motion_samples = [sample for sample in self._samples if sample.motion]
+        if not motion_samples:
+            return None
+
+        if self.require_overlap and motion_samples[-1].blob is not None:
+            latest_box = motion_samples[-1].blob.bounding_box
+            motion_samples = [
+                sample for sample in motion_samples
+                if sample.blob is not None and boxes_overlap(sample.blob.bounding_box, latest_box, self.overlap_margin)
+            ]
+
+        if len(motion_samples) < self.required_frames:
+            _LOGGER.debug(
+                f"Motion awaiting confirmation: {len(motion_samples)} of {self.required_frames} frames "
+                f"in the last {self.window_size}"
+            )
+            return None
+        return max(motion_samples, key=lambda sample: sample.blob.area if sample.blob else 0)
+
+
+def boxes_overlap(first, second, margin=0.0):
+    """
+    Check if two (x, y, width, height) boxes overlap.
+
+    Args:
+        first (tuple): First bounding box.
+        second (tuple): Second bounding box.
+        margin (float): Fraction of each box's size added on every side.
+
+    Returns:
+        bool: True if the (expanded) boxes intersect.
+    """
+    def expand(box):
+        x, y, width, height = box
+        return (
+            x - width * margin,
+            y - height * margin,
+            x + width * (1 + margin),
+            y + height * (1 + margin),
+        )
+
+    first_left, first_top, first_right, first_bottom = expand(first)
+    second_left, second_top, second_right, second_bottom = expand(second)
+    return (
+        first_left < second_right and second_left < first_right
+        and first_top < second_bottom and second_top < first_bottom
+    )
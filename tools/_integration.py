@@ -0,0 +1,53 @@
+"""
+Load HomeAIVision modules outside of Home Assistant.
+
+The integration package's __init__.py imports Home Assistant, so the offline
+tools register an empty package pointing at the integration directory and
+import only the modules they need (motion detection, blob analysis, zones and
+the sampling policy). Those modules depend on Pillow, attrs and voluptuous only.
+Tools running inside Home Assistant import the real package instead.
+"""
+import sys
+import types
+import importlib
+
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+COMPONENT_DIR = REPO_DIR / "custom_components" / "HomeAIVision"
+PACKAGE = "homeaivision_offline"
+
+
+def load_module(name):
+    """
+    Import an integration module without executing the package __init__.py.
+
+    Args:
+        name (str): Module name within the integration, e.g. 'motion_detection'.
+
+    Returns:
+        module: The imported module.
+    """
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(COMPONENT_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+def load_integration_module(name):
+    """
+    Import an integration module the way Home Assistant does, package __init__.py included.
+
+    Used by the tools that run the integration inside a Home Assistant core
+    instance, so Home Assistant has to be installed.
+
+    Args:
+        name (str): Module name within the integration, e.g. 'camera_processing'.
+
+    Returns:
+        module: The imported module.
+    """
+    if str(REPO_DIR) not in sys.path:
+        sys.path.insert(0, str(REPO_DIR))
+    return importlib.import_module(f"custom_components.{COMPONENT_DIR.name}.{name}")
@@ -0,0 +1,99 @@
+"""
+Local stand-in for the Azure Computer Vision analyze endpoint.
+
+Serves POST /vision/v3.0/analyze on 127.0.0.1 with aiohttp, so the real
+azure_client.analyze_image_with_azure can be exercised without network access
+or cost. Responses are scripted per image: the SHA-1 of the request body selects
+the list of objects returned, unknown images get an empty object list.
+"""
+import asyncio
+import hashlib
+
+from aiohttp import web
+
+ANALYZE_PATH = "/vision/v3.0/analyze"
+
+
+def image_key(image_data):
+    """Return the key used to script the response of an image."""
+    return hashlib.sha1(image_data).hexdigest()
+
+
+class AzureStandIn:
+    """Scripted Azure analyze endpoint served by aiohttp."""
+
+    def __init__(self, latency=0.0, status=200, on_response=None):
+        """
+        Initialize the AzureStandIn.
+
+        Args:
+            latency (float): Seconds to wait before every response.
+            status (int): HTTP status of every response, e.g. 429 to simulate throttling.
+            on_response (callable): Called with the image key and the returned objects just before every successful response.
+        """
+        self.latency = latency
+        self.status = status
+        self.on_response = on_response
+        self.requests = 0
+        self.request_keys = []          # info: Image keys in the order they were analysed
+        self._responses = {}
+        self._runner = None
+        self.endpoint = None
+
+    def add_response(self, image_data, objects):
+        """
+        Script the objects returned for an image.
+
+        Args:
+            image_data (bytes): The image as it will be posted.
+            objects (list): Objects in the format of the Azure analyze response.
+        """
+        self._responses[image_key(image_data)] = objects
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start serving.
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind, 0 picks a free port.
+
+        Returns:
+            str: The endpoint to pass to analyze_image_with_azure.
+        """
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post(ANALYZE_PATH, self._handle_analyze)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.endpoint = f"http://{bound_host}:{bound_port}"
+        return self.endpoint
+
+    async def stop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_analyze(self, request):
+        """Answer an analyze request with the scripted objects."""
+        if not request.headers.get("Ocp-Apim-Subscription-Key"):
+            return web.json_response({"error": {"code": "401", "message": "Access denied"}}, status=401)
+        image_data = await request.read()
+        key = image_key(image_data)
+        self.requests += 1
+        self.request_keys.append(key)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.status != 200:
+            return web.json_response({"error": {"code": str(self.status), "message": "Stand-in error"}}, status=self.status)
+        objects = self._responses.get(key, [])
+        if self.on_response is not None:
+            self.on_response(key, objects)
+        return web.json_response({
+            "objects": objects,
+            "requestId": f"stand-in-{self.requests}",
+            "metadata": {"format": "Jpeg"},
+        })
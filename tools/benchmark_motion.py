@@ -0,0 +1,306 @@
+"""
+Offline micro-benchmark of the HomeAIVision motion path.
+
+Runs process_image and the threshold maths of periodic_check over deterministic
+synthetic JPEG sequences, for every combination of resolution and motion
+engine configuration. Each combination runs in a fresh process, so the peak
+RSS is attributable to it. Results are written as JSON and can be compared with
+a previous run:
+
+    python tools/benchmark_motion.py --output baseline.json
+    python tools/benchmark_motion.py --compare baseline.json
+
+Requires Pillow, attrs and voluptuous; Home Assistant is not needed.
+"""
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+import multiprocessing
+
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+from _integration import load_module, COMPONENT_DIR
+from synthetic_frames import RESOLUTIONS, generate_sequence
+
+SCHEMA_VERSION = 1
+
+# NOTE: Sample zones, an include band across the middle with an excluded corner
+SAMPLE_ZONES = [
+    {"mode": "include", "rect": [0.0, 0.25, 1.0, 0.75]},
+    {"mode": "exclude", "rect": [0.75, 0.25, 0.25, 0.25]},
+]
+
+ENGINES = {
+    "full": {"multi_scale": False, "zones": []},
+    "multi_scale": {"multi_scale": True, "zones": []},
+    "full_zones": {"multi_scale": False, "zones": SAMPLE_ZONES},
+    "multi_scale_zones": {"multi_scale": True, "zones": SAMPLE_ZONES},
+}
+
+
+def _proc_status_mib(field):
+    """Read a memory field of /proc/self/status in MiB, None where unavailable."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mib():
+    """Return the current resident set size of this process in MiB, None where unsupported."""
+    return _proc_status_mib("VmRSS")
+
+
+def reset_peak_rss():
+    """Reset the peak RSS counter on Linux, so the peak covers only what follows."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mib():
+    """Return the peak resident set size of this process in MiB, None where unsupported."""
+    # info: VmHWM belongs to the address space, ru_maxrss survives exec on Linux and would include the parent
+    peak = _proc_status_mib("VmHWM")
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # info: ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(sorted_values, percent):
+    """Return the nearest-rank percentile of a sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-percent * len(sorted_values) // 100))
+    return sorted_values[min(len(sorted_values), rank) - 1]
+
+
+def run_case(resolution, engine, sequence, warmup, sensitivity, history_size):
+    """
+    Benchmark one resolution and engine configuration. Runs in a child process.
+
+    The loop mirrors the motion path of periodic_check while no object is
+    present: process_image, motion history, dynamic threshold, blob filter and a
+    reference update on every frame without significant motion.
+
+    Args:
+        resolution (str): Key of RESOLUTIONS.
+        engine (str): Key of ENGINES.
+        sequence (list): JPEG frames, the first one becomes the reference.
+        warmup (int): Number of untimed frames after the reference.
+        sensitivity (str): local_sensitivity_level.
+        history_size (int): motion_detection_history_size.
+
+    Returns:
+        dict: Result of the case.
+    """
+    motion_detection = load_module("motion_detection")
+    detection_zones = load_module("detection_zones")
+    blob_analysis = load_module("blob_analysis")
+
+    size = RESOLUTIONS[resolution]
+    settings = ENGINES[engine]
+    baseline_rss = current_rss_mib()
+    reset_peak_rss()
+
+    reference = motion_detection.create_motion_frame(sequence[0])
+    min_area, min_threshold, max_threshold = motion_detection.calculate_scaled_thresholds(reference.image, sensitivity)
+    min_blob_area, max_blob_area = motion_detection.calculate_blob_thresholds(reference.image, 0.1, 60.0)
+    coarse_threshold = (
+        motion_detection.calculate_coarse_threshold(reference.image, min_threshold) if settings["multi_scale"] else None
+    )
+    zones_key = detection_zones.zones_key(settings["zones"])
+
+    motion_history = []
+    latencies = []
+    full_passes = 0
+    significant_frames = 0
+    for index, image_data in enumerate(sequence[1:]):
+        start = time.perf_counter()
+        motion_score, current, blobs = motion_detection.process_image(image_data, reference, zones_key, coarse_threshold)
+        motion_history.append(motion_score)
+        if len(motion_history) > history_size:
+            motion_history.pop(0)
+        threshold = motion_detection.calculate_dynamic_threshold(motion_history, min_area, min_threshold, max_threshold)
+        qualifying = blob_analysis.filter_blobs(blobs, min_blob_area, max_blob_area)
+        significant = motion_score > threshold and bool(qualifying)
+        if not significant:
+            reference = current
+        elapsed = time.perf_counter() - start
+
+        if index < warmup:
+            continue
+        latencies.append(elapsed)
+        full_passes += current.image is not None
+        significant_frames += significant
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "resolution": resolution,
+        "width": size[0],
+        "height": size[1],
+        "engine": engine,
+        "frames": len(latencies),
+        "fps": round(len(latencies) / total, 2) if total else None,
+        "latency_ms": {
+            "mean": round(1000 * total / len(latencies), 3),
+            "p50": round(1000 * percentile(latencies, 50), 3),
+            "p95": round(1000 * percentile(latencies, 95), 3),
+            "p99": round(1000 * percentile(latencies, 99), 3),
+            "max": round(1000 * latencies[-1], 3),
+        },
+        "full_resolution_passes": full_passes,
+        "significant_frames": significant_frames,
+        "baseline_rss_mib": baseline_rss,
+        "peak_rss_mib": peak_rss_mib(),
+    }
+
+
+def run_micro_benchmarks(history_size):
+    """
+    Time the threshold maths that run once per frame in periodic_check.
+
+    Returns:
+        list: One dict per measured function with the time per call in microseconds.
+    """
+    from PIL import Image
+
+    motion_detection = load_module("motion_detection")
+    image = Image.new("L", RESOLUTIONS["1080p"])
+    history = [float(value * 37 % 1000) for value in range(history_size)]
+    cases = {
+        "calculate_scaled_thresholds": lambda: motion_detection.calculate_scaled_thresholds(image, "medium"),
+        "calculate_dynamic_threshold": lambda: motion_detection.calculate_dynamic_threshold(history, 100, 50, 200),
+    }
+    results = []
+    for name, function in cases.items():
+        timer = timeit.Timer(function)
+        loops, _ = timer.autorange()
+        best = min(timer.repeat(repeat=5, number=loops)) / loops
+        results.append({"name": name, "history_size": history_size, "us_per_call": round(best * 1e6, 3)})
+    return results
+
+
+def metadata():
+    """Describe the environment of the run."""
+    from PIL import __version__ as pillow_version
+
+    manifest = json.loads((COMPONENT_DIR / "manifest.json").read_text())
+    return {
+        "integration_version": manifest.get("version"),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pillow": pillow_version,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare a run with a baseline file.
+
+    Args:
+        results (dict): The current run.
+        baseline (dict): A previous run.
+        tolerance (float): Allowed relative FPS drop, e.g. 0.1 for 10%.
+
+    Returns:
+        bool: True if no case regressed beyond the tolerance.
+    """
+    previous = {(case["resolution"], case["engine"]): case for case in baseline["results"]}
+    ok = True
+    print(f"\n{'case':<28} {'fps':>9} {'baseline':>9} {'change':>8} {'p95 ms':>9} {'baseline':>9}", file=sys.stderr)
+    for case in results["results"]:
+        old = previous.get((case["resolution"], case["engine"]))
+        if old is None or not old["fps"] or not case["fps"]:
+            continue
+        change = case["fps"] / old["fps"] - 1
+        regressed = change < -tolerance
+        ok = ok and not regressed
+        print(
+            f"{case['resolution'] + '/' + case['engine']:<28} {case['fps']:>9.2f} {old['fps']:>9.2f} "
+            f"{change:>+7.1%}{'!' if regressed else ' '} {case['latency_ms']['p95']:>9.2f} {old['latency_ms']['p95']:>9.2f}",
+            file=sys.stderr,
+        )
+    return ok
+
+
+def print_table(results):
+    """Print a human-readable summary to stderr."""
+    print(f"{'resolution':<10} {'engine':<18} {'fps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'full':>5} {'base MiB':>9} {'peak MiB':>9}", file=sys.stderr)
+    for case in results["results"]:
+        latency = case["latency_ms"]
+        print(
+            f"{case['resolution']:<10} {case['engine']:<18} {case['fps']:>8.2f} {latency['p50']:>8.2f} "
+            f"{latency['p95']:>8.2f} {latency['p99']:>8.2f} {case['full_resolution_passes']:>5} "
+            f"{case['baseline_rss_mib'] or 0:>9.1f} {case['peak_rss_mib'] or 0:>9.1f}",
+            file=sys.stderr,
+        )
+    for micro in results["micro"]:
+        print(f"{micro['name']:<30} {micro['us_per_call']:>10.3f} us/call", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resolutions", nargs="+", choices=list(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--frames", type=int, default=60, help="timed frames per case")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed frames per case")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--sensitivity", choices=["low", "medium", "high"], default="medium")
+    parser.add_argument("--history-size", type=int, default=10)
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative FPS drop before failing")
+    args = parser.parse_args()
+
+    results = {"schema": SCHEMA_VERSION, "metadata": metadata(), "results": [], "micro": []}
+    context = multiprocessing.get_context("spawn")
+    for resolution in args.resolutions:
+        # info: Generated once per resolution in the parent, so generation does not count towards the peak RSS
+        sequence = [frame.data for frame in generate_sequence(RESOLUTIONS[resolution], args.frames + args.warmup + 1, seed=args.seed)]
+        for engine in args.engines:
+            print(f"Benchmarking {resolution} / {engine}...", file=sys.stderr)
+            # info: A fresh process per case keeps the peak RSS of one case from leaking into the next
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results["results"].append(executor.submit(
+                    run_case, resolution, engine, sequence, args.warmup, args.sensitivity, args.history_size
+                ).result())
+    results["micro"] = run_micro_benchmarks(args.history_size)
+    print_table(results)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
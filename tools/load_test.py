@@ -0,0 +1,633 @@
+"""
+Multi-camera load test of the HomeAIVision camera tasks.
+
+Starts N simulated cameras and the Azure stand-in in a separate process, then
+runs the integration's periodic_check for every camera inside a Home Assistant
+core instance, exactly as async_setup_entry starts it. While the cameras run,
+the harness samples the event loop lag, the executor queue depth, CPU and
+memory of the Home Assistant process, and collects dropped frames, per-stage
+latencies and the detection latency of every synthetic object. Repeating the
+step for a growing N gives the capacity curve of the machine:
+
+    python tools/load_test.py --cameras 1 2 4 8 16 --output capacity.json
+
+Every simulated camera serves a snapshot (/camera/<n>/snapshot.jpg, polled by
+periodic_check) and an MJPEG stream (/camera/<n>/mjpeg) of synthetic footage
+with moving objects. The Azure stand-in recognises exactly the frames that show
+an object, so the detection latency is measured from the first frame showing
+an object to the Azure answer recognising it.
+
+Requires Home Assistant, the requirements of the integration and psutil.
+"""
+import sys
+import json
+import math
+import time
+import types
+import asyncio
+import logging
+import argparse
+import tempfile
+import importlib.util
+import threading
+import multiprocessing
+
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+from aiohttp import web
+
+from _integration import load_integration_module
+from synthetic_frames import RESOLUTIONS, generate_sequence
+from azure_stand_in import AzureStandIn, image_key
+from benchmark_motion import percentile, metadata
+
+SCHEMA_VERSION = 1
+LOAD_TEST_API_KEY = "load-test"
+OBJECT_NAME = "person"
+MJPEG_BOUNDARY = "frame"
+EXECUTOR_WORKERS = 64           # info: Size of the default executor created by the Home Assistant runner
+SAMPLE_INTERVAL = 0.1           # info: Seconds between two loop lag and executor samples
+RESOURCE_INTERVAL = 1.0         # info: Seconds between two CPU and memory samples
+
+
+def tag_frame(image_data, label):
+    """
+    Insert a JPEG comment segment after the SOI marker.
+
+    Cameras sharing a synthetic sequence serve byte-unique frames this way, so
+    an Azure request can be traced back to the camera it came from.
+
+    Args:
+        image_data (bytes): JPEG data.
+        label (str): ASCII text of the comment.
+
+    Returns:
+        bytes: The tagged JPEG data.
+    """
+    comment = label.encode("ascii")
+    return image_data[:2] + b"\xff\xfe" + (len(comment) + 2).to_bytes(2, "big") + comment + image_data[2:]
+
+
+def find_episodes(boxes):
+    """
+    Find the runs of consecutive frames showing at least one object.
+
+    Args:
+        boxes (list): Ground-truth boxes of every frame.
+
+    Returns:
+        list: (first_frame, last_frame) tuples.
+    """
+    episodes = []
+    first = None
+    for index, frame_boxes in enumerate(boxes):
+        if frame_boxes and first is None:
+            first = index
+        elif not frame_boxes and first is not None:
+            episodes.append((first, index - 1))
+            first = None
+    if first is not None:
+        episodes.append((first, len(boxes) - 1))
+    return episodes
+
+
+class SimulatedCamera:
+    """A camera looping over a synthetic sequence in real time."""
+
+    def __init__(self, frames, boxes, frame_interval, offset):
+        """
+        Initialize the SimulatedCamera.
+
+        Args:
+            frames (list): JPEG data of every frame.
+            boxes (list): Ground-truth boxes of every frame.
+            frame_interval (float): Seconds between two frames of the camera.
+            offset (int): Frame shown at the start, so cameras sharing a sequence are out of phase.
+        """
+        self.frames = frames
+        self.boxes = boxes
+        self.frame_interval = frame_interval
+        self.offset = offset
+        self.episodes = find_episodes(boxes)
+        self.start_time = time.monotonic()
+        self.snapshots = 0
+        self.mjpeg_clients = 0
+        self.azure_requests = 0
+        self.detections = {}        # info: Absolute first frame of a detected object occurrence -> detection latency
+        self._episode_of = {
+            index: episode for episode in self.episodes for index in range(episode[0], episode[1] + 1)
+        }
+
+    def absolute_frame(self, now):
+        """Return the number of frames shown since the start, including the offset."""
+        return int((now - self.start_time) / self.frame_interval) + self.offset
+
+    def frame_time(self, absolute_frame):
+        """Return the monotonic time an absolute frame was first shown."""
+        return self.start_time + (absolute_frame - self.offset) * self.frame_interval
+
+    def current_frame(self):
+        """Return the JPEG data of the frame shown now."""
+        return self.frames[self.absolute_frame(time.monotonic()) % len(self.frames)]
+
+    async def handle_snapshot(self, request):
+        """Serve the current frame."""
+        self.snapshots += 1
+        return web.Response(body=self.current_frame(), content_type="image/jpeg")
+
+    async def handle_mjpeg(self, request):
+        """Stream the frames as multipart MJPEG."""
+        response = web.StreamResponse(
+            headers={"Content-Type": f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"}
+        )
+        await response.prepare(request)
+        self.mjpeg_clients += 1
+        try:
+            while True:
+                frame = self.current_frame()
+                await response.write(
+                    f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(frame)}\r\n\r\n".encode()
+                    + frame
+                    + b"\r\n"
+                )
+                await asyncio.sleep(self.frame_interval)
+        except ConnectionResetError:
+            pass
+        finally:
+            self.mjpeg_clients -= 1
+        return response
+
+    def record_detection(self, index, now):
+        """
+        Record a positive Azure answer for a frame of this camera.
+
+        Only the first answer of every object occurrence counts, the latency is
+        measured from the first frame of the occurrence.
+
+        Args:
+            index (int): Index of the analysed frame within the sequence.
+            now (float): Monotonic time of the answer.
+        """
+        first, _ = self._episode_of[index]
+        current = self.absolute_frame(now)
+        # info: The analysed frame is the latest showing of this index, the occurrence started (index - first) frames earlier
+        shown = current - (current - index) % len(self.frames)
+        onset = shown - (index - first)
+        if onset not in self.detections:
+            self.detections[onset] = now - max(self.start_time, self.frame_time(onset))
+
+    def report(self, begin, end):
+        """
+        Summarize the object occurrences that started and ended within a time window.
+
+        Args:
+            begin (float): Monotonic start of the window.
+            end (float): Monotonic end of the window.
+
+        Returns:
+            dict: Number of occurrences, number of detected ones and their detection latencies.
+        """
+        first_frame = math.ceil((begin - self.start_time) / self.frame_interval) + self.offset
+        last_frame = self.absolute_frame(end)
+        length = len(self.frames)
+        latencies = []
+        events = 0
+        for first, last in self.episodes:
+            onset = first + math.ceil((first_frame - first) / length) * length
+            while onset + last - first <= last_frame:
+                events += 1
+                if onset in self.detections:
+                    latencies.append(self.detections[onset])
+                onset += length
+        return {
+            "events": events,
+            "latencies": latencies,
+            "snapshots": self.snapshots,
+            "azure_requests": self.azure_requests,
+        }
+
+
+def serve_simulation(connection, sequences, cameras, frame_interval, azure_latency):
+    """
+    Serve the simulated cameras and the Azure stand-in. Runs in a child process.
+
+    Sends the camera URLs and the Azure endpoint once serving, then waits for
+    "measure" to open the measurement window and "report" to close it and send
+    the detection report of every camera.
+
+    Args:
+        connection (Connection): Pipe to the load test.
+        sequences (list): (frames, boxes) tuples shared round-robin by the cameras.
+        cameras (int): Number of cameras.
+        frame_interval (float): Seconds between two frames of a camera.
+        azure_latency (float): Seconds the Azure stand-in waits before answering.
+    """
+    asyncio.run(_serve_simulation(connection, sequences, cameras, frame_interval, azure_latency))
+
+
+async def _serve_simulation(connection, sequences, cameras, frame_interval, azure_latency):
+    """Asynchronous part of serve_simulation."""
+    frame_owners = {}               # info: Image key -> (camera, frame index)
+    simulated = []
+
+    def on_response(key, objects):
+        owner = frame_owners.get(key)
+        if owner is None:
+            return
+        camera, index = owner
+        camera.azure_requests += 1
+        if objects:
+            camera.record_detection(index, time.monotonic())
+
+    azure = AzureStandIn(latency=azure_latency, on_response=on_response)
+    app = web.Application()
+    for number in range(cameras):
+        sequence_frames, boxes = sequences[number % len(sequences)]
+        frames = [tag_frame(data, f"HomeAIVision load test camera {number}") for data in sequence_frames]
+        camera = SimulatedCamera(frames, boxes, frame_interval, offset=number * 37 % len(frames))
+        simulated.append(camera)
+        for index, (data, frame_boxes) in enumerate(zip(frames, boxes)):
+            frame_owners[image_key(data)] = (camera, index)
+            if frame_boxes:
+                azure.add_response(data, [
+                    {"rectangle": {"x": x, "y": y, "w": w, "h": h}, "object": OBJECT_NAME, "confidence": 0.9}
+                    for x, y, w, h in frame_boxes
+                ])
+        app.router.add_get(f"/camera/{number}/snapshot.jpg", camera.handle_snapshot)
+        app.router.add_get(f"/camera/{number}/mjpeg", camera.handle_mjpeg)
+
+    azure_endpoint = await azure.start()
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    start_time = time.monotonic()
+    for camera in simulated:
+        camera.start_time = start_time
+    connection.send({
+        "azure_endpoint": azure_endpoint,
+        "cameras": [f"http://{host}:{port}/camera/{number}/snapshot.jpg" for number in range(cameras)],
+    })
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, connection.recv)
+    begin = time.monotonic()
+    await loop.run_in_executor(None, connection.recv)
+    end = time.monotonic()
+    connection.send([camera.report(begin, end) for camera in simulated])
+    await runner.cleanup()
+    await azure.stop()
+
+
+class LoadMonitor:
+    """
+    Sampler of the load of the Home Assistant process.
+
+    The event loop lag is measured by a task sleeping for a fixed interval; any
+    time beyond the interval is time the loop was busy with other callbacks.
+    Executor queue depth, CPU and memory are sampled by a thread, so the samples
+    are not delayed by a blocked loop.
+    """
+
+    def __init__(self, executor, simulation_pid):
+        """
+        Initialize the LoadMonitor.
+
+        Args:
+            executor (ThreadPoolExecutor): The default executor of the loop.
+            simulation_pid (int): PID of the process serving the cameras and the Azure stand-in.
+        """
+        self._executor = executor
+        self._process = psutil.Process()
+        self._simulation = psutil.Process(simulation_pid)
+        self._stop = threading.Event()
+        self._lag_task = None
+        self._thread = None
+        self.lag = []
+        self.queue_depth = []
+        self.threads = 0
+        self.process_cpu = []
+        self.system_cpu = []
+        self.simulation_cpu = []
+        self.rss = []
+
+    def start(self):
+        """Start sampling."""
+        # info: The first cpu_percent call only sets the starting point of the measurement
+        self._process.cpu_percent(None)
+        self._simulation.cpu_percent(None)
+        psutil.cpu_percent(None)
+        self.rss.append(self._process.memory_info().rss)
+        self._lag_task = asyncio.get_running_loop().create_task(self._sample_lag())
+        self._thread = threading.Thread(target=self._sample_resources, name="LoadMonitor", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        self._lag_task.cancel()
+        try:
+            await self._lag_task
+        except asyncio.CancelledError:
+            pass
+        self._thread.join()
+
+    async def _sample_lag(self):
+        """Measure how late the loop wakes up a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            self.lag.append(max(0.0, loop.time() - start - SAMPLE_INTERVAL))
+
+    def _sample_resources(self):
+        """Sample the executor, CPU and memory until stopped."""
+        next_resource_sample = time.monotonic() + RESOURCE_INTERVAL
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            # info: ThreadPoolExecutor keeps the jobs not yet picked up by a worker in _work_queue
+            self.queue_depth.append(self._executor._work_queue.qsize())
+            self.threads = max(self.threads, len(self._executor._threads))
+            if time.monotonic() >= next_resource_sample:
+                next_resource_sample += RESOURCE_INTERVAL
+                self.process_cpu.append(self._process.cpu_percent(None))
+                self.system_cpu.append(psutil.cpu_percent(None))
+                self.simulation_cpu.append(self._simulation.cpu_percent(None))
+                self.rss.append(self._process.memory_info().rss)
+
+    def summary(self):
+        """
+        Summarize the samples.
+
+        Returns:
+            dict: Loop lag, executor, CPU and memory figures.
+        """
+        lag = sorted(self.lag)
+        return {
+            "loop_lag_ms": {
+                "p50": round(1000 * percentile(lag, 50), 1) if lag else None,
+                "p95": round(1000 * percentile(lag, 95), 1) if lag else None,
+                "p99": round(1000 * percentile(lag, 99), 1) if lag else None,
+                "max": round(1000 * lag[-1], 1) if lag else None,
+            },
+            "executor": {
+                "workers": self._executor._max_workers,
+                "threads_max": self.threads,
+                "queue_depth_mean": round(_mean(self.queue_depth), 2),
+                "queue_depth_max": max(self.queue_depth, default=0),
+            },
+            "cpu_percent": {
+                "process_mean": round(_mean(self.process_cpu), 1),
+                "process_max": max(self.process_cpu, default=0.0),
+                "system_mean": round(_mean(self.system_cpu), 1),
+                "simulation_mean": round(_mean(self.simulation_cpu), 1),
+            },
+            "memory_mib": {
+                "rss_start": round(self.rss[0] / 2**20, 1),
+                "rss_max": round(max(self.rss) / 2**20, 1),
+            },
+        }
+
+
+def _mean(values):
+    """Return the mean of a list, 0.0 for an empty one."""
+    return sum(values) / len(values) if values else 0.0
+
+
+def merge_stage(pipeline_metrics, stage):
+    """
+    Merge the histograms of one stage over all cameras.
+
+    Args:
+        pipeline_metrics (list): PipelineMetrics of every camera.
+        stage (str): The pipeline stage.
+
+    Returns:
+        dict: Summary of the merged histogram.
+    """
+    metrics_module = load_integration_module("pipeline_metrics")
+    merged = metrics_module.LatencyHistogram()
+    for metrics in pipeline_metrics:
+        histogram = metrics.histograms[stage]
+        merged.counts = [total + count for total, count in zip(merged.counts, histogram.counts)]
+        merged.count += histogram.count
+        merged.sum += histogram.sum
+        merged.max = max(merged.max, histogram.max)
+    return merged.summary()
+
+
+async def run_step(hass, executor, cameras, sequences, args):
+    """
+    Run all camera tasks against N simulated cameras and measure the load.
+
+    Args:
+        hass (HomeAssistant): The Home Assistant instance.
+        executor (ThreadPoolExecutor): The default executor of the loop.
+        cameras (int): Number of cameras.
+        sequences (list): (frames, boxes) tuples shared by the cameras.
+        args (Namespace): Command line arguments.
+
+    Returns:
+        dict: Result of the step.
+    """
+    const = load_integration_module("const")
+    store_module = load_integration_module("store")
+    camera_processing = load_integration_module("camera_processing")
+    metrics_module = load_integration_module("pipeline_metrics")
+    loop_watchdog = load_integration_module("loop_watchdog")
+
+    context = multiprocessing.get_context("spawn")
+    connection, child_connection = context.Pipe()
+    simulation = context.Process(
+        target=serve_simulation,
+        args=(child_connection, sequences, cameras, args.frame_interval, args.azure_latency),
+        daemon=True,
+    )
+    simulation.start()
+    # info: Blocking is fine here, no camera task runs yet
+    setup = connection.recv()
+
+    store = store_module.HomeAIVisionStore(hass)
+    watchdog = loop_watchdog.LoopWatchdog(hass)
+    hass.data[const.DOMAIN] = {'store': store, 'camera_tasks': {}, 'watchdog': watchdog}
+    watchdog.start()
+    # info: periodic_check reads only the Azure credentials of the config entry
+    entry = types.SimpleNamespace(data={
+        const.CONF_AZURE_API_KEY: LOAD_TEST_API_KEY,
+        const.CONF_AZURE_ENDPOINT: setup["azure_endpoint"],
+    })
+    for number, url in enumerate(setup["cameras"]):
+        device = store_module.DeviceData(
+            id=f"load_test_{number:02d}",
+            name=f"Load test {number:02d}",
+            url=url,
+            to_detect_object=OBJECT_NAME,
+            azure_confidence_threshold=0.5,
+            motion_detection_interval=args.interval,
+            config_entry_id="load_test",
+        )
+        await store.async_add_device(device)
+        # info: The cameras warm up camera_start_concurrency at a time, as after a restart
+        camera_processing.start_camera_task(hass, entry, device.asdict())
+
+    await asyncio.sleep(args.warmup)
+    pipeline_metrics = list(hass.data[const.DOMAIN].get('pipeline_metrics', {}).values())
+    for metrics in pipeline_metrics:
+        metrics.reset()
+    monitor = LoadMonitor(executor, simulation.pid)
+    monitor.start()
+    connection.send("measure")
+    await asyncio.sleep(args.duration)
+    connection.send("report")
+    await monitor.stop()
+
+    camera_tasks = hass.data[const.DOMAIN]['camera_tasks']
+    for _, stop_event in camera_tasks.values():
+        stop_event.set()
+    _, pending = await asyncio.wait([task for task, _ in camera_tasks.values()], timeout=30)
+    for task in pending:
+        task.cancel()
+    await watchdog.async_stop()
+    camera_reports = connection.recv()
+    simulation.join(timeout=10)
+    if simulation.is_alive():
+        simulation.terminate()
+
+    processed = sum(metrics.frames_processed for metrics in pipeline_metrics)
+    dropped = sum(metrics.frames_dropped for metrics in pipeline_metrics)
+    expected = cameras * args.duration / args.interval
+    latencies = sorted(latency for report in camera_reports for latency in report["latencies"])
+    events = sum(report["events"] for report in camera_reports)
+    result = {
+        "cameras": cameras,
+        "duration_s": args.duration,
+        **monitor.summary(),
+        "frames": {
+            "expected": round(expected),
+            "processed": processed,
+            "dropped": dropped,
+            "achieved_ratio": round(processed / expected, 3) if expected else None,
+            "fps_per_camera": round(processed / cameras / args.duration, 3),
+        },
+        "stages": {stage: merge_stage(pipeline_metrics, stage) for stage in metrics_module.STAGES},
+        "watchdog": watchdog.as_dict(),
+        "azure_requests": sum(report["azure_requests"] for report in camera_reports),
+        "detection": {
+            "events": events,
+            "detected": len(latencies),
+            "recall": round(len(latencies) / events, 3) if events else None,
+            "latency_ms": {
+                "p50": round(1000 * percentile(latencies, 50)) if latencies else None,
+                "p95": round(1000 * percentile(latencies, 95)) if latencies else None,
+                "max": round(1000 * latencies[-1]) if latencies else None,
+            },
+        },
+    }
+    result["saturated"] = (
+        (result["loop_lag_ms"]["p95"] or 0) > args.max_lag_ms
+        or result["frames"]["achieved_ratio"] < args.min_frame_ratio
+    )
+    return result
+
+
+async def async_main(args, sequences):
+    """Run every step in one Home Assistant instance."""
+    from homeassistant.core import HomeAssistant  # type: ignore
+    from homeassistant.const import __version__ as ha_version  # type: ignore
+
+    # NOTE: A default executor of the runner's size, kept at hand to read its queue
+    executor = ThreadPoolExecutor(max_workers=args.executor_workers, thread_name_prefix="SyncWorker")
+    asyncio.get_running_loop().set_default_executor(executor)
+
+    results = {"schema": SCHEMA_VERSION, "metadata": {**metadata(), "homeassistant": ha_version}, "settings": {
+        "resolution": args.resolution,
+        "interval": args.interval,
+        "frame_interval": args.frame_interval,
+        "azure_latency": args.azure_latency,
+        "warmup": args.warmup,
+        "duration": args.duration,
+    }, "steps": []}
+    with tempfile.TemporaryDirectory(prefix="homeaivision-load-test-") as config_dir:
+        hass = HomeAssistant(config_dir)
+        for cameras in args.cameras:
+            print(f"Running {cameras} camera(s) for {args.warmup + args.duration:.0f} s...", file=sys.stderr)
+            step = await run_step(hass, executor, cameras, sequences, args)
+            results["steps"].append(step)
+            if step["saturated"] and args.stop_when_saturated:
+                break
+    capacity = 0
+    for step in results["steps"]:
+        if step["saturated"]:
+            break
+        capacity = step["cameras"]
+    results["capacity"] = capacity
+    return results
+
+
+def print_table(results):
+    """Print the capacity curve to stderr."""
+    print(
+        f"{'cams':>4} {'lag p95':>8} {'lag max':>8} {'queue':>6} {'cpu %':>6} {'sim %':>6} {'rss MiB':>8} "
+        f"{'frames':>7} {'drop':>5} {'frame p95':>10} {'azure':>6} {'recall':>7} {'det p95':>8}",
+        file=sys.stderr,
+    )
+    for step in results["steps"]:
+        detection = step["detection"]
+        print(
+            f"{step['cameras']:>4} {step['loop_lag_ms']['p95'] or 0:>8.1f} {step['loop_lag_ms']['max'] or 0:>8.1f} "
+            f"{step['executor']['queue_depth_max']:>6} {step['cpu_percent']['process_mean']:>6.1f} "
+            f"{step['cpu_percent']['simulation_mean']:>6.1f} {step['memory_mib']['rss_max']:>8.1f} "
+            f"{step['frames']['achieved_ratio']:>7.1%} {step['frames']['dropped']:>5} "
+            f"{step['stages']['frame']['p95_ms'] or 0:>10.1f} {step['azure_requests']:>6} "
+            f"{'-' if detection['recall'] is None else format(detection['recall'], '.0%'):>7} "
+            f"{detection['latency_ms']['p95'] or 0:>8}{' saturated' if step['saturated'] else ''}",
+            file=sys.stderr,
+        )
+    print(f"Capacity: {results['capacity']} camera(s) within the limits", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cameras", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="camera counts to run")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="1080p")
+    parser.add_argument("--frames", type=int, default=120, help="frames per synthetic sequence")
+    parser.add_argument("--sequences", type=int, default=2, help="distinct sequences shared by the cameras")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--frame-interval", type=float, default=0.5, help="seconds between two camera frames")
+    parser.add_argument("--interval", type=float, default=1.0, help="motion_detection_interval of every camera")
+    parser.add_argument("--azure-latency", type=float, default=0.8, help="seconds the Azure stand-in takes to answer")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds before measuring each step")
+    parser.add_argument("--duration", type=float, default=60.0, help="measured seconds of each step")
+    parser.add_argument("--executor-workers", type=int, default=EXECUTOR_WORKERS)
+    parser.add_argument("--max-lag-ms", type=float, default=100.0, help="p95 loop lag above which a step is saturated")
+    parser.add_argument("--min-frame-ratio", type=float, default=0.5, help="share of expected frames below which a step is saturated")
+    parser.add_argument("--stop-when-saturated", action="store_true", help="skip the remaining steps after the first saturated one")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("homeassistant") is None:
+        parser.exit(2, "load_test.py runs the camera tasks inside Home Assistant, install homeassistant first.\n")
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    print(f"Generating {args.sequences} {args.resolution} sequence(s)...", file=sys.stderr)
+    sequences = []
+    for number in range(args.sequences):
+        sequence = generate_sequence(
+            RESOLUTIONS[args.resolution], args.frames, seed=args.seed + number, objects=3, interval=args.frame_interval
+        )
+        sequences.append(([frame.data for frame in sequence], [frame.boxes for frame in sequence]))
+
+    results = asyncio.run(async_main(args, sequences))
+    print_table(results)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
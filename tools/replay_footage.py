@@ -0,0 +1,582 @@
+"""
+Replay recorded footage through the HomeAIVision detection logic.
+
+Feeds a directory of timestamped JPEG frames through process_image and
+CameraDetectionState, the same code periodic_check runs, in simulated time:
+every loop iteration picks the latest frame recorded before the simulated
+clock, and the clock advances by the processing time, the Azure latency and
+motion_detection_interval, as it would on a live camera. Azure is replaced by
+a local aiohttp stand-in (azure_stand_in.py) answering with the ground-truth
+or scripted objects of each frame, so the real azure_client is used without
+network access or cost.
+
+The directory holds *.jpg files and optionally labels.json (as written by
+synthetic_frames.py):
+
+    {"frames": [{"file": "000000.jpg", "timestamp": 0.0, "objects": [...]}]}
+
+where "objects" uses the format of the Azure analyze response. Without
+labels.json the timestamps are taken from numeric file names, or from the file
+modification times, and Azure detects nothing unless --responses is given.
+
+    python tools/replay_footage.py footage/ --set local_sensitivity_level=high
+    python tools/replay_footage.py footage/ --variants policies.json --output replay.json
+
+Requires Pillow, attrs, voluptuous and aiohttp; Home Assistant is not needed.
+"""
+import io
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from pathlib import Path
+from types import SimpleNamespace
+from collections import Counter, namedtuple
+
+from PIL import Image
+
+from _integration import load_module
+from azure_stand_in import AzureStandIn
+from synthetic_frames import LABELS_FILE
+
+SCHEMA_VERSION = 1
+DEFAULT_AZURE_LATENCY = 0.8         # info: Simulated Azure round trip in seconds, the local stand-in answers instantly
+REPLAY_API_KEY = "replay-key"
+
+# NOTE: DeviceData defaults, the settings of a replayed camera
+DEVICE_DEFAULTS = {
+    "id": "replay",
+    "name": "Replay",
+    "to_detect_object": "person",
+    "azure_confidence_threshold": 0.6,
+    "motion_detection_history_size": 10,
+    "motion_mad_multiplier": 2.0,
+    "motion_detection_interval": 5,
+    "local_sensitivity_level": "medium",
+    "min_blob_area_percentage": 0.1,
+    "max_blob_area_percentage": 60.0,
+    "detection_zones": [],
+    "multi_scale_motion_detection": True,
+    "motion_confirmation_frames": 1,
+    "motion_confirmation_window": 1,
+    "motion_confirmation_overlap": False,
+    "azure_initial_requests": 5,
+    "azure_backoff_factor": 2.0,
+    "azure_max_request_gap": 8,
+    "azure_escalation_score_ratio": 2.0,
+    "max_unknown_object_counter": 20,
+}
+
+RecordedFrame = namedtuple("RecordedFrame", ["index", "file", "timestamp", "data", "objects"])
+GroundTruthEvent = namedtuple("GroundTruthEvent", ["first_frame", "last_frame", "start", "end"])
+
+
+class SimulatedClock:
+    """Clock of the replay, advanced explicitly instead of following the wall clock."""
+
+    def __init__(self, now):
+        """
+        Initialize the SimulatedClock.
+
+        Args:
+            now (float): Start time in seconds.
+        """
+        self.now = now
+
+    def __call__(self):
+        """Return the simulated time, so the clock can replace time.monotonic."""
+        return self.now
+
+
+def _timestamp_from_file(path):
+    """Return the timestamp encoded in a numeric file name, or the modification time."""
+    try:
+        return float(path.stem)
+    except ValueError:
+        return path.stat().st_mtime
+
+
+def load_footage(directory, responses_path=None, load_data=True):
+    """
+    Load recorded frames with their timestamps and objects.
+
+    Args:
+        directory (str): Directory with the JPEG files and optional labels.json.
+        responses_path (str, optional): JSON file mapping file names to scripted
+            Azure objects, taking precedence over labels.json.
+        load_data (bool): Read the JPEG data, otherwise data is None and read on demand by the caller.
+
+    Returns:
+        list: RecordedFrame tuples sorted by timestamp.
+    """
+    directory = Path(directory)
+    labels_path = directory / LABELS_FILE
+    if labels_path.exists():
+        entries = json.loads(labels_path.read_text(encoding="utf-8"))["frames"]
+    else:
+        files = sorted(path for path in directory.iterdir() if path.suffix.lower() in (".jpg", ".jpeg"))
+        entries = [{"file": path.name, "timestamp": _timestamp_from_file(path), "objects": []} for path in files]
+    scripted = {}
+    if responses_path:
+        with open(responses_path, encoding="utf-8") as file:
+            scripted = json.load(file)
+
+    entries = sorted(entries, key=lambda entry: entry["timestamp"])
+    return [
+        RecordedFrame(
+            index,
+            entry["file"],
+            float(entry["timestamp"]),
+            (directory / entry["file"]).read_bytes() if load_data else None,
+            scripted.get(entry["file"], entry.get("objects", [])),
+        )
+        for index, entry in enumerate(entries)
+    ]
+
+
+def replay_device(overrides=None):
+    """
+    Build the settings of a replayed camera.
+
+    Args:
+        overrides (dict, optional): DeviceData fields to change.
+
+    Returns:
+        SimpleNamespace: Object with the attributes of DeviceData used by the detection logic.
+    """
+    settings = dict(DEVICE_DEFAULTS)
+    unknown = set(overrides or {}) - set(settings)
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+    settings.update(overrides or {})
+    return SimpleNamespace(**settings)
+
+
+def target_matcher(device, image_size):
+    """
+    Build a check telling if a frame shows an object the integration would report.
+
+    An object counts when Azure's detection of it would be accepted: it matches
+    to_detect_object (or has it as a parent), reaches the confidence threshold
+    and lies within the detection zones.
+
+    Args:
+        device (SimpleNamespace): Settings of the replayed camera.
+        image_size (tuple): (width, height) of the frames.
+
+    Returns:
+        callable: Takes a RecordedFrame and returns a bool.
+    """
+    azure_client = load_module("azure_client")
+
+    def shows_target(frame):
+        for item in frame.objects:
+            object_name, confidence = azure_client.extract_object_with_hierarchy(item, [device.to_detect_object])
+            if object_name is None or confidence < device.azure_confidence_threshold:
+                continue
+            if device.detection_zones and not azure_client.is_detection_in_zones(
+                item["rectangle"], image_size, device.detection_zones
+            ):
+                continue
+            return True
+        return False
+
+    return shows_target
+
+
+def footage_size(footage):
+    """Return the (width, height) of the footage, read from the first frame."""
+    with Image.open(io.BytesIO(footage[0].data)) as image:
+        return image.size
+
+
+def ground_truth_events(footage, device, image_size=None):
+    """
+    Group consecutive frames showing a target object into events.
+
+    Args:
+        footage (list): RecordedFrame tuples.
+        device (SimpleNamespace): Settings of the replayed camera.
+        image_size (tuple, optional): (width, height) of the frames, read from the first frame if omitted.
+
+    Returns:
+        list: GroundTruthEvent tuples.
+    """
+    shows_target = target_matcher(device, image_size or footage_size(footage))
+    events = []
+    first = None
+    for frame in footage:
+        if shows_target(frame):
+            if first is None:
+                first = frame
+            last = frame
+        elif first is not None:
+            events.append(GroundTruthEvent(first.index, last.index, first.timestamp, last.timestamp))
+            first = None
+    if first is not None:
+        events.append(GroundTruthEvent(first.index, last.index, first.timestamp, last.timestamp))
+    return events
+
+
+class ImageProcessor:
+    """Runs the motion detection of periodic_check on the recorded JPEG data."""
+
+    def __init__(self, device):
+        """
+        Initialize the ImageProcessor.
+
+        Args:
+            device (SimpleNamespace): Settings of the replayed camera.
+        """
+        self._motion_detection = load_module("motion_detection")
+        self._zones_key = load_module("detection_zones").zones_key(device.detection_zones)
+
+    def initialize(self, frame):
+        """Decode the first frame, which becomes the reference."""
+        return self._motion_detection.create_motion_frame(frame.data)
+
+    def process(self, frame, reference_frame, coarse_threshold):
+        """Return (motion_score, current_frame, blobs) of a frame, as process_image does in periodic_check."""
+        return self._motion_detection.process_image(frame.data, reference_frame, self._zones_key, coarse_threshold)
+
+
+class StandInAnalyzer:
+    """Sends frames to the Azure stand-in through the real azure_client."""
+
+    def __init__(self, endpoint, device):
+        """
+        Initialize the StandInAnalyzer.
+
+        Args:
+            endpoint (str): Endpoint of the AzureStandIn.
+            device (SimpleNamespace): Settings of the replayed camera.
+        """
+        self._azure_client = load_module("azure_client")
+        self._endpoint = endpoint
+        self._device = device
+
+    async def analyze(self, frame):
+        """
+        Analyze a recorded frame.
+
+        Returns:
+            tuple: (detected, annotated) where annotated tells if an annotated image was returned.
+        """
+        detected, modified_image_data, _ = await self._azure_client.analyze_image_with_azure(
+            frame.data,
+            REPLAY_API_KEY,
+            self._endpoint,
+            [self._device.to_detect_object],
+            self._device.azure_confidence_threshold,
+            self._device.detection_zones,
+        )
+        return detected, modified_image_data is not None
+
+
+class GroundTruthAnalyzer:
+    """Answers Azure requests from the labels directly, without HTTP or image encoding."""
+
+    def __init__(self, device, image_size):
+        """
+        Initialize the GroundTruthAnalyzer.
+
+        Args:
+            device (SimpleNamespace): Settings of the replayed camera.
+            image_size (tuple): (width, height) of the frames.
+        """
+        self._shows_target = target_matcher(device, image_size)
+
+    async def analyze(self, frame):
+        """Return (detected, annotated) for a recorded frame."""
+        detected = self._shows_target(frame)
+        return detected, detected
+
+
+async def replay(
+    footage,
+    device,
+    processor,
+    analyzer,
+    budget=0,
+    azure_latency=DEFAULT_AZURE_LATENCY,
+    processing_time=None,
+):
+    """
+    Run the detection logic over the footage in simulated time.
+
+    The recorded frame is passed to CameraDetectionState as the image payload,
+    so the frame chosen for Azure by the confirmation window is known directly.
+
+    Args:
+        footage (list): RecordedFrame tuples sorted by timestamp.
+        device (SimpleNamespace): Settings of the replayed camera.
+        processor: Object with initialize(frame) and process(frame, reference_frame,
+            coarse_threshold), e.g. ImageProcessor.
+        analyzer: Object with an async analyze(frame) returning (detected, annotated),
+            e.g. StandInAnalyzer.
+        budget (int): Global Azure request budget, 0 for unlimited.
+        azure_latency (float): Simulated seconds per Azure request.
+        processing_time (float, optional): Simulated seconds per processed frame,
+            None to use the measured processing time.
+
+    Returns:
+        dict: The simulated Azure requests, decisions and processing times.
+    """
+    detection_state = load_module("detection_state")
+
+    clock = SimulatedClock(footage[0].timestamp)
+    state = detection_state.CameraDetectionState(clock=clock)
+
+    requests = []
+    actions = Counter()
+    processing_times = []
+    processed_frames = set()
+    unknown_object_notifications = 0
+    position = 0
+    while clock.now <= footage[-1].timestamp:
+        # NOTE: A snapshot camera returns its latest frame
+        while position + 1 < len(footage) and footage[position + 1].timestamp <= clock.now:
+            position += 1
+        frame = footage[position]
+        processed_frames.add(frame.index)
+        tick = clock.now
+        state.configure(device)
+
+        start = time.perf_counter()
+        decision = None
+        if state.reference_frame is None:
+            state.initialize_reference(processor.initialize(frame), device)
+        else:
+            motion_score, current_frame, blobs = processor.process(
+                frame,
+                state.reference_frame,
+                state.coarse_threshold if device.multi_scale_motion_detection else None,
+            )
+            budget_ratio = max(0.0, min(1.0, 1 - len(requests) / budget)) if budget > 0 else 1.0
+            decision = state.evaluate(motion_score, current_frame, blobs, frame, device, budget_ratio)
+        elapsed = time.perf_counter() - start
+        processing_times.append(elapsed)
+        clock.now = tick + (elapsed if processing_time is None else processing_time)
+
+        if decision is not None:
+            actions[decision.action] += 1
+            unknown_object = decision.unknown_object
+            if decision.action == detection_state.ACTION_REQUEST_AZURE:
+                detected, annotated = await analyzer.analyze(decision.azure_image_data)
+                clock.now += azure_latency
+                requests.append({
+                    "time": clock.now,
+                    "frame": decision.azure_image_data.index,
+                    "reason": decision.sampling_reason,
+                    "detected": detected,
+                })
+                unknown_object = state.record_azure_result(detected, current_frame)
+                if detected and annotated:
+                    state.motion_history.clear()
+            unknown_object_notifications += unknown_object
+
+        clock.now += device.motion_detection_interval
+
+    return {
+        "requests": requests,
+        "actions": dict(actions),
+        "processing_times": processing_times,
+        "processed_frames": len(processed_frames),
+        "iterations": len(processing_times),
+        "unknown_object_notifications": unknown_object_notifications,
+    }
+
+
+def _percentile(sorted_values, percent):
+    """Return the nearest-rank percentile of a sorted list, None if empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-percent * len(sorted_values) // 100))
+    return sorted_values[min(len(sorted_values), rank) - 1]
+
+
+def score(footage, events, run):
+    """
+    Match the Azure detections of a replay with the ground-truth events.
+
+    Args:
+        footage (list): RecordedFrame tuples.
+        events (list): GroundTruthEvent tuples.
+        run (dict): Result of replay.
+
+    Returns:
+        dict: Report of the replay.
+    """
+    event_details = []
+    matched = set()
+    for event in events:
+        detections = [
+            request for request in run["requests"]
+            if request["detected"] and request["frame"] is not None and event.first_frame <= request["frame"] <= event.last_frame
+        ]
+        matched.update(id(request) for request in detections)
+        event_details.append({
+            "start": event.start,
+            "end": event.end,
+            "caught": bool(detections),
+            "latency_s": round(detections[0]["time"] - event.start, 3) if detections else None,
+            "azure_calls": sum(
+                1 for request in run["requests"]
+                if request["frame"] is not None and event.first_frame <= request["frame"] <= event.last_frame
+            ),
+        })
+
+    duration = footage[-1].timestamp - footage[0].timestamp
+    calls = len(run["requests"])
+    detected_calls = sum(1 for request in run["requests"] if request["detected"])
+    latencies = sorted(detail["latency_s"] for detail in event_details if detail["caught"])
+    processing = sorted(run["processing_times"])
+    caught = sum(1 for detail in event_details if detail["caught"])
+    return {
+        "azure": {
+            "calls": calls,
+            "calls_with_detection": detected_calls,
+            "calls_without_detection": calls - detected_calls,
+            "calls_per_hour": round(calls * 3600 / duration, 1) if duration else None,
+            "reasons": dict(Counter(request["reason"] for request in run["requests"])),
+        },
+        "events": {
+            "total": len(events),
+            "caught": caught,
+            "missed": len(events) - caught,
+            "recall": round(caught / len(events), 3) if events else None,
+            "unmatched_detections": sum(
+                1 for request in run["requests"] if request["detected"] and id(request) not in matched
+            ),
+        },
+        "detection_latency_s": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": latencies[-1] if latencies else None,
+        },
+        "processing_ms": {
+            "p50": round(1000 * _percentile(processing, 50), 3) if processing else None,
+            "p95": round(1000 * _percentile(processing, 95), 3) if processing else None,
+        },
+        "frames": {
+            "recorded": len(footage),
+            "processed": run["processed_frames"],
+            "iterations": run["iterations"],
+            "actions": run["actions"],
+        },
+        "unknown_object_notifications": run["unknown_object_notifications"],
+        "event_details": event_details,
+    }
+
+
+def _parse_setting(text):
+    """Parse a --set KEY=VALUE argument, the value is read as JSON when possible."""
+    key, separator, value = text.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got {text!r}")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def print_table(report):
+    """Print a human-readable comparison of the variants to stderr."""
+    print(
+        f"{'variant':<20} {'calls':>6} {'calls/h':>8} {'wasted':>7} {'events':>7} {'caught':>7} "
+        f"{'recall':>7} {'lat p50 s':>10} {'lat max s':>10} {'unknown':>8}",
+        file=sys.stderr,
+    )
+    for name, result in report["variants"].items():
+        latency = result["detection_latency_s"]
+        print(
+            f"{name:<20} {result['azure']['calls']:>6} {result['azure']['calls_per_hour'] or 0:>8.1f} "
+            f"{result['azure']['calls_without_detection']:>7} {result['events']['total']:>7} "
+            f"{result['events']['caught']:>7} {result['events']['recall'] or 0:>7.2f} "
+            f"{latency['p50'] if latency['p50'] is not None else '-':>10} "
+            f"{latency['max'] if latency['max'] is not None else '-':>10} "
+            f"{result['unknown_object_notifications']:>8}",
+            file=sys.stderr,
+        )
+
+
+async def async_main(args):
+    footage = load_footage(args.directory, args.responses)
+    if not footage:
+        raise SystemExit(f"No frames found in {args.directory}")
+
+    variants = {"default": {}}
+    if args.variants:
+        with open(args.variants, encoding="utf-8") as file:
+            variants = json.load(file)
+    overrides = dict(args.set)
+
+    stand_in = AzureStandIn()
+    for frame in footage:
+        stand_in.add_response(frame.data, frame.objects)
+    endpoint = await stand_in.start()
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "footage": {
+            "directory": str(args.directory),
+            "frames": len(footage),
+            "duration_s": round(footage[-1].timestamp - footage[0].timestamp, 3),
+        },
+        "azure_latency_s": args.azure_latency,
+        "budget": args.budget,
+        "variants": {},
+    }
+    try:
+        for name, variant in variants.items():
+            device = replay_device({**variant, **overrides})
+            print(f"Replaying {name}...", file=sys.stderr)
+            requests_before = stand_in.requests
+            run = await replay(
+                footage,
+                device,
+                ImageProcessor(device),
+                StandInAnalyzer(endpoint, device),
+                args.budget,
+                args.azure_latency,
+                args.processing_time,
+            )
+            result = score(footage, ground_truth_events(footage, device), run)
+            # info: Every simulated request must have reached the stand-in through azure_client
+            result["azure"]["stand_in_requests"] = stand_in.requests - requests_before
+            result["settings"] = vars(device)
+            report["variants"][name] = result
+    finally:
+        await stand_in.stop()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", help="directory with the recorded JPEG frames")
+    parser.add_argument("--set", type=_parse_setting, action="append", default=[], metavar="KEY=VALUE",
+                        help="DeviceData setting applied to every variant, e.g. local_sensitivity_level=high")
+    parser.add_argument("--variants", help="JSON file mapping variant names to DeviceData settings")
+    parser.add_argument("--responses", help="JSON file mapping file names to scripted Azure objects")
+    parser.add_argument("--budget", type=int, default=0, help="global Azure request budget, 0 for unlimited")
+    parser.add_argument("--azure-latency", type=float, default=DEFAULT_AZURE_LATENCY, help="simulated seconds per Azure request")
+    parser.add_argument("--processing-time", type=float,
+                        help="simulated seconds per processed frame, measured when omitted")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(async_main(args))
+    print_table(report)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
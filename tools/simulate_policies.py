@@ -0,0 +1,179 @@
+"""
+Deterministic simulation of the HomeAIVision Azure sampling policy and adaptive interval.
+
+Feeds scripted sequences of significant-motion frames through simulate_policy
+(sampling_policy.py) and checks the decision and reason of every frame against
+the expected sequence: the initial burst, the growing back-off, an escalation
+on a motion score jump, a drop of the request budget and the end of an event
+by a detection or by max_unknown_object_counter. Scripted quiet, rising and
+active frames are fed through simulate_interval (adaptive_interval.py) the same
+way and every polling interval is checked. A change of either schedule that
+alters any decision makes the check fail.
+
+    python tools/simulate_policies.py
+    python tools/simulate_policies.py --show
+
+Requires attrs; Home Assistant is not needed.
+"""
+import sys
+import math
+import argparse
+
+from _integration import load_module
+
+sampling_policy = load_module("sampling_policy")
+adaptive_interval = load_module("adaptive_interval")
+
+START = sampling_policy.REASON_START
+BURST = sampling_policy.REASON_BURST
+BACKOFF = sampling_policy.REASON_BACKOFF
+ESCALATION = sampling_policy.REASON_ESCALATION
+WAITING = sampling_policy.REASON_WAITING
+EXHAUSTED = sampling_policy.REASON_BUDGET_EXHAUSTED
+REQUEST_REASONS = (START, BURST, BACKOFF, ESCALATION)
+
+
+def _frames(count, motion_score=10.0, **extra):
+    """Return `count` scripted frames with the same motion score."""
+    return [dict(motion_score=motion_score, **extra) for _ in range(count)]
+
+
+# NOTE: Scenario name -> (policy parameters, frames, expected reason of every frame)
+POLICY_SCENARIOS = {
+    # info: 5 consecutive requests, then gaps of 2, 4 and 8 frames
+    "burst_and_backoff": (
+        {},
+        _frames(20),
+        [START, BURST, BURST, BURST, BURST]
+        + [WAITING, BACKOFF]
+        + [WAITING] * 3 + [BACKOFF]
+        + [WAITING] * 7 + [BACKOFF]
+        + [WAITING],
+    ),
+    # info: The score more than doubles 2 frames after a request, the back-off starts over
+    "escalation": (
+        {},
+        _frames(8) + _frames(4, motion_score=25.0),
+        [START, BURST, BURST, BURST, BURST, WAITING, BACKOFF, WAITING, ESCALATION, BURST, BURST, BURST],
+    ),
+    # info: No request while the budget is exhausted, then every gap is doubled with half of it left
+    "budget_drop": (
+        {},
+        _frames(3) + _frames(3, budget_ratio=0.0) + _frames(8, budget_ratio=0.5),
+        [START, BURST, BURST, EXHAUSTED, EXHAUSTED, EXHAUSTED, WAITING, BACKOFF, WAITING, BACKOFF]
+        + [WAITING] * 3 + [BACKOFF],
+    ),
+    # info: A detection ends the event, the next frame starts a new one
+    "detection_ends_event": (
+        {},
+        _frames(1) + _frames(1, detected=True) + _frames(2),
+        [START, BURST, START, BURST],
+    ),
+    # info: The event is abandoned at max_unknown_object_counter and starts over
+    "unknown_object_limit": (
+        {"max_unknown_object_counter": 4},
+        _frames(6),
+        [START, BURST, BURST, BURST, START, BURST],
+    ),
+}
+
+
+QUIET = (0.0, 10.0, False)         # info: (motion_score, dynamic_threshold, active)
+RISING = (6.0, 10.0, False)
+MOTION = (20.0, 10.0, True)
+
+# NOTE: Scenario name -> (min_interval, max_interval, frames, expected interval after every frame)
+INTERVAL_SCENARIOS = {
+    # info: Every quiet frame stretches the interval by 1.25 until the maximum
+    "quiet_decay": (
+        1, 30,
+        [QUIET] * 16,
+        [1.25, 1.5625, 1.953, 2.441, 3.052, 3.815, 4.768, 5.960, 7.451, 9.313, 11.642, 14.552, 18.190, 22.737, 28.422, 30.0],
+    ),
+    # info: Significant motion drops the interval to the minimum at once
+    "motion_resets": (
+        1, 30,
+        [QUIET] * 5 + [MOTION] + [QUIET] * 2,
+        [1.25, 1.5625, 1.953, 2.441, 3.052, 1.0, 1.25, 1.5625],
+    ),
+    # info: A score rising towards the threshold halves the interval, never below the minimum
+    "rising_speedup": (
+        2, 30,
+        [QUIET] * 6 + [RISING] * 3,
+        [2.5, 3.125, 3.906, 4.883, 6.104, 7.629, 3.815, 2.0, 2.0],
+    ),
+}
+
+
+def check_policy_scenario(name, show=False):
+    """
+    Run a policy scenario and compare its decisions with the expected ones.
+
+    Args:
+        name (str): Key of POLICY_SCENARIOS.
+        show (bool): Print every decision.
+
+    Returns:
+        list: Descriptions of the mismatching frames, empty if the scenario passed.
+    """
+    parameters, frames, expected = POLICY_SCENARIOS[name]
+    results = sampling_policy.simulate_policy(sampling_policy.AzureSamplingPolicy(**parameters), frames)
+    errors = []
+    if len(results) != len(expected):
+        errors.append(f"{len(results)} decisions, expected {len(expected)}")
+    for result, expected_reason in zip(results, expected):
+        if show:
+            print(f"  {result['frame']:3d} counter={result['counter']:2d} request={result['request']!s:5} {result['reason']}")
+        if result['reason'] != expected_reason or result['request'] != (expected_reason in REQUEST_REASONS):
+            errors.append(f"frame {result['frame']}: {result['reason']} (request={result['request']}), expected {expected_reason}")
+    return errors
+
+
+def check_interval_scenario(name, show=False):
+    """
+    Run an interval scenario and compare its intervals with the expected ones.
+
+    Args:
+        name (str): Key of INTERVAL_SCENARIOS.
+        show (bool): Print every interval.
+
+    Returns:
+        list: Descriptions of the mismatching frames, empty if the scenario passed.
+    """
+    min_interval, max_interval, frames, expected = INTERVAL_SCENARIOS[name]
+    intervals, seconds = adaptive_interval.simulate_interval(
+        adaptive_interval.AdaptiveInterval(min_interval, max_interval),
+        frames,
+    )
+    errors = []
+    if len(intervals) != len(expected):
+        errors.append(f"{len(intervals)} intervals, expected {len(expected)}")
+    for index, (interval, expected_interval) in enumerate(zip(intervals, expected)):
+        if show:
+            print(f"  {index:3d} {interval:7.3f}s")
+        if not math.isclose(interval, expected_interval, abs_tol=0.001):
+            errors.append(f"frame {index}: {interval:.3f}s, expected {expected_interval}s")
+    if show:
+        print(f"  {seconds:.3f}s in total")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--show", action="store_true", help="print every decision and interval")
+    args = parser.parse_args()
+
+    checks = [("policy", name, check_policy_scenario) for name in POLICY_SCENARIOS]
+    checks += [("interval", name, check_interval_scenario) for name in INTERVAL_SCENARIOS]
+    failed = 0
+    for group, name, check in checks:
+        errors = check(name, args.show)
+        print(f"{'FAIL' if errors else 'ok  '} {group}/{name}")
+        for error in errors:
+            print(f"       {error}")
+        failed += bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
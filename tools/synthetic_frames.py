@@ -0,0 +1,213 @@
+"""
+Deterministic synthetic camera footage.
+
+Every sequence is fully defined by its resolution, length and seed: a textured
+background, a slow sinusoidal lighting drift, per-frame sensor noise and
+ellipses ("objects") that enter, cross and leave the scene. The ground-truth
+bounding boxes of the objects are returned with every frame, so the tools can
+score detections without any labelling.
+"""
+import io
+import sys
+import json
+import math
+import random
+import argparse
+
+from pathlib import Path
+from collections import namedtuple
+
+from PIL import Image, ImageChops, ImageDraw
+
+RESOLUTIONS = {
+    "360p": (640, 360),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+LABELS_FILE = "labels.json"
+
+SyntheticFrame = namedtuple("SyntheticFrame", ["index", "timestamp", "data", "boxes"])
+
+
+class SyntheticObject:
+    """An ellipse moving linearly through the scene for a number of frames."""
+
+    def __init__(self, rng, size, frames):
+        """
+        Initialize a random object.
+
+        Args:
+            rng (random.Random): Seeded random generator.
+            size (tuple): (width, height) of the frame.
+            frames (int): Length of the sequence.
+        """
+        width, height = size
+        self.width = int(width * rng.uniform(0.06, 0.15))
+        self.height = int(height * rng.uniform(0.15, 0.35))
+        duration = rng.randint(max(2, frames // 6), max(3, frames // 3))
+        self.first_frame = rng.randrange(1, max(2, frames - duration))
+        self.last_frame = min(frames - 1, self.first_frame + duration)
+        self.x = rng.uniform(0, width - self.width)
+        self.y = rng.uniform(0, height - self.height)
+        self.dx = rng.uniform(-0.02, 0.02) * width
+        self.dy = rng.uniform(-0.01, 0.01) * height
+        self.color = tuple(rng.randrange(256) for _ in range(3))
+        self._size = size
+
+    def box(self, index):
+        """
+        Return the bounding box at the given frame.
+
+        Args:
+            index (int): Frame index.
+
+        Returns:
+            tuple or None: (x, y, width, height) clipped to the frame, or None if absent.
+        """
+        if not self.first_frame <= index <= self.last_frame:
+            return None
+        steps = index - self.first_frame
+        width, height = self._size
+        x = min(max(0, self.x + self.dx * steps), width - self.width)
+        y = min(max(0, self.y + self.dy * steps), height - self.height)
+        return int(x), int(y), self.width, self.height
+
+
+def make_background(rng, size):
+    """
+    Draw a textured RGB background.
+
+    Args:
+        rng (random.Random): Seeded random generator.
+        size (tuple): (width, height) of the frame.
+
+    Returns:
+        PIL.Image.Image: The background.
+    """
+    width, height = size
+    gradient = Image.linear_gradient("L").resize(size)
+    background = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT), gradient))
+    draw = ImageDraw.Draw(background)
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        w, h = rng.randrange(width // 20, width // 4), rng.randrange(height // 20, height // 4)
+        draw.rectangle((x, y, x + w, y + h), fill=tuple(rng.randrange(40, 220) for _ in range(3)))
+    return background
+
+
+def generate_sequence(
+    size,
+    frames,
+    seed=0,
+    objects=2,
+    noise=6,
+    drift=12,
+    interval=1.0,
+    quality=80,
+):
+    """
+    Generate a JPEG sequence.
+
+    Args:
+        size (tuple): (width, height) of the frames.
+        frames (int): Number of frames.
+        seed (int): Seed of the random generator.
+        objects (int): Number of moving objects.
+        noise (int): Amplitude of the per-frame sensor noise (grey levels).
+        drift (int): Amplitude of the lighting drift over the sequence (grey levels).
+        interval (float): Seconds between frames, used for the timestamps.
+        quality (int): JPEG quality.
+
+    Returns:
+        list: SyntheticFrame tuples.
+    """
+    rng = random.Random(seed)
+    width, height = size
+    background = make_background(rng, size)
+    scene_objects = [SyntheticObject(rng, size, frames) for _ in range(objects)]
+
+    sequence = []
+    for index in range(frames):
+        offset = round(drift * math.sin(2 * math.pi * index / max(1, frames)))
+        frame = background.point([min(255, max(0, value + offset)) for value in range(256)] * 3)
+        if noise:
+            grain = Image.frombytes("L", size, rng.randbytes(width * height))
+            grain = grain.point([value * 2 * noise // 255 for value in range(256)]).convert("RGB")
+            frame = ImageChops.add(frame, grain, offset=-noise)
+
+        boxes = []
+        draw = ImageDraw.Draw(frame)
+        for scene_object in scene_objects:
+            box = scene_object.box(index)
+            if box is not None:
+                x, y, w, h = box
+                draw.ellipse((x, y, x + w, y + h), fill=scene_object.color)
+                boxes.append(box)
+
+        buffer = io.BytesIO()
+        frame.save(buffer, format="JPEG", quality=quality)
+        sequence.append(SyntheticFrame(index, index * interval, buffer.getvalue(), boxes))
+    return sequence
+
+
+def write_sequence(directory, sequence, object_name="person", confidence=0.9):
+    """
+    Write a sequence as numbered JPEG files with a labels file for the replay tool.
+
+    The labels file lists every frame with its timestamp and the ground-truth
+    objects in the format of the Azure analyze response.
+
+    Args:
+        directory (str): Destination directory, created if needed.
+        sequence (list): SyntheticFrame tuples.
+        object_name (str): Azure object name reported for every synthetic object.
+        confidence (float): Confidence reported for every synthetic object.
+
+    Returns:
+        Path: Path of the labels file.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    labels = {"frames": []}
+    for frame in sequence:
+        file_name = f"{frame.index:06d}.jpg"
+        (directory / file_name).write_bytes(frame.data)
+        labels["frames"].append({
+            "file": file_name,
+            "timestamp": frame.timestamp,
+            "objects": [
+                {
+                    "rectangle": {"x": x, "y": y, "w": w, "h": h},
+                    "object": object_name,
+                    "confidence": confidence,
+                }
+                for x, y, w, h in frame.boxes
+            ],
+        })
+    labels_path = directory / LABELS_FILE
+    labels_path.write_text(json.dumps(labels, indent=2) + "\n", encoding="utf-8")
+    return labels_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write deterministic synthetic camera footage with ground-truth labels.")
+    parser.add_argument("directory")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="1080p")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--objects", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between frames")
+    parser.add_argument("--object-name", default="person")
+    args = parser.parse_args()
+
+    sequence = generate_sequence(
+        RESOLUTIONS[args.resolution], args.frames, seed=args.seed, objects=args.objects, interval=args.interval
+    )
+    labels_path = write_sequence(args.directory, sequence, args.object_name)
+    print(f"Wrote {len(sequence)} frames and {labels_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+Parameter sweep of the HomeAIVision motion thresholds and Azure sampling.
+
+Replays recorded footage of one or more cameras (see replay_footage.py) for
+every point of a grid of sensitivity levels, motion_detection_history_size
+values, MAD multipliers and Azure request schedules (initial requests, back-off
+factor and maximum gap of the sampling policy). The sweep runs on a process
+pool, and for every camera it reports the settings with the fewest Azure calls
+that still catch the target share of the ground-truth events.
+
+Motion features are computed once and shared by all sweep points: the coarse
+changed-pixel ratio and the full-resolution score and blobs of every
+(reference frame, frame) pair are cached per worker and in a cache shared by
+all workers, so a pair needed by many sweep points is analysed only once. Azure
+answers come from the labels directly (GroundTruthAnalyzer).
+
+    python tools/tune_motion.py driveway=footage/driveway garden=footage/garden --target-recall 1.0
+
+Sensitivity values may be 'low', 'medium', 'high' or a share of the frame such
+as 0.004 to explore between the levels; only the named levels can be
+configured in the integration.
+
+Requires Pillow, attrs, voluptuous and aiohttp; Home Assistant is not needed.
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+import itertools
+import multiprocessing
+
+from pathlib import Path
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from _integration import load_module
+from replay_footage import (
+    DEFAULT_AZURE_LATENCY,
+    GroundTruthAnalyzer,
+    ground_truth_events,
+    load_footage,
+    replay,
+    replay_device,
+    score,
+    _parse_setting,
+)
+
+SCHEMA_VERSION = 1
+DEFAULT_PROCESSING_TIME = 0.1       # info: Fixed simulated seconds per frame, so every sweep point sees the same frames
+DEFAULT_DECODE_CACHE = 16           # info: Decoded frames kept per worker and camera
+
+ImageShape = namedtuple("ImageShape", ["size"])
+FrameHandle = namedtuple("FrameHandle", ["index", "image"])
+
+# NOTE: Worker process state, set by _init_worker
+_CAMERAS = {}
+
+
+class CameraFeatures:
+    """Motion features of one camera's footage, computed on first use and shared between sweep points."""
+
+    def __init__(self, name, directory, footage, detection_zones, shared_cache, decode_cache_size):
+        """
+        Initialize the CameraFeatures.
+
+        Args:
+            name (str): Name of the camera, part of the cache keys.
+            directory (Path): Directory of the footage.
+            footage (list): RecordedFrame tuples, the data is read from disk when needed.
+            detection_zones (list): Zones of the camera.
+            shared_cache (dict): Cache shared by all workers (a multiprocessing.Manager dict).
+            decode_cache_size (int): Number of decoded frames kept in memory.
+        """
+        self._motion_detection = load_module("motion_detection")
+        self._blob_class = load_module("blob_analysis").MotionBlob
+        self._zones_key = load_module("detection_zones").zones_key(detection_zones)
+        self._name = name
+        self._directory = directory
+        self._footage = footage
+        self._shared_cache = shared_cache
+        self._local_cache = {}
+        self._decoded = OrderedDict()
+        self._decode_cache_size = decode_cache_size
+        self.size = self._frame(0).size
+        self._shape = ImageShape(self.size)
+        self.computed = 0
+        self.reused = 0
+
+    def handle(self, index):
+        """Return the stand-in of a MotionFrame held by CameraDetectionState."""
+        return FrameHandle(index, self._shape)
+
+    def coarse(self, reference_index, index):
+        """
+        Return the coarse comparison of two frames.
+
+        Returns:
+            tuple: (thumbnails_match, ratio) where ratio is None if the zones cover nothing.
+        """
+        def compute():
+            reference, current = self._frame(reference_index), self._frame(index)
+            if reference.thumbnail.size != current.thumbnail.size:
+                return False, None
+            return True, self._motion_detection.coarse_change_ratio(reference.thumbnail, current.thumbnail, self._zones_key)
+
+        return self._lookup(("coarse", self._name, reference_index, index), compute)
+
+    def full(self, reference_index, index):
+        """
+        Return the full-resolution motion score and blobs of two frames.
+
+        Returns:
+            tuple: (motion_score, blobs)
+        """
+        def compute():
+            motion_score, blobs = self._motion_detection.full_motion(
+                self._frame(reference_index).get_image(), self._frame(index).get_image(), self._zones_key
+            )
+            # info: Plain tuples, the shared cache lives in a process without the integration modules
+            return motion_score, [(blob.area, blob.x, blob.y, blob.width, blob.height) for blob in blobs]
+
+        motion_score, blobs = self._lookup(("full", self._name, reference_index, index), compute)
+        return motion_score, [self._blob_class(*blob) for blob in blobs]
+
+    def _lookup(self, key, compute):
+        """Return a cached feature, computing and publishing it if no worker has done so yet."""
+        value = self._local_cache.get(key)
+        if value is None:
+            value = self._shared_cache.get(key)
+            if value is None:
+                value = compute()
+                self._shared_cache[key] = value
+                self.computed += 1
+            else:
+                self.reused += 1
+            self._local_cache[key] = value
+        else:
+            self.reused += 1
+        return value
+
+    def _read(self, index):
+        """Read the JPEG data of a frame."""
+        return (self._directory / self._footage[index].file).read_bytes()
+
+    def _frame(self, index):
+        """Return a decoded frame, keeping the most recently used ones."""
+        frame = self._decoded.get(index)
+        if frame is not None:
+            self._decoded.move_to_end(index)
+            return frame
+        frame = self._motion_detection.decode_motion_frame(self._read(index))
+        self._decoded[index] = frame
+        if len(self._decoded) > self._decode_cache_size:
+            self._decoded.popitem(last=False)
+        return frame
+
+
+class FeatureProcessor:
+    """Replay processor answering from CameraFeatures with the branching of process_image."""
+
+    def __init__(self, features):
+        """
+        Initialize the FeatureProcessor.
+
+        Args:
+            features (CameraFeatures): Features of the replayed camera.
+        """
+        self._features = features
+        self._motion_detection = load_module("motion_detection")
+
+    def initialize(self, frame):
+        """Return the handle of the first frame, which becomes the reference."""
+        return self._features.handle(frame.index)
+
+    def process(self, frame, reference_frame, coarse_threshold):
+        """Return (motion_score, current_frame, blobs) as process_image would."""
+        current = self._features.handle(frame.index)
+        if coarse_threshold is not None:
+            thumbnails_match, coarse_ratio = self._features.coarse(reference_frame.index, frame.index)
+            if thumbnails_match:
+                if coarse_ratio is None:
+                    return 0, current, []
+                if coarse_ratio < coarse_threshold:
+                    return self._motion_detection.estimate_motion_score(coarse_ratio, self._features.size), current, []
+        motion_score, blobs = self._features.full(reference_frame.index, frame.index)
+        return motion_score, current, blobs
+
+
+def _init_worker(cameras, shared_cache, decode_cache_size):
+    """Load the footage metadata of every camera in a worker process."""
+    for name, spec in cameras.items():
+        directory = Path(spec["directory"])
+        footage = load_footage(directory, spec.get("responses"), load_data=False)
+        base_device = replay_device(spec["overrides"])
+        features = CameraFeatures(name, directory, footage, base_device.detection_zones, shared_cache, decode_cache_size)
+        _CAMERAS[name] = {
+            "footage": footage,
+            "overrides": spec["overrides"],
+            "features": features,
+            "events": ground_truth_events(footage, base_device, features.size),
+        }
+
+
+def evaluate_point(task):
+    """
+    Replay one camera with one sweep point. Runs in a worker process.
+
+    Args:
+        task (tuple): (camera name, sweep point settings, replay options).
+
+    Returns:
+        dict: Settings, Azure calls, recall and latency of the sweep point.
+    """
+    name, point, options = task
+    camera = _CAMERAS[name]
+    features = camera["features"]
+    computed, reused = features.computed, features.reused
+    device = replay_device({**camera["overrides"], **point})
+    run = asyncio.run(replay(
+        camera["footage"],
+        device,
+        FeatureProcessor(features),
+        GroundTruthAnalyzer(device, features.size),
+        options["budget"],
+        options["azure_latency"],
+        options["processing_time"],
+    ))
+    result = score(camera["footage"], camera["events"], run)
+    return {
+        "camera": name,
+        "settings": point,
+        "azure_calls": result["azure"]["calls"],
+        "calls_without_detection": result["azure"]["calls_without_detection"],
+        "events": result["events"]["total"],
+        "caught": result["events"]["caught"],
+        "recall": result["events"]["recall"],
+        "latency_mean_s": result["detection_latency_s"]["mean"],
+        "unknown_object_notifications": result["unknown_object_notifications"],
+        "features_computed": features.computed - computed,
+        "features_reused": features.reused - reused,
+    }
+
+
+def build_grid(args):
+    """Return the sweep points as dicts of DeviceData settings."""
+    return [
+        {
+            "local_sensitivity_level": sensitivity,
+            "motion_detection_history_size": history_size,
+            "motion_mad_multiplier": mad_multiplier,
+            "azure_initial_requests": initial_requests,
+            "azure_backoff_factor": backoff_factor,
+            "azure_max_request_gap": max_request_gap,
+        }
+        for sensitivity, history_size, mad_multiplier, initial_requests, backoff_factor, max_request_gap in itertools.product(
+            args.sensitivity,
+            args.history_size,
+            args.mad_multiplier,
+            args.initial_requests,
+            args.backoff_factor,
+            args.max_request_gap,
+        )
+    ]
+
+
+def select_best(points, target_recall):
+    """
+    Pick the sweep point with the fewest Azure calls at the target recall.
+
+    Ties are broken by the mean detection latency and the number of unknown
+    object notifications. If no point reaches the target, the point with the
+    highest recall is returned.
+
+    Returns:
+        tuple: (point, met_target)
+    """
+    def recall(point):
+        # info: Footage without events trivially reaches every target
+        return 1.0 if point["recall"] is None else point["recall"]
+
+    def cost(point):
+        latency = point["latency_mean_s"] if point["latency_mean_s"] is not None else float("inf")
+        return point["azure_calls"], latency, point["unknown_object_notifications"]
+
+    eligible = [point for point in points if recall(point) >= target_recall]
+    if eligible:
+        return min(eligible, key=cost), True
+    return min(points, key=lambda point: (-recall(point),) + cost(point)), False
+
+
+def _parse_camera(text):
+    """Parse a NAME=DIRECTORY camera argument, the name defaults to the directory name."""
+    name, separator, directory = text.partition("=")
+    if not separator:
+        directory = text
+        name = Path(text.rstrip("/")).name
+    return name, directory
+
+
+def _parse_sensitivity(text):
+    """Parse a sensitivity level name or a share of the frame."""
+    if text in ("low", "medium", "high"):
+        return text
+    try:
+        return float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected low, medium, high or a number, got {text!r}")
+
+
+def print_table(report):
+    """Print the baseline and the best settings of every camera to stderr."""
+    print(
+        f"\n{'camera':<16} {'events':>6} {'base calls':>10} {'base recall':>11} {'best calls':>10} {'best recall':>11}  settings",
+        file=sys.stderr,
+    )
+    for name, camera in report["cameras"].items():
+        baseline, best = camera["baseline"], camera["best"]
+        settings = ", ".join(f"{key}={value}" for key, value in best["settings"].items())
+        print(
+            f"{name:<16} {camera['events']:>6} {baseline['azure_calls']:>10} {baseline['recall'] or 0:>11.2f} "
+            f"{best['azure_calls']:>10} {best['recall'] or 0:>11.2f}  {settings}"
+            f"{'' if camera['met_target'] else '  (target recall not reached)'}",
+            file=sys.stderr,
+        )
+    features = report["features"]
+    print(f"\nMotion features computed: {features['computed']}, reused: {features['reused']}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cameras", nargs="+", type=_parse_camera, metavar="[NAME=]DIRECTORY",
+                        help="recorded footage of a camera, see replay_footage.py")
+    parser.add_argument("--sensitivity", nargs="+", type=_parse_sensitivity, default=["low", "medium", "high"])
+    parser.add_argument("--history-size", nargs="+", type=int, default=[5, 10, 20])
+    parser.add_argument("--mad-multiplier", nargs="+", type=float, default=[1.0, 1.5, 2.0, 3.0])
+    parser.add_argument("--initial-requests", nargs="+", type=int, default=[1, 3, 5])
+    parser.add_argument("--backoff-factor", nargs="+", type=float, default=[2.0])
+    parser.add_argument("--max-request-gap", nargs="+", type=int, default=[4, 8, 16])
+    parser.add_argument("--target-recall", type=float, default=1.0, help="share of events that must be caught")
+    parser.add_argument("--set", type=_parse_setting, action="append", default=[], metavar="KEY=VALUE",
+                        help="DeviceData setting of every camera that is not swept, e.g. motion_detection_interval=2")
+    parser.add_argument("--responses", help="JSON file mapping file names to scripted Azure objects")
+    parser.add_argument("--budget", type=int, default=0, help="global Azure request budget, 0 for unlimited")
+    parser.add_argument("--azure-latency", type=float, default=DEFAULT_AZURE_LATENCY)
+    parser.add_argument("--processing-time", type=float, default=DEFAULT_PROCESSING_TIME,
+                        help="simulated seconds per processed frame")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--decode-cache", type=int, default=DEFAULT_DECODE_CACHE, help="decoded frames kept per worker and camera")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    overrides = dict(args.set)
+    replay_device(overrides)    # info: Fail early on unknown settings
+    cameras = {
+        name: {"directory": directory, "responses": args.responses, "overrides": overrides}
+        for name, directory in args.cameras
+    }
+    grid = build_grid(args)
+    baseline = {key: value for key, value in replay_device(overrides).__dict__.items() if key in grid[0]}
+    options = {"budget": args.budget, "azure_latency": args.azure_latency, "processing_time": args.processing_time}
+    # info: Grouped by camera and sensitivity, so consecutive points of a worker reuse its local cache
+    tasks = [(name, point, options) for name in cameras for point in [baseline] + grid]
+    print(f"Sweeping {len(grid)} points for {len(cameras)} camera(s) on {args.workers} workers...", file=sys.stderr)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        shared_cache = manager.dict()
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(cameras, shared_cache, args.decode_cache),
+        ) as executor:
+            chunksize = max(1, len(tasks) // (4 * args.workers))
+            results = list(executor.map(evaluate_point, tasks, chunksize=chunksize))
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "target_recall": args.target_recall,
+        "grid": {
+            "sensitivity": args.sensitivity,
+            "history_size": args.history_size,
+            "mad_multiplier": args.mad_multiplier,
+            "initial_requests": args.initial_requests,
+            "backoff_factor": args.backoff_factor,
+            "max_request_gap": args.max_request_gap,
+        },
+        "fixed_settings": overrides,
+        "features": {
+            "computed": sum(result["features_computed"] for result in results),
+            "reused": sum(result["features_reused"] for result in results),
+        },
+        "cameras": {},
+    }
+    points_per_camera = len(grid) + 1
+    for offset, name in enumerate(cameras):
+        camera_results = results[offset * points_per_camera:(offset + 1) * points_per_camera]
+        best, met_target = select_best(camera_results[1:], args.target_recall)
+        report["cameras"][name] = {
+            "events": camera_results[0]["events"],
+            "baseline": camera_results[0],
+            "best": best,
+            "met_target": met_target,
+            "points": camera_results[1:],
+        }
+
+    print_table(report)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()